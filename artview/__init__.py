@@ -60,6 +60,7 @@ else:
     from . import plugins
     from . import scripts
     from . import parser
+    from . import batch
     from . import view
     from .modes import modes
 
@@ -19,7 +19,35 @@ def main(argv):
         pr = cProfile.Profile()
         pr.enable()
 
-    script, DirIn, filename, field = artview.parser.parse(argv)
+    args = artview.parser.parse_args(argv)
+    script, DirIn, filename, field = (args.script, args.directory,
+                                      args.file, args.field)
+
+    from artview.core import mmap_cache
+    if args.clear_cache:
+        print("Removing %s" % mmap_cache.path)
+        mmap_cache.clear()
+        return
+    if args.cache:
+        mmap_cache.enabled = True
+        mmap_cache.max_bytes = int(args.cache_size * 2**30)
+
+    if args.batch:
+        inputs = args.input if args.input else DirIn
+        outdir = args.output
+        if outdir is None:
+            outdir = os.path.join(
+                DirIn if os.path.isdir(DirIn) else os.getcwd(),
+                "batch_output")
+        quicklook = None
+        if args.quicklook:
+            quicklook = {"field": args.quicklook}
+        failed = artview.batch.run_batch(
+            args.batch, inputs, outdir, processes=args.processes,
+            quicklook=quicklook, restart=args.restart)
+        if failed:
+            sys.exit(1)
+        return
 
     if script:
         artview.scripts.scripts[script](DirIn, filename, field)
@@ -0,0 +1,355 @@
+"""
+batch.py
+
+Run pipelines saved from ARTview components over many files, without the
+GUI.
+
+A pipeline is a JSON file with a list of steps, as saved by the 'Add to
+Batch Pipeline' entries of GateFilter, Despeckle, PhaseProcLp,
+DealiasRegionBased and Mapper::
+
+    {"steps": [
+        {"step": "gatefilter",
+         "filters": [["exclude_below", ["reflectivity", "10"],
+                      {"inclusive": true}]]},
+        {"step": "despeckle", "field": "reflectivity",
+         "threshold_min": -100.0, "threshold_max": "Inf",
+         "size": 10, "delta": 5},
+        {"step": "dealias_region_based", "parameters": {...}},
+        {"step": "grid", "parameters": {...}}],
+     "quicklook": {"field": "reflectivity", "sweep": 0}}
+
+Steps are applied in order. The gate filter built by 'gatefilter' and
+'despeckle' steps is used by the following steps and masks the fields
+written. If a 'grid' step is present the grid is written, otherwise the
+radar.
+"""
+from __future__ import print_function
+# Load the needed packages
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+
+import numpy as np
+
+JOURNAL = "batch_journal.txt"
+
+
+def load_pipeline(filename):
+    '''Read a pipeline JSON file, returns a dict with key 'steps'.'''
+    with open(filename) as f:
+        pipeline = json.load(f)
+    if isinstance(pipeline, list):
+        pipeline = {"steps": pipeline}
+    for step in pipeline.get("steps", []):
+        if step.get("step") not in _STEPS:
+            raise ValueError("Unknown pipeline step: %s" % step.get("step"))
+    return pipeline
+
+
+def add_pipeline_step(filename, step):
+    '''Append step to the pipeline in filename, creating it if needed.'''
+    if os.path.isfile(filename):
+        pipeline = load_pipeline(filename)
+    else:
+        pipeline = {"steps": []}
+    pipeline.setdefault("steps", []).append(step)
+    with open(filename, 'w') as f:
+        json.dump(pipeline, f, indent=2, sort_keys=True)
+    return pipeline
+
+
+########################
+# Pipeline steps #
+########################
+
+
+def _step_gatefilter(radar, state, step):
+    import pyart
+    gatefilter = state.get("gatefilter")
+    if gatefilter is None:
+        gatefilter = pyart.filters.GateFilter(radar, exclude_based=True)
+    for method, args, kwargs in step["filters"]:
+        # field name followed by values
+        args = [args[0]] + [float(value) for value in args[1:]]
+        getattr(gatefilter, method)(*args, **kwargs)
+    state["gatefilter"] = gatefilter
+
+
+def _step_despeckle(radar, state, step):
+    import pyart
+    if step.get("threshold_max", "Inf") == "Inf":
+        threshold = step["threshold_min"]
+    else:
+        threshold = (step["threshold_min"], float(step["threshold_max"]))
+    state["gatefilter"] = pyart.correct.despeckle_field(
+        radar, step["field"], label_dict=None, threshold=threshold,
+        size=step["size"], gatefilter=state.get("gatefilter"),
+        delta=step["delta"])
+
+
+def _step_phase_proc_lp(radar, state, step):
+    import pyart
+    parameters = dict(step["parameters"])
+    reproc_phase_name = parameters.pop("reproc_phase")
+    sob_kdp_name = parameters.pop("sob_kdp")
+    reproc_phase, sob_kdp = pyart.correct.phase_proc_lp(radar, **parameters)
+    radar.add_field(reproc_phase_name, reproc_phase, True)
+    radar.add_field(sob_kdp_name, sob_kdp, True)
+
+
+def _step_dealias_region_based(radar, state, step):
+    import pyart
+    parameters = dict(step["parameters"])
+    field = pyart.correct.dealias_region_based(
+        radar, gatefilter=state.get("gatefilter"), **parameters)
+    radar.add_field(parameters["corr_vel_field"], field, True)
+
+
+def _step_grid(radar, state, step):
+    import pyart
+    parameters = dict(step["parameters"])
+    gatefilter = state.get("gatefilter")
+    if gatefilter is not None:
+        parameters["gatefilters"] = (gatefilter,)
+    state["grid"] = pyart.map.grid_from_radars((radar,), **parameters)
+
+
+_STEPS = {
+    "gatefilter": _step_gatefilter,
+    "despeckle": _step_despeckle,
+    "phase_proc_lp": _step_phase_proc_lp,
+    "dealias_region_based": _step_dealias_region_based,
+    "grid": _step_grid,
+    }
+
+
+def run_pipeline(radar, pipeline):
+    '''
+    Apply pipeline steps to radar.
+
+    Returns
+    -------
+    state : dict
+        Keys 'gatefilter' and 'grid', if built by the steps.
+    '''
+    state = {}
+    for step in pipeline.get("steps", []):
+        _STEPS[step["step"]](radar, state, step)
+    return state
+
+
+########################
+# File processing #
+########################
+
+
+def _output_name(filename, outdir, kind):
+    base = os.path.splitext(os.path.basename(filename))[0]
+    return os.path.join(outdir, "%s_%s.nc" % (base, kind))
+
+
+def _quicklook(container, kind, options, filename):
+    '''Save a PNG of a sweep or grid level.'''
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    field = options.get("field")
+    if field is None or field not in container.fields:
+        field = sorted(container.fields.keys())[0]
+    fig = Figure(figsize=(8, 7))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    data = container.fields[field]['data']
+    if kind == "grid":
+        level = options.get("level", 0)
+        x = container.x['data'] / 1000.
+        y = container.y['data'] / 1000.
+        mesh = ax.pcolormesh(x, y, data[level], vmin=options.get("vmin"),
+                             vmax=options.get("vmax"),
+                             cmap=options.get("cmap"))
+        ax.set_title("%s level %d" % (field, level))
+    else:
+        import pyart
+        sweep = options.get("sweep", 0)
+        sweep_slice = container.get_slice(sweep)
+        x, y, z = container.get_gate_x_y_z(sweep, edges=True)
+        mesh = ax.pcolormesh(x / 1000., y / 1000., data[sweep_slice],
+                             vmin=options.get("vmin"),
+                             vmax=options.get("vmax"),
+                             cmap=options.get("cmap"))
+        ax.set_title("%s sweep %d, %s" % (
+            field, sweep, pyart.util.datetime_from_radar(container)))
+    ax.set_xlabel("Distance from radar (km)")
+    ax.set_ylabel("Distance from radar (km)")
+    ax.set_aspect('equal')
+    fig.colorbar(mesh, ax=ax, label=field)
+    fig.savefig(filename, dpi=options.get("dpi", 72))
+
+
+def process_file(args):
+    '''
+    Read, process and write one file, called in the worker processes.
+
+    Parameters
+    ----------
+    args : tuple
+        (filename, pipeline, outdir, quicklook, compression)
+
+    Returns
+    -------
+    result : tuple
+        (filename, error or None, elapsed seconds)
+    '''
+    filename, pipeline, outdir, quicklook, compression = args
+    t0 = time.time()
+    try:
+        import pyart
+        from .core.io import read_container, load_all_fields
+        from .core.writer import compression_keys
+        radar = read_container(filename, ("radar",))
+        if radar is None:
+            raise IOError("Py-ART didn't recognize this file!")
+        load_all_fields(radar)
+        state = run_pipeline(radar, pipeline)
+
+        if "grid" in state:
+            kind, container = "grid", state["grid"]
+        else:
+            kind, container = "radar", radar
+            gatefilter = state.get("gatefilter")
+            if gatefilter is not None:
+                for field in container.fields.values():
+                    field['data'] = np.ma.array(
+                        field['data'], mask=gatefilter.gate_excluded)
+        for field in container.fields.values():
+            field.update(
+                compression_keys(container, field, kind, compression))
+
+        outname = _output_name(filename, outdir, kind)
+        tmpname = outname + ".part"
+        if kind == "grid":
+            pyart.io.write_grid(tmpname, container)
+        else:
+            pyart.io.write_cfradial(tmpname, container)
+        if quicklook is not None:
+            _quicklook(container, kind, quicklook,
+                       os.path.splitext(outname)[0] + ".png")
+        os.rename(tmpname, outname)
+    except:
+        return filename, traceback.format_exc(), time.time() - t0
+    return filename, None, time.time() - t0
+
+
+def _read_journal(path):
+    '''Return set of files already processed successfully.'''
+    done = set()
+    if not os.path.isfile(path):
+        return done
+    with open(path) as f:
+        for line in f:
+            status, _, filename = line.rstrip("\n").partition("\t")
+            if status == "ok":
+                done.add(filename)
+            elif status == "failed":
+                done.discard(filename)
+    return done
+
+
+def run_batch(pipeline, files, outdir, processes=None, quicklook=None,
+              restart=False, stream=sys.stdout):
+    '''
+    Run a pipeline over files in a process pool.
+
+    Processed files are recorded in a journal in outdir, so an interrupted
+    or partially failed run is resumed by running it again: files done are
+    skipped and failed ones are retried.
+
+    Parameters
+    ----------
+    pipeline : string or dict
+        Pipeline file or pipeline, see :py:func:`load_pipeline`.
+    files : string or list of strings
+        Directory, glob pattern or list of files to process.
+    outdir : string
+        Output directory, created if needed.
+    [Optional]
+    processes : int or None
+        Number of worker processes, if None the number of CPUs.
+    quicklook : dict or None
+        Quick look PNG options ('field', 'sweep', 'level', 'vmin',
+        'vmax', 'cmap', 'dpi'), if None use the pipeline 'quicklook' key,
+        if any.
+    restart : bool
+        If True ignore the journal and process all files.
+    stream : file
+        Where progress is reported.
+
+    Returns
+    -------
+    failed : list of strings
+        Files that could not be processed.
+    '''
+    if not isinstance(pipeline, dict):
+        pipeline = load_pipeline(pipeline)
+    if not isinstance(files, (list, tuple)):
+        if os.path.isdir(files):
+            files = [os.path.join(files, name)
+                     for name in os.listdir(files)]
+            files = [path for path in files if os.path.isfile(path)]
+        else:
+            files = glob.glob(files)
+    files = sorted(os.path.abspath(path) for path in files)
+    if quicklook is None:
+        quicklook = pipeline.get("quicklook")
+    compression = pipeline.get("compression", {"deflate_level": 4})
+
+    if not os.path.isdir(outdir):
+        os.makedirs(outdir)
+    journal_path = os.path.join(outdir, JOURNAL)
+    if restart and os.path.isfile(journal_path):
+        os.remove(journal_path)
+    done = _read_journal(journal_path)
+    todo = [path for path in files if path not in done]
+    print("Processing %d files (%d already done) with %d steps" %
+          (len(todo), len(files) - len(todo),
+           len(pipeline.get("steps", []))), file=stream)
+    if not todo:
+        return []
+
+    jobs = [(path, pipeline, outdir, quicklook, compression)
+            for path in todo]
+    failed = []
+    t0 = time.time()
+    pool = multiprocessing.Pool(processes)
+    journal = open(journal_path, 'a')
+    try:
+        for n, (filename, error, elapsed) in enumerate(
+                pool.imap_unordered(process_file, jobs), 1):
+            if error is None:
+                journal.write("ok\t%s\n" % filename)
+            else:
+                journal.write("failed\t%s\n" % filename)
+                failed.append(filename)
+                print("Failed %s:\n%s" % (filename, error), file=stream)
+            journal.flush()
+            rate = n / (time.time() - t0)
+            print("[%d/%d] %s (%.1f s), %.2f files/s, %d failed, "
+                  "%.0f s left" % (n, len(todo), os.path.basename(filename),
+                                   elapsed, rate, len(failed),
+                                   (len(todo) - n) / rate), file=stream)
+        pool.close()
+    except KeyboardInterrupt:
+        pool.terminate()
+        print("Interrupted, run again to resume", file=stream)
+        raise
+    finally:
+        pool.join()
+        journal.close()
+    print("Processed %d files in %.1f s (%.2f files/s), %d failed" %
+          (len(todo), time.time() - t0, len(todo) / (time.time() - t0),
+           len(failed)), file=stream)
+    return failed
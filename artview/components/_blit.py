@@ -0,0 +1,138 @@
+"""
+_blit.py
+
+Update plots in place, without rendering the whole figure again.
+"""
+
+# Load the needed packages
+import copy
+
+from matplotlib import colors
+
+
+class ArtistBlitter(object):
+    '''
+    Redraw a set of artists over a cached background of the figure.
+
+    The background is the figure rendered with the artists hidden. It is
+    captured on first use and dropped whenever the canvas is drawn
+    normally, so it always matches what is displayed.
+    '''
+
+    def __init__(self, canvas):
+        '''
+        Initialize the class.
+
+        Parameters
+        ----------
+        canvas : FigureCanvas
+            Canvas of the figure, must support blitting (e.g. Agg based).
+        '''
+        self.canvas = canvas
+        self.background = None
+        self._artists = None
+        self._capturing = False
+        self._cid = canvas.mpl_connect('draw_event', self._onDraw)
+
+    def _onDraw(self, event):
+        if not self._capturing:
+            self.background = None
+
+    def invalidate(self):
+        '''Drop the cached background.'''
+        self.background = None
+
+    def disconnect(self):
+        self.canvas.mpl_disconnect(self._cid)
+        self.background = None
+
+    def _capture(self, artists):
+        '''Render the figure without artists and keep the result.'''
+        visible = [artist.get_visible() for artist in artists]
+        for artist in artists:
+            artist.set_visible(False)
+        self._capturing = True
+        try:
+            self.canvas.draw()
+            self.background = self.canvas.copy_from_bbox(
+                self.canvas.figure.bbox)
+        finally:
+            self._capturing = False
+            for artist, vis in zip(artists, visible):
+                artist.set_visible(vis)
+        self._artists = [id(artist) for artist in artists]
+
+    def blit(self, artists):
+        '''
+        Draw artists over the background and show the result.
+
+        Parameters
+        ----------
+        artists : list of matplotlib Artists
+            Artists to redraw, hidden ones are skipped. The background is
+            captured again if they differ from the last call.
+        '''
+        artists = sorted(artists, key=lambda artist: artist.get_zorder())
+        if (self.background is None or
+                self._artists != [id(artist) for artist in artists]):
+            self._capture(artists)
+        self.canvas.restore_region(self.background)
+        renderer = self.canvas.get_renderer()
+        for artist in artists:
+            if artist.get_visible():
+                artist.draw(renderer)
+        self.canvas.blit(self.canvas.figure.bbox)
+
+
+def artists_above(ax, artist):
+    '''Return the children of ax drawn on top of artist, including it.
+    Titles, placed above the axes, are left in the background.'''
+    zorder = artist.get_zorder()
+    skip = [ax.patch, ax.title, getattr(ax, '_left_title', None),
+            getattr(ax, '_right_title', None)]
+    return [child for child in ax.get_children()
+            if not any(child is other for other in skip) and
+            (child is artist or child.get_zorder() >= zorder)]
+
+
+def get_colormap(cmap):
+    '''Return a copy of the matplotlib colormap cmap, a name or
+    Colormap.'''
+    if isinstance(cmap, colors.Colormap):
+        return copy.copy(cmap)
+    try:
+        from matplotlib import colormaps
+    except ImportError:
+        from matplotlib import cm
+        return copy.copy(cm.get_cmap(cmap))
+    return colormaps[cmap]
+
+
+def colormap_norm(cmap, mask_outside=False):
+    '''
+    Return the Colormap and Normalize of a Vcolormap value.
+
+    Parameters
+    ----------
+    cmap : dict
+        Vcolormap value, keys 'cmap', 'vmin', 'vmax' and optionally
+        'norm'.
+    [Optional]
+    mask_outside : bool
+        If True and cmap has no norm, values outside vmin and vmax are
+        drawn transparent, as masked by Py-ART ``mask_outside``. Unlike
+        masking the data, this follows later changes of the limits.
+
+    Returns
+    -------
+    colormap : matplotlib Colormap
+    norm : matplotlib Normalize
+    '''
+    colormap = get_colormap(cmap['cmap'])
+    norm = cmap.get('norm')
+    if norm is None:
+        norm = colors.Normalize(vmin=cmap['vmin'], vmax=cmap['vmax'])
+        if mask_outside:
+            colormap.set_under((0., 0., 0., 0.))
+            colormap.set_over((0., 0., 0., 0.))
+    return colormap, norm
@@ -0,0 +1,252 @@
+"""
+_index.py
+
+Spatial indexes of the gates of radar sweeps and of the points of grid
+sections, built once per container and plot, for nearest point, radius
+and path queries.
+"""
+
+# Load the needed packages
+import weakref
+
+import numpy as np
+
+from ._interior import interior_polar, interior_rectilinear
+from ._overlay import OverlayCache
+
+#: indexes of each radar or grid, dropped with the container
+_indexes = weakref.WeakKeyDictionary()
+
+
+def container_index(container, key, build):
+    '''
+    Return index kept for container under key, calling build() to make it
+    the first time.
+
+    Parameters
+    ----------
+    container : Radar or Grid
+        Object the index describes.
+    key : hashable
+        What the index depends on besides container, e.g. sweep and plot
+        type.
+    build : callable
+        Returns the index.
+    '''
+    indexes = _indexes.get(container)
+    if indexes is None:
+        indexes = {}
+        _indexes[container] = indexes
+    if key not in indexes:
+        indexes[key] = build()
+    return indexes[key]
+
+
+def drop_indexes(container):
+    '''Drop indexes of container, e.g. when it changed.'''
+    if container is not None:
+        _indexes.pop(container, None)
+
+
+def path_key(path):
+    '''Return hashable key of the vertices and codes of path.'''
+    codes = path.codes
+    return (np.ascontiguousarray(path.vertices, dtype=float).tobytes(),
+            None if codes is None else np.asarray(codes).tobytes())
+
+
+class SpatialIndex(object):
+    '''
+    Base of the indexes, keeps boolean masks of the points inside the last
+    paths queried, so regions of several paths are recomputed with only
+    the masks of new paths. Subclasses implement :py:func:`polygon`.
+    '''
+
+    def __init__(self, npoints, size=16):
+        '''
+        Initialize the class.
+
+        Parameters
+        ----------
+        npoints : int
+            Number of points indexed.
+        [Optional]
+        size : int
+            Number of masks kept.
+        '''
+        self.npoints = npoints
+        self.masks = OverlayCache(size)
+
+    def polygon(self, path):
+        '''Return increasing flat indexes of the points inside path.'''
+        raise NotImplementedError
+
+    def mask(self, path):
+        '''Return flat boolean mask of the points inside path.'''
+        key = path_key(path)
+        mask = self.masks.get(key)
+        if mask is None:
+            mask = np.zeros(self.npoints, dtype=bool)
+            mask[self.polygon(path)] = True
+            self.masks.put(key, mask)
+        return mask
+
+    def region(self, paths):
+        '''Return flat boolean mask of the points inside any of
+        paths.'''
+        region = np.zeros(self.npoints, dtype=bool)
+        for path in paths:
+            region |= self.mask(path)
+        return region
+
+
+class PolarIndex(SpatialIndex):
+    '''
+    Index of the gates of a sweep, rays going out from the origin.
+
+    Rays are sorted by the angle of their farthest gate, queries look
+    only at the rays next to the angle of the query point and at the gates
+    at about its distance. That is PPI (x, y), RHI (ground range, height)
+    or airborne (x, z) coordinates.
+    '''
+
+    def __init__(self, x, y):
+        '''
+        Initialize the class.
+
+        Parameters
+        ----------
+        x, y : 2D arrays
+            Position (nrays, ngates) of the gates.
+        '''
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        self.nrays, self.ngates = self.x.shape
+        super(PolarIndex, self).__init__(self.x.size)
+        self.distance = np.hypot(self.x, self.y)
+        angle = np.arctan2(self.x[:, -1], self.y[:, -1]) % (2 * np.pi)
+        self.order = np.argsort(angle)
+        self.angle = angle[self.order]
+
+    def _rays_near(self, angle, count=2):
+        '''Return (npoints, 2 * count) rays of angle closest to angle.'''
+        right = np.searchsorted(self.angle, angle)
+        offsets = np.arange(-count, count)
+        return self.order[(right[:, np.newaxis] + offsets) % self.nrays]
+
+    def nearest(self, px, py):
+        '''
+        Return gates nearest to points.
+
+        Parameters
+        ----------
+        px, py : float or 1D arrays
+            Position of the points.
+
+        Returns
+        -------
+        ray, gate : 1D arrays of int
+            Index of the gates in the sweep.
+        distance : 1D array
+            Distance of the gates to the points.
+        '''
+        px = np.atleast_1d(np.asarray(px, dtype=float))
+        py = np.atleast_1d(np.asarray(py, dtype=float))
+        rays = self._rays_near(np.arctan2(px, py) % (2 * np.pi))
+        # distance to all gates of the candidate rays
+        dist = np.hypot(self.x[rays] - px[:, np.newaxis, np.newaxis],
+                        self.y[rays] - py[:, np.newaxis, np.newaxis])
+        flat = np.argmin(dist.reshape(len(px), -1), axis=1)
+        iray, gate = np.divmod(flat, self.ngates)
+        points = np.arange(len(px))
+        return (rays[points, iray], gate,
+                dist.reshape(len(px), -1)[points, flat])
+
+    def radius(self, px, py, r):
+        '''Return increasing flat indexes, ray * ngates + gate, of the gates
+        closer than r to point px, py.'''
+        d = np.hypot(px, py)
+        if d <= r:
+            rays = np.arange(self.nrays)
+        else:
+            half = np.arcsin(r / d)
+            angle = np.arctan2(px, py)
+            diff = (self.angle - angle + np.pi) % (2 * np.pi) - np.pi
+            rays = np.sort(self.order[np.abs(diff) <= half + 1e-9])
+            # the rays next to the sector may pass within r between gates
+            rays = np.union1d(rays, self._rays_near(
+                np.array([angle % (2 * np.pi)]), 1).ravel())
+        distance = self.distance[rays]
+        iray, igate = np.nonzero(np.abs(distance - d) <= r)
+        rays = rays[iray]
+        inside = np.hypot(self.x[rays, igate] - px,
+                          self.y[rays, igate] - py) <= r
+        return rays[inside] * self.ngates + igate[inside]
+
+    def polygon(self, path):
+        '''Return increasing flat indexes of the gates inside path, see
+        :py:func:`~artview.components._interior.interior_polar`.'''
+        return interior_polar(path, self.x, self.y)
+
+
+class GridIndex(SpatialIndex):
+    '''
+    Index of the points of a rectilinear section of a grid.
+    '''
+
+    def __init__(self, xs, ys):
+        '''
+        Initialize the class.
+
+        Parameters
+        ----------
+        xs, ys : 1D arrays
+            Coordinates of the columns and rows of the section.
+        '''
+        self.xs = np.asarray(xs, dtype=float)
+        self.ys = np.asarray(ys, dtype=float)
+        self.xorder = np.argsort(self.xs)
+        self.yorder = np.argsort(self.ys)
+        super(GridIndex, self).__init__(self.xs.size * self.ys.size)
+
+    @staticmethod
+    def _nearest(values, order, p):
+        '''Return index of the values nearest to p.'''
+        sorted_values = values[order]
+        right = np.clip(np.searchsorted(sorted_values, p), 1,
+                        len(values) - 1)
+        left = right - 1
+        pick = np.where(np.abs(sorted_values[left] - p) <=
+                        np.abs(sorted_values[right] - p), left, right)
+        if len(values) == 1:
+            pick = np.zeros_like(pick)
+        return order[pick]
+
+    def nearest(self, px, py):
+        '''
+        Return points nearest to px, py (floats or 1D arrays).
+
+        Returns
+        -------
+        column, row : 1D arrays of int
+            Index of the points in xs and ys.
+        '''
+        px = np.atleast_1d(np.asarray(px, dtype=float))
+        py = np.atleast_1d(np.asarray(py, dtype=float))
+        return (self._nearest(self.xs, self.xorder, px),
+                self._nearest(self.ys, self.yorder, py))
+
+    def radius(self, px, py, r):
+        '''Return increasing flat indexes, row * len(xs) + column, of the
+        points closer than r to point px, py.'''
+        columns = np.nonzero(np.abs(self.xs - px) <= r)[0]
+        rows = np.nonzero(np.abs(self.ys - py) <= r)[0]
+        inside = (((self.xs[columns] - px) ** 2)[np.newaxis, :] +
+                  ((self.ys[rows] - py) ** 2)[:, np.newaxis]) <= r * r
+        irow, icolumn = np.nonzero(inside)
+        return rows[irow] * len(self.xs) + columns[icolumn]
+
+    def polygon(self, path):
+        '''Return increasing flat indexes of the points inside path, see
+        :py:func:`~artview.components._interior.interior_rectilinear`.'''
+        return interior_rectilinear(path, self.xs, self.ys)
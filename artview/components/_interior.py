@@ -0,0 +1,192 @@
+"""
+_interior.py
+
+Find the points of radar sweeps and grid sections inside paths drawn over
+a plot, with array operations instead of one test per point.
+"""
+
+# Load the needed packages
+import numpy as np
+
+
+def _polygon(path):
+    '''Return vertices (n, 2) of path, if it is a single polygon, else
+    None.'''
+    polygons = path.to_polygons()
+    if len(polygons) != 1 or len(polygons[0]) < 3:
+        return None
+    return np.asarray(polygons[0], dtype=float)
+
+
+def _in_bbox(path, x, y):
+    '''Return mask of the points x, y in the bounding box of path.'''
+    bbox = path.get_extents()
+    return ((x >= bbox.x0) & (x <= bbox.x1) &
+            (y >= bbox.y0) & (y <= bbox.y1))
+
+
+def interior_points(path, x, y, candidates=None):
+    '''
+    Return flat indexes of the points x, y inside path.
+
+    Parameters
+    ----------
+    path : matplotlib Path
+        Closed path, in the coordinates of x and y.
+    x, y : arrays
+        Coordinates of the points, of the same shape.
+    [Optional]
+    candidates : 1D array of int or None
+        Flat indexes of the only points to test, if None test all.
+
+    Returns
+    -------
+    ind : 1D array of int
+        Increasing flat indexes of x of the points inside path.
+    '''
+    x = np.asarray(x).ravel()
+    y = np.asarray(y).ravel()
+    if candidates is None:
+        candidates = np.nonzero(_in_bbox(path, x, y))[0]
+    else:
+        candidates = candidates[_in_bbox(path, x[candidates],
+                                         y[candidates])]
+    if candidates.size == 0:
+        return candidates
+    xy = np.column_stack((x[candidates], y[candidates]))
+    return candidates[path.contains_points(xy)]
+
+
+def _distance_to_edges(polygon):
+    '''Return the smallest distance from the origin to the edges of
+    polygon.'''
+    p0 = polygon
+    p1 = np.roll(polygon, -1, axis=0)
+    edge = p1 - p0
+    length = np.sum(edge ** 2, axis=1)
+    length[length == 0] = 1.
+    t = np.clip(-np.sum(p0 * edge, axis=1) / length, 0, 1)
+    closest = p0 + t[:, np.newaxis] * edge
+    return np.hypot(closest[:, 0], closest[:, 1]).min()
+
+
+def _azimuth_bins(polygon, nbins=360):
+    '''Return mask of the azimuth bins crossed by the edges of polygon,
+    seen from the origin, which is outside of it.'''
+    angle = np.degrees(np.arctan2(polygon[:, 0], polygon[:, 1])) % 360.
+    a0 = angle
+    a1 = np.roll(angle, -1)
+    # an edge spans the shorter arc between its vertices
+    span = (a1 - a0 + 180.) % 360. - 180.
+    start = np.where(span >= 0, a0, a1)
+    width = np.abs(span)
+    size = 360. / nbins
+    bins = np.zeros(nbins, dtype=bool)
+    for s, w in zip(start, width):
+        first = int(np.floor(s / size)) - 1
+        last = int(np.floor((s + w) / size)) + 1
+        bins[np.arange(first, last + 1) % nbins] = True
+    return bins
+
+
+def interior_polar(path, x, y, nbins=360):
+    '''
+    Return flat indexes of the gates of a PPI sweep inside path.
+
+    Rays not crossing the azimuths covered by path and gates closer or
+    farther from the radar than path are discarded before the points
+    are tested.
+
+    Parameters
+    ----------
+    path : matplotlib Path
+        Closed path, in the coordinates of x and y.
+    x, y : 2D arrays
+        Position (nrays, ngates) of the gates, east and north of the
+        radar.
+    [Optional]
+    nbins : int
+        Number of azimuth bins used to discard rays.
+
+    Returns
+    -------
+    ind : 1D array of int
+        Increasing flat indexes of x of the gates inside path.
+    '''
+    x = np.asarray(x)
+    y = np.asarray(y)
+    polygon = _polygon(path)
+    if polygon is None or x.ndim != 2:
+        return interior_points(path, x, y)
+    nrays, ngates = x.shape
+
+    rmin = 0.
+    if not path.contains_point((0., 0.)):
+        rmin = _distance_to_edges(polygon)
+    if rmin > 0:
+        # azimuth of the rays, from the farthest gate
+        azimuth = np.degrees(np.arctan2(x[:, -1], y[:, -1])) % 360.
+        bins = _azimuth_bins(polygon, nbins)
+        ray_bins = (azimuth * nbins / 360.).astype(int) % nbins
+        rays = np.nonzero(bins[ray_bins])[0]
+    else:
+        rays = np.arange(nrays)
+    rmax = np.hypot(polygon[:, 0], polygon[:, 1]).max()
+    if rays.size == 0:
+        return np.empty(0, dtype=int)
+
+    distance = np.hypot(x[rays], y[rays])
+    iray, igate = np.nonzero((distance >= rmin) & (distance <= rmax))
+    candidates = rays[iray] * ngates + igate
+    return interior_points(path, x, y, candidates)
+
+
+def interior_rectilinear(path, xs, ys):
+    '''
+    Return flat indexes of the points of a rectilinear grid inside path.
+
+    Each grid row inside the vertical range of path is filled between
+    the crossings of its edges (scanline), so the cost does not grow with
+    the number of points inside path times the number of its vertices.
+
+    Parameters
+    ----------
+    path : matplotlib Path
+        Closed path, in the coordinates of xs and ys.
+    xs, ys : 1D arrays
+        Coordinates of the grid columns and rows.
+
+    Returns
+    -------
+    ind : 1D array of int
+        Increasing flat indexes, row * len(xs) + column, of the points
+        inside path.
+    '''
+    xs = np.asarray(xs, dtype=float)
+    ys = np.asarray(ys, dtype=float)
+    nx = xs.size
+    polygon = _polygon(path)
+    if polygon is None:
+        x, y = np.meshgrid(xs, ys)
+        return interior_points(path, x, y)
+
+    x0 = polygon[:, 0]
+    y0 = polygon[:, 1]
+    x1 = np.roll(x0, -1)
+    y1 = np.roll(y0, -1)
+    rows = np.nonzero((ys >= y0.min()) & (ys <= y0.max()))[0]
+    columns = np.nonzero((xs >= x0.min()) & (xs <= x0.max()))[0]
+    index = []
+    for row in rows:
+        yr = ys[row]
+        # edges crossing the row, same rule as Path.contains_points
+        cross = (y0 >= yr) != (y1 >= yr)
+        if not cross.any():
+            continue
+        xc = np.sort(x0[cross] + (yr - y0[cross]) * (x1[cross] - x0[cross]) /
+                     (y1[cross] - y0[cross]))
+        right = xc.size - np.searchsorted(xc, xs[columns], side='right')
+        index.append(row * nx + columns[right % 2 == 1])
+    if not index:
+        return np.empty(0, dtype=int)
+    return np.concatenate(index)
@@ -0,0 +1,205 @@
+"""
+_lod.py
+
+Level of detail of plot meshes, draw reduced resolution versions of a mesh
+when its cells are smaller than the screen pixels.
+"""
+
+# Load the needed packages
+import numpy as np
+
+#: reducers of blocks of cells, see :py:func:`reduce_blocks`
+METHODS = ("max", "mean", "nearest")
+
+
+def reduce_blocks(data, factor, method="nearest"):
+    '''
+    Reduce a 2D field by combining blocks of factor x factor cells.
+
+    Parameters
+    ----------
+    data : 2D (masked) array
+        Values of the mesh cells.
+    factor : int
+        Size of the blocks, the last ones may be smaller.
+    [Optional]
+    method : 'max', 'mean' or 'nearest'
+        'max' and 'mean' of the unmasked cells of each block. 'nearest'
+        keeps the value of the cell at the block center, or if masked of
+        the first unmasked cell, so values are never combined.
+        Blocks with all cells masked are masked.
+
+    Returns
+    -------
+    reduced : 2D masked array
+        Array of shape ceil(shape / factor).
+    '''
+    data = np.ma.asarray(data)
+    ny, nx = data.shape
+    my = -(-ny // factor)
+    mx = -(-nx // factor)
+    # pad with masked cells up to a multiple of factor
+    padded = np.ma.masked_all((my * factor, mx * factor), dtype=data.dtype)
+    padded[:ny, :nx] = data
+    blocks = padded.reshape(my, factor, mx, factor).transpose(0, 2, 1, 3)
+    blocks = blocks.reshape(my, mx, factor * factor)
+    if method == "max":
+        return blocks.max(axis=2)
+    elif method == "mean":
+        return blocks.mean(axis=2)
+    elif method == "nearest":
+        mask = np.ma.getmaskarray(blocks)
+        center = (factor // 2) * factor + factor // 2
+        choice = np.where(mask[:, :, center], np.argmin(mask, axis=2),
+                          center)
+        iy, ix = np.indices(choice.shape)
+        return np.ma.array(blocks.data[iy, ix, choice],
+                           mask=mask[iy, ix, choice])
+    else:
+        raise ValueError("Unknown reduction method: %s" % method)
+
+
+def reduce_edges(coords, factor):
+    '''Keep the cell edges of coords (ny+1, nx+1, ...) bounding the blocks
+    of :py:func:`reduce_blocks`.'''
+    ny = coords.shape[0] - 1
+    nx = coords.shape[1] - 1
+    iy = np.append(np.arange(0, ny, factor), ny)
+    ix = np.append(np.arange(0, nx, factor), nx)
+    return coords[iy][:, ix]
+
+
+def mesh_coordinates(mesh):
+    '''Return cell edges (ny+1, nx+1, 2) and data (ny, nx) of a
+    QuadMesh.'''
+    if hasattr(mesh, 'get_coordinates'):
+        coords = mesh.get_coordinates()
+    else:
+        coords = mesh._coordinates
+    coords = np.asarray(coords)
+    data = mesh.get_array()
+    shape = (coords.shape[0] - 1, coords.shape[1] - 1)
+    if data.ndim == 1:
+        # older matplotlib keeps the mesh array flat
+        data = data.reshape(shape)
+    return coords, data
+
+
+class LevelOfDetail(object):
+    '''
+    Show a plot mesh, or a reduced version of it, depending on the number
+    of its cells in view per screen pixel.
+
+    The mesh given, at full resolution, is kept in the axes and only
+    hidden when a reduced level is shown. Levels, reduced by powers of
+    two, are made when first needed and kept.
+    '''
+
+    def __init__(self, mesh, method="nearest", max_factor=16):
+        '''
+        Initialize the class.
+
+        Parameters
+        ----------
+        mesh : matplotlib QuadMesh
+            Full resolution mesh, already in its axes.
+        [Optional]
+        method : 'max', 'mean', 'nearest' or None
+            Reducer of blocks of cells, see :py:func:`reduce_blocks`. If
+            None always show the full resolution mesh.
+        max_factor : int
+            Largest block size.
+        '''
+        self.mesh = mesh
+        self.ax = mesh.axes
+        self.method = method
+        self.max_factor = max_factor
+        self.factor = 1
+        self.levels = {}
+        self.coords, self.data = mesh_coordinates(mesh)
+
+    @property
+    def shown(self):
+        '''Mesh currently drawn.'''
+        if self.factor == 1:
+            return self.mesh
+        return self.levels[self.factor]
+
+    def choose_factor(self):
+        '''Return block size for which cells in view are about one pixel
+        of the axes.'''
+        if self.method is None:
+            return 1
+        coords = self.coords
+        ncells = self.data.size
+        bbox = self.ax.bbox
+        pixels = bbox.width * bbox.height
+        if ncells <= pixels or pixels <= 0:
+            return 1
+        # share of cells and of axes area in view, from a sample of edges
+        xlim = sorted(self.ax.get_xlim())
+        ylim = sorted(self.ax.get_ylim())
+        step = max(1, int(np.sqrt(ncells / 4096.)))
+        sample = coords[::step, ::step].reshape(-1, 2)
+        inside = ((sample[:, 0] >= xlim[0]) & (sample[:, 0] <= xlim[1]) &
+                  (sample[:, 1] >= ylim[0]) & (sample[:, 1] <= ylim[1]))
+        if not inside.any():
+            return 1
+        visible = ncells * inside.mean()
+        x = sample[inside, 0]
+        y = sample[inside, 1]
+        covered = ((x.max() - x.min()) * (y.max() - y.min()) /
+                   ((xlim[1] - xlim[0]) * (ylim[1] - ylim[0])))
+        pixels = pixels * min(1., max(covered, 1e-3))
+        factor = 1
+        while (factor * 2 <= self.max_factor and
+               visible / (factor * 2) ** 2 >= pixels):
+            factor *= 2
+        return factor
+
+    def _level(self, factor):
+        '''Return mesh reduced by factor, making it if needed.'''
+        if factor not in self.levels:
+            edges = reduce_edges(self.coords, factor)
+            level = self.ax.pcolormesh(
+                edges[..., 0], edges[..., 1],
+                reduce_blocks(self.data, factor, self.method),
+                cmap=self.mesh.get_cmap(), norm=self.mesh.norm)
+            level.set_zorder(self.mesh.get_zorder())
+            level.set_visible(False)
+            self.levels[factor] = level
+        return self.levels[factor]
+
+    def show(self, factor):
+        '''Show mesh reduced by factor, 1 is full resolution.'''
+        if factor != 1:
+            self._level(factor)
+        for level, mesh in [(1, self.mesh)] + list(self.levels.items()):
+            mesh.set_visible(level == factor)
+        self.factor = factor
+
+    def update(self):
+        '''Show the level fitting the current view. Returns True if it
+        changed.'''
+        factor = self.choose_factor()
+        if factor == self.factor:
+            return False
+        self.show(factor)
+        return True
+
+    def sync(self):
+        '''Apply colormap and norm of the full resolution mesh to the
+        levels.'''
+        for mesh in self.levels.values():
+            mesh.set_cmap(self.mesh.get_cmap())
+            mesh.set_norm(self.mesh.norm)
+
+    def remove(self):
+        '''Remove levels from the axes and show the full resolution
+        mesh.'''
+        for mesh in self.levels.values():
+            if mesh.axes is not None:
+                mesh.remove()
+        self.levels = {}
+        self.factor = 1
+        self.mesh.set_visible(True)
@@ -0,0 +1,102 @@
+"""
+_overlay.py
+
+Keep artists drawn over plots, like range rings and map layers, between
+plots of an axes, instead of making them again after each ``ax.cla()``.
+"""
+
+# Load the needed packages
+from collections import OrderedDict
+
+from matplotlib.lines import Line2D
+from matplotlib.collections import Collection
+from matplotlib.patches import Patch
+
+
+def capture(ax, draw):
+    '''Call draw() and return its result and the list of artists it added
+    to ax.'''
+    before = set(id(artist) for artist in ax.get_children())
+    result = draw()
+    added = [artist for artist in ax.get_children()
+             if id(artist) not in before]
+    return result, added
+
+
+def readd(ax, artists):
+    '''Add artists removed from ax, e.g. by ``ax.cla()``, back to it.'''
+    for artist in artists:
+        if isinstance(artist, Line2D):
+            ax.add_line(artist)
+        elif isinstance(artist, Collection):
+            ax.add_collection(artist, autolim=False)
+        elif isinstance(artist, Patch):
+            ax.add_patch(artist)
+        else:
+            ax.add_artist(artist)
+
+
+def argument_names(method):
+    '''Return names of the arguments of function or method.'''
+    func = getattr(method, '__func__', method)
+    code = getattr(func, '__code__', None)
+    if code is None:
+        return ()
+    return code.co_varnames[:code.co_argcount]
+
+
+class OverlayCache(object):
+    '''
+    Artists, or other objects, kept under keys describing what they depend
+    on, e.g. radar location and range rings spacing. The least recently
+    used are dropped.
+    '''
+
+    def __init__(self, size=8):
+        '''
+        Initialize the class.
+
+        Parameters
+        ----------
+        [Optional]
+        size : int
+            Number of keys kept.
+        '''
+        self.size = size
+        self.cache = OrderedDict()
+
+    def get(self, key):
+        '''Return object kept under key, or None.'''
+        if key not in self.cache:
+            return None
+        value = self.cache.pop(key)
+        self.cache[key] = value
+        return value
+
+    def put(self, key, value):
+        '''Keep value under key.'''
+        self.cache.pop(key, None)
+        self.cache[key] = value
+        while len(self.cache) > self.size:
+            self.cache.popitem(last=False)
+
+    def clear(self):
+        self.cache.clear()
+
+    def add(self, ax, key, draw):
+        '''
+        Add to ax the artists kept under key, or call draw() to make them
+        the first time.
+
+        Returns
+        -------
+        artists : list
+            Artists added to ax.
+        '''
+        artists = self.get(key)
+        if artists is None:
+            result, artists = capture(ax, draw)
+            self.put(key, artists)
+        else:
+            readd(ax, artists)
+        return artists
@@ -0,0 +1,156 @@
+"""
+_raster.py
+
+Draw polar sweeps as an image at screen resolution, instead of a mesh.
+"""
+
+# Load the needed packages
+import numpy as np
+
+from matplotlib.image import AxesImage
+
+
+def polar_index(azimuth, ground_range, xlim, ylim, width, height):
+    '''
+    Return, for each pixel of a view, the gate it falls in.
+
+    Parameters
+    ----------
+    azimuth : 1D array
+        Azimuth of the rays in degrees.
+    ground_range : 1D array
+        Ground distance of the gate centers from the radar, in the units
+        of the view.
+    xlim, ylim : tuples
+        Limits of the view, east and north of the radar.
+    width, height : int
+        Size of the view in pixels.
+
+    Returns
+    -------
+    index : 2D array of int
+        Array (height, width) with the flat index ray * ngates + gate, or
+        -1 for pixels outside the sweep. Row 0 is at ylim[0].
+    '''
+    nrays = len(azimuth)
+    ngates = len(ground_range)
+    xstep = (xlim[1] - xlim[0]) / float(width)
+    ystep = (ylim[1] - ylim[0]) / float(height)
+    x = xlim[0] + xstep * (np.arange(width) + 0.5)
+    y = ylim[0] + ystep * (np.arange(height) + 0.5)
+    x, y = np.meshgrid(x, y)
+    angle = np.degrees(np.arctan2(x, y)) % 360.
+    distance = np.hypot(x, y)
+
+    # nearest ray, rays closer than one spacing to the pixel
+    order = np.argsort(azimuth)
+    sorted_az = np.asarray(azimuth, dtype=float)[order] % 360.
+    spacing = np.median(np.diff(sorted_az)) if nrays > 1 else 360.
+    ext_az = np.concatenate(
+        [sorted_az[-1:] - 360., sorted_az, sorted_az[:1] + 360.])
+    right = np.searchsorted(ext_az, angle)
+    right = np.clip(right, 1, len(ext_az) - 1)
+    dright = ext_az[right] - angle
+    dleft = angle - ext_az[right - 1]
+    nearest = np.where(dleft <= dright, right - 1, right)
+    ray = order[(nearest - 1) % nrays]
+    valid = np.minimum(dleft, dright) <= spacing
+
+    # gate, bounded by the mid points of gate centers
+    ground_range = np.asarray(ground_range, dtype=float)
+    if ngates > 1:
+        mid = (ground_range[1:] + ground_range[:-1]) / 2.
+        edges = np.concatenate(
+            [[ground_range[0] - (mid[0] - ground_range[0])], mid,
+             [ground_range[-1] + (ground_range[-1] - mid[-1])]])
+    else:
+        edges = np.array([0., 2. * ground_range[0]])
+    gate = np.searchsorted(edges, distance) - 1
+    valid &= (gate >= 0) & (gate < ngates)
+
+    index = ray * ngates + gate
+    index[~valid] = -1
+    return index
+
+
+class PolarRaster(AxesImage):
+    '''
+    Image of a PPI sweep resampled to the pixels of its axes.
+
+    The lookup table from pixels to gates is computed when the view
+    limits or the axes size in pixels change, as found at draw time, so
+    the image follows zooms, resizes and prints at other resolutions.
+    Changing the data is a gather through the table.
+    '''
+
+    def __init__(self, ax, azimuth, ground_range, data, **kwargs):
+        '''
+        Initialize the class.
+
+        Parameters
+        ----------
+        ax : matplotlib Axes
+            Axes to draw in, the image is not added to it.
+        azimuth : 1D array
+            Azimuth of the rays in degrees.
+        ground_range : 1D array
+            Ground distance of the gate centers in the units of ax.
+        data : 2D (masked) array
+            Values of the sweep (nrays, ngates).
+        [Optional]
+        kwargs
+            Passed to matplotlib AxesImage, e.g. cmap and norm.
+        '''
+        kwargs.setdefault('interpolation', 'nearest')
+        super(PolarRaster, self).__init__(ax, origin='lower', **kwargs)
+        if hasattr(self, 'set_figure'):
+            self.set_figure(ax.figure)
+        self.set_clip_path(ax.patch)
+        self._key = None
+        self._index = None
+        self._image = None
+        self.set_polar(azimuth, ground_range, data)
+
+    def set_polar(self, azimuth, ground_range, data):
+        '''Change sweep geometry and data.'''
+        self.azimuth = np.asarray(azimuth)
+        self.ground_range = np.asarray(ground_range)
+        self._key = None
+        self.set_sweep_data(data)
+
+    def set_sweep_data(self, data):
+        '''Change sweep data, of the same shape.'''
+        self.sweep_data = np.ma.asarray(data)
+        self._image = None
+        self.stale = True
+
+    def _update_image(self):
+        '''Update image for the current view.'''
+        ax = self.axes
+        bbox = ax.bbox
+        width = max(1, int(round(bbox.width)))
+        height = max(1, int(round(bbox.height)))
+        xlim = tuple(ax.get_xlim())
+        ylim = tuple(ax.get_ylim())
+        key = (xlim, ylim, width, height)
+        if key != self._key:
+            self._index = polar_index(self.azimuth, self.ground_range,
+                                      xlim, ylim, width, height)
+            self._key = key
+            self._image = None
+        if self._image is None:
+            index = self._index
+            outside = index < 0
+            flat = self.sweep_data.ravel()
+            values = np.ma.getdata(flat)[index]
+            mask = np.ma.getmaskarray(flat)[index] | outside
+            self._image = np.ma.array(values, mask=mask)
+            self.set_data(self._image)
+            # set_extent would also autoscale the axes limits
+            self._extent = xlim + ylim
+
+    def draw(self, renderer, *args, **kwargs):
+        if not self.get_visible():
+            return
+        self._update_image()
+        super(PolarRaster, self).draw(renderer, *args, **kwargs)
@@ -0,0 +1,167 @@
+"""
+_redraw.py
+
+Schedule redraws of figure canvases, at most once per screen frame.
+"""
+from __future__ import print_function
+# Load the needed packages
+import time
+from collections import deque
+
+from ..core import QtCore, QtWidgets
+
+#: parts of a display that can be marked for redraw
+PARTS = ("all", "axes", "mesh", "colorbar", "overlay")
+
+
+def frame_interval():
+    '''Return the screen refresh interval in milliseconds.'''
+    try:
+        rate = QtWidgets.QApplication.primaryScreen().refreshRate()
+    except:
+        rate = 60.
+    if not rate or rate <= 0:
+        rate = 60.
+    return max(1, int(1000. / rate))
+
+
+class RedrawScheduler(QtCore.QObject):
+    '''
+    Redraw a canvas once per frame, only the parts marked dirty.
+
+    Components mark what changed with :py:func:`mark` instead of drawing.
+    Marks are merged until the next frame, then the whole figure is drawn,
+    or if only parts with registered artists are dirty, those artists are
+    blitted over the cached background of an
+    :py:class:`~artview.components._blit.ArtistBlitter`.
+    '''
+
+    def __init__(self, canvas, blitter=None, history=100):
+        '''
+        Initialize the class.
+
+        Parameters
+        ----------
+        canvas : FigureCanvas
+            Qt canvas to redraw, also the parent of the scheduler.
+        [Optional]
+        blitter : ArtistBlitter or None
+            Blitter for partial redraws, if None always draw the figure.
+        history : int
+            Number of frame times kept for :py:func:`stats`.
+        '''
+        super(RedrawScheduler, self).__init__(canvas)
+        self.canvas = canvas
+        self.blitter = blitter
+        self.parts = {}
+        self.dirty = set()
+        self.marks = 0
+        self.frames = 0
+        self.blits = 0
+        self.frameTimes = deque(maxlen=history)
+        self._lastFlush = 0.
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.flush)
+        self.interval = frame_interval()
+
+    def register(self, part, artists):
+        '''
+        Allow partial redraws of part.
+
+        Parameters
+        ----------
+        part : string
+            One of 'mesh', 'colorbar' or 'overlay'.
+        artists : callable
+            Returns the list of artists to redraw for part, or None if the
+            figure must be drawn.
+        '''
+        self.parts[part] = artists
+
+    def mark(self, *parts):
+        '''Mark parts dirty, see PARTS, and schedule a redraw. No parts is
+        the same as 'all'.'''
+        for part in parts or ("all",):
+            if part not in PARTS:
+                raise ValueError("Unknown part: %s" % part)
+            self.dirty.add(part)
+        self.marks += 1
+        if not self.timer.isActive():
+            wait = self.interval - (time.time() - self._lastFlush) * 1000.
+            self.timer.start(max(0, int(wait)))
+
+    def cancel(self):
+        '''Drop pending redraw.'''
+        self.timer.stop()
+        self.dirty = set()
+
+    def _artists(self):
+        '''Return artists of the dirty parts, or None to draw all.'''
+        artists = []
+        for part in self.dirty:
+            if part not in self.parts:
+                return None
+            part_artists = self.parts[part]()
+            if part_artists is None:
+                return None
+            artists.extend(part_artists)
+        return artists
+
+    def flush(self):
+        '''Redraw dirty parts now.'''
+        self.timer.stop()
+        if not self.dirty:
+            return
+        t0 = time.time()
+        artists = None
+        if self.blitter is not None:
+            try:
+                artists = self._artists()
+            except:
+                artists = None
+        self.dirty = set()
+        if artists:
+            # remove duplicates, keep the order
+            unique = []
+            for artist in artists:
+                if not any(artist is other for other in unique):
+                    unique.append(artist)
+            self.blitter.blit(unique)
+            self.blits += 1
+        else:
+            self.canvas.draw()
+        self.frames += 1
+        self._lastFlush = time.time()
+        self.frameTimes.append(self._lastFlush - t0)
+
+    def stats(self):
+        '''
+        Return frame statistics.
+
+        Returns
+        -------
+        stats : dict
+            'frames' drawn, of which 'blits' partial, 'marks' received,
+            'last', 'mean' and 'max' frame time in milliseconds of the
+            last frames.
+        '''
+        times = list(self.frameTimes)
+        stats = {"frames": self.frames, "blits": self.blits,
+                 "marks": self.marks}
+        if times:
+            stats["last"] = times[-1] * 1000.
+            stats["mean"] = sum(times) / len(times) * 1000.
+            stats["max"] = max(times) * 1000.
+        return stats
+
+    def summary(self):
+        '''Return a string with the frame statistics, see
+        :py:func:`stats`.'''
+        stats = self.stats()
+        text = ("Frames drawn: %(frames)d (%(blits)d partial), "
+                "redraw requests: %(marks)d" % stats)
+        if "last" in stats:
+            text += ("<br>Frame time: last %(last).1f ms, mean %(mean).1f "
+                     "ms, max %(max).1f ms" % stats)
+        return text
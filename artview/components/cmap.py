@@ -62,7 +62,10 @@ class ColormapEdit(core.Component):
         self.cax = self.fig.add_axes([0, 0, 0.8, 1])
         self.canvas = FigureCanvasQTAgg(self.fig)
         self.canvas.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
-        self.canvas.mpl_connect('button_press_event', self.select_cmap)
+        self.canvas.mpl_connect('button_press_event', self.onPress)
+        self.canvas.mpl_connect('motion_notify_event', self.onMotion)
+        self.canvas.mpl_connect('button_release_event', self.onRelease)
+        self._drag = None
 
     def createUI(self):
         '''
@@ -246,6 +249,45 @@ class ColormapEdit(core.Component):
             self.cmap['cmap'] = cmap
             self.plot()
 
+    def onPress(self, event):
+        '''Start dragging the nearest colorbar limit.'''
+        self._drag = None
+        if self.cmap is None:
+            return
+        if event.button != 1 or self.norm_type.currentIndex() == 5:
+            self.select_cmap(event)
+            return
+        bbox = self.cax.bbox
+        if (event.y - bbox.y0) > bbox.height / 2.:
+            limit = 'vmax'
+        else:
+            limit = 'vmin'
+        self._drag = (limit, event.y, self.cmap['vmin'], self.cmap['vmax'])
+        self._dragged = False
+
+    def onMotion(self, event):
+        '''Move the dragged limit and apply it to the shared colormap, so
+        displays follow interactively.'''
+        if self._drag is None:
+            return
+        limit, y0, vmin, vmax = self._drag
+        delta = (event.y - y0) / self.cax.bbox.height * (vmax - vmin)
+        if limit == 'vmax':
+            value = max(vmax + delta, vmin + 1e-6 * abs(vmax - vmin))
+            self.ent_vmax.setText("%.4g" % value)
+        else:
+            value = min(vmin + delta, vmax - 1e-6 * abs(vmax - vmin))
+            self.ent_vmin.setText("%.4g" % value)
+        self._dragged = True
+        self.apply()
+
+    def onRelease(self, event):
+        '''Finish dragging, a click without motion selects a
+        colormap.'''
+        if self._drag is not None and not self._dragged:
+            self.select_cmap(event)
+        self._drag = None
+
     def apply(self):
         '''Apply changes to shared colormap.'''
         self.update_colormap()
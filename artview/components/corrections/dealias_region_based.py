@@ -66,6 +66,8 @@ class DealiasRegionBased(Component):
 
         self.configMenu.addAction(QtWidgets.QAction("Set Parameters", self,
                                                 triggered=self.setParameters))
+        self.configMenu.addAction(QtWidgets.QAction(
+            "Add to Batch Pipeline", self, triggered=self.savePipelineStep))
         self.configMenu.addAction(QtWidgets.QAction("Help", self,
                                                 triggered=self._displayHelp))
         self.parameters = {
@@ -168,6 +170,15 @@ class DealiasRegionBased(Component):
         for key in parm.keys():
             self.parameters[key] = parm[key]
 
+    def savePipelineStep(self):
+        '''Add dealias_region_based with current parameters to a batch
+        pipeline, see :py:mod:`artview.batch`.'''
+        parameters = self.parameters.copy()
+        del parameters["radar"]
+        del parameters["gatefilter"]
+        common.SavePipelineStep({"step": "dealias_region_based",
+                                 "parameters": parameters})
+
     def _displayHelp(self):
         '''Display Py-Art's docstring for help.'''
         common.ShowLongText(pyart.correct.dealias_region_based.__doc__)
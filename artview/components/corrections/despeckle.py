@@ -87,6 +87,8 @@ class Despeckle(Component):
                            'size': 10,
                            'delta': 5}
 
+        self.configMenu.addAction(QtWidgets.QAction(
+            "Add to Batch Pipeline", self, triggered=self.savePipelineStep))
         action = QtWidgets.QAction("Add Object Field", self,
                                triggered=self.addObjectsField)
         action.setToolTip("Identify Object and add as field to radar")
@@ -149,6 +151,13 @@ class Despeckle(Component):
             gatefilter=gatefilter, delta=self.parameters['delta'])
         self.Vgatefilter.change(gatefilter)
 
+    def savePipelineStep(self):
+        '''Add despeckle with current parameters to a batch pipeline, see
+        :py:mod:`artview.batch`.'''
+        step = {"step": "despeckle", "field": self.Vfield.value}
+        step.update(self.parameters)
+        common.SavePipelineStep(step)
+
     def addObjectsField(self):
         '''Add Objects Field to Radar.'''
         radar = self.Vradar.value
@@ -65,6 +65,8 @@ class PhaseProcLp(Component):
 
         self.configMenu.addAction(QtWidgets.QAction("Set Parameters", self,
                                                 triggered=self.setParameters))
+        self.configMenu.addAction(QtWidgets.QAction(
+            "Add to Batch Pipeline", self, triggered=self.savePipelineStep))
         self.configMenu.addAction(QtWidgets.QAction("Help", self,
                                                 triggered=self._displayHelp))
         self.parameters = {
@@ -200,6 +202,14 @@ class PhaseProcLp(Component):
         for key in parm.keys():
             self.parameters[key] = parm[key]
 
+    def savePipelineStep(self):
+        '''Add phase_proc_lp with current parameters to a batch pipeline,
+        see :py:mod:`artview.batch`.'''
+        parameters = self.parameters.copy()
+        del parameters["radar"]
+        common.SavePipelineStep({"step": "phase_proc_lp",
+                                 "parameters": parameters})
+
     def _displayHelp(self):
         '''Display Py-Art's docstring for help.'''
         common.ShowLongText(pyart.correct.phase_proc_lp.__doc__)
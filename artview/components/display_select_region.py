@@ -16,7 +16,7 @@ from matplotlib.lines import Line2D
 import csv
 
 from ..core import (Variable, Component, common, VariableChoose,
-                    componentsList, QtWidgets, QtCore)
+                    componentsList, QtWidgets, QtCore, write_queue)
 from ..core.points import Points, write_points_csv, read_points_csv
 
 
@@ -194,8 +194,19 @@ class DisplaySelectRegion(Component):
                 if func is not None:
                     points = func(path)
                     if points is not None:
+                        if self.withinBox.isChecked():
+                            points = self._select_within(points)
                         self.Vpoints.change(points)
 
+    def _select_within(self, points):
+        '''Return the current points also in points, keeping the fields
+        already gathered, or points if there is no such selection.'''
+        current = self.Vpoints.value
+        if (not hasattr(current, 'subset') or
+                getattr(current, 'container', None) is not points.container):
+            return points
+        return current.subset(points.contains(current))
+
     def connect(self):
         '''Connect the SelectRegion instance.'''
         if self.fig is not None:
@@ -237,6 +248,9 @@ class DisplaySelectRegion(Component):
         self.buttonRestoreMask.setToolTip("Restore the original data mask")
         self.buttonResetSelectRegion = QtWidgets.QPushButton('Reset Region', self)
         self.buttonResetSelectRegion.setToolTip("Clear the Region")
+        self.withinBox = QtWidgets.QCheckBox('Select Within Region', self)
+        self.withinBox.setToolTip("Closed paths narrow the selected Region "
+                                  "instead of replacing it")
         self.saveButton = QtWidgets.QPushButton("Save File", self)
         self.saveButton.setToolTip("Save modified radar instance to "
                                    "cfradial file")
@@ -262,6 +276,7 @@ class DisplaySelectRegion(Component):
         self.rBox_layout.addWidget(self.buttonApplyMask)
         self.rBox_layout.addWidget(self.buttonRestoreMask)
         self.rBox_layout.addWidget(self.buttonResetSelectRegion)
+        self.rBox_layout.addWidget(self.withinBox)
         self.rBox_layout.addWidget(self.saveButton)
         self.rBox_layout.addWidget(self.buttonHelp)
 
@@ -276,6 +291,8 @@ class DisplaySelectRegion(Component):
             " Primary Mouse Button (e.g. left button)- add vertex<br>"
             " Hold button to draw free-hand path<br>"
             " Secondary Button (e.g. right button)- close path<br><br>"
+            "With 'Select Within Region' checked, closing a path keeps "
+            "only the selected points inside it.<br><br>"
             "A message 'Closed Region' appears in status bar when "
             "boundary is properly closed.<br><br>"
             "WARNING: By saving the file, the mask associated with the data "
@@ -350,6 +367,13 @@ class DisplaySelectRegion(Component):
         self.disconnect()
         super(DisplaySelectRegion, self).closeEvent(QCloseEvent)
 
+    def _points_field(self, points):
+        '''Return the current field if the points have it, else their first
+        field.'''
+        if self.Vfield.value in points.fields:
+            return self.Vfield.value
+        return list(points.fields.keys())[0]
+
     def displayStats(self):
         '''Calculate basic statistics of the SelectRegion list.'''
         from ..core import common
@@ -357,7 +381,7 @@ class DisplaySelectRegion(Component):
             common.ShowWarning("Please select Region first")
         else:
             points = self.Vpoints.value
-            field = list(points.fields.keys())[0]
+            field = self._points_field(points)
             SelectRegionstats = common._array_stats(
                 points.fields[field]['data'])
             text = "<b>Basic statistics for the selected Region</b><br><br>"
@@ -374,7 +398,7 @@ class DisplaySelectRegion(Component):
             common.ShowWarning("Please select Region first")
         else:
             points = self.Vpoints.value
-            field = list(points.fields.keys())[0]
+            field = self._points_field(points)
             plot = PlotDisplay(
                 points.fields[field]['data'], plot_type="hist",
                 name="Select Region Histogram")
@@ -390,19 +414,20 @@ class DisplaySelectRegion(Component):
         dirIn, fname = os.path.split(self.Vradar.value.filename)
         filename = QtWidgets.QFileDialog.getSaveFileName(
             self, 'Save Radar File', dirIn)
+        if isinstance(filename, tuple): # PyQt5
+            filename = filename[0]
         filename = str(filename)
         if filename == '' or self.Vradar.value is None:
             print("Vradar is None!")
         else:
-            radar = self.Vradar.value
+            mask = None
             if self.Vgatefilter.value is not None:
-                radar = radar.extract_sweeps(range(radar.nsweeps))
-                for field in radar.fields.keys():
-                    radar.fields[field]['data'].mask = np.logical_or(
-                        self.Vgatefilter.value._gate_excluded,
-                        radar.fields[field]['data'].mask)
-            pyart.io.write_cfradial(filename, radar)
-            print("Saved %s" % (filename))
+                mask = self.Vgatefilter.value._gate_excluded
+            write_queue.save(filename, self.Vradar.value, "radar", mask=mask,
+                             errback=self._saveFailed)
+
+    def _saveFailed(self, request):
+        common.ShowWarning("Failed saving %s" % request.filename)
 
     ######################
     #   Filter Methods   #
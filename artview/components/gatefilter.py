@@ -9,7 +9,8 @@ import numpy as np
 import pyart
 import time
 
-from ..core import Component, Variable, common, QtWidgets, QtCore, componentsList
+from ..core import (Component, Variable, common, QtWidgets, QtCore,
+                    componentsList, write_queue)
 from ..components import RadarDisplay
 
 
@@ -145,6 +146,12 @@ class GateFilter(Component):
         self.restoreButton.setToolTip('Remove applied filters')
         gBox_layout.addWidget(self.restoreButton, 0, 3, 1, 1)
 
+        self.pipelineButton = QtWidgets.QPushButton("Add to Batch Pipeline")
+        self.pipelineButton.clicked.connect(self.savePipelineStep)
+        self.pipelineButton.setToolTip(
+            'Add applied filters to a batch pipeline file')
+        gBox_layout.addWidget(self.pipelineButton, 0, 5, 1, 1)
+
         self.filterButton = QtWidgets.QPushButton("Filter")
         self.filterButton.clicked.connect(self.apply_filters)
         self.filterButton.setToolTip('Make Filter')
@@ -299,35 +306,34 @@ class GateFilter(Component):
                  "Vgatefilter.value._gate_excluded)<br>")
         common.ShowLongText(text)
 
+    def savePipelineStep(self):
+        '''Add applied filters to a batch pipeline, see
+        :py:mod:`artview.batch`.'''
+        if not getattr(self, 'filtersteps', None):
+            common.ShowWarning("Must apply filter first.")
+            return
+        common.SavePipelineStep({"step": "gatefilter",
+                                 "filters": self.filtersteps})
+
     def saveRadar(self):
-        '''Open a dialog box to save radar file.'''
+        '''Open a dialog box to save radar file, with the excluded gates
+        masked.'''
         dirIn, fname = os.path.split(self.Vradar.value.filename)
         filename = QtWidgets.QFileDialog.getSaveFileName(
             self, 'Save Radar File', dirIn)
+        if isinstance(filename, tuple): # PyQt5
+            filename = filename[0]
         filename = str(filename)
         if filename == '' or self.Vradar.value is None:
             return
         else:
-            for field in self.Vradar.value.fields.keys():
-                self.Vradar.value.fields[field]['data'] = np.ma.array(
-                    self.Vradar.value.fields[field]['data'],
-                    mask=self.Vgatefilter.value._gate_excluded)
-
-                # **This section is a potential replacement for merging
-                # if problems are found in mask later **
-#               # combine the masks  (noting two Falses is a good point)
-#               combine = np.ma.mask_or(
-#                   self.Vradar.value.fields[field]['data'].mask,
-#                   self.Vgatefilter.value._gate_excluded)
-#               self.Vradar.value.fields[field]['data'].mask = np.ma.mask_or(
-#                    combine,
-#                    self.Vradar.value.fields[field]['data'].mask)
-#               self.Vradar.value.fields[field].data[:]=np.where(combine,
-#                     self.Vradar.value.fields[field]['_FillValue'],
-#                     self.Vradar.value.fields[field]['data'].data)
-
-            pyart.io.write_cfradial(filename, self.Vradar.value)
-            print("Saved %s" % (filename))
+            # the mask is applied to a snapshot, not to the displayed radar
+            write_queue.save(filename, self.Vradar.value, "radar",
+                             mask=self.Vgatefilter.value._gate_excluded,
+                             errback=self._saveFailed)
+
+    def _saveFailed(self, request):
+        common.ShowWarning("Failed saving %s" % request.filename)
 
     def restoreRadar(self):
         '''Remove applied filters by restoring original mask'''
@@ -366,6 +372,7 @@ class GateFilter(Component):
         # Clear flags from previous filter application or instantiate if first
         args = {}
         self.filterscript = []
+        self.filtersteps = []
 
         # Create a list of possible filtering actions
         val2Cmds = ["inside", "outside"]
@@ -400,6 +407,8 @@ class GateFilter(Component):
                 if operator in val2Cmds:
                     filtercmd = "gatefilter.%s(%s, %s, %s)" % (
                         self.operators[operator], field, val1, val2)
+                    filterstep = [self.operators[operator],
+                                  [field, str(val1), str(val2)], {}]
                     if operator == "inside":
                         try:
                             gatefilter.exclude_inside(
@@ -420,6 +429,8 @@ class GateFilter(Component):
                 elif operator in valinc:
                     filtercmd = "gatefilter.%s(%s, %s, inclusive=True)" % (
                         self.operators[operator], field, val1)
+                    filterstep = [self.operators[operator],
+                                  [field, str(val1)], {"inclusive": True}]
                     if operator == "<=":
                         try:
                             gatefilter.exclude_below(
@@ -440,6 +451,13 @@ class GateFilter(Component):
                 else:
                     filtercmd = "gatefilter.%s(%s, %s, inclusive=False)" % (
                         self.operators[operator], field, val1)
+                    if operator in ("<", ">"):
+                        filterstep = [self.operators[operator],
+                                      [field, str(val1)],
+                                      {"inclusive": False}]
+                    else:
+                        filterstep = [self.operators[operator],
+                                      [field, str(val1)], {}]
                     if operator == "=":
                         try:
                             gatefilter.exclude_equal(
@@ -474,6 +492,7 @@ class GateFilter(Component):
                             common.ShowLongText(pyarterr + error)
 
                 self.filterscript.append(filtercmd)
+                self.filtersteps.append(filterstep)
 
         print(("Filtering took %fs" % (time.time()-t0)))
         # If no filters were applied issue warning
@@ -17,7 +17,10 @@ sys.path.insert(0, path)
 
 import artview
 
-from ..core import Component, Variable, common, QtWidgets, QtCore
+from ..core import (Component, Variable, common, QtWidgets, QtCore,
+                    async_loader, get_file_index)
+from ..core.io import field_is_loaded, field_nbytes
+from ..core.lazy import release_fields
 
 # get list of read functions
 import inspect
@@ -123,46 +126,21 @@ class DirectoryList(Component):
         # try several open
         print ("open: %s" % path)
         self.filename = str(path)
-        try:
-            radar = pyart.io.read(self.filename, delay_field_loading=True)
-            # Add the filename for Display
-            radar.filename = self.filename
-            self.Vradar.change(radar)
-            return
-        except:
-            try:
-                radar = pyart.io.read(self.filename)
-                # Add the filename for Display
-                radar.filename = self.filename
-                self.Vradar.change(radar)
-                return
-            except:
-                import traceback
-                print(traceback.format_exc())
-                radar_warning = True
-        try:
-            grid = pyart.io.read_grid(
-                self.filename, delay_field_loading=True)
-            self.Vgrid.change(grid)
-            return
-        except:
-            try:
-                grid = pyart.io.read_grid(self.filename)
-                self.Vgrid.change(grid)
-                return
-            except:
-                import traceback
-                print(traceback.format_exc())
-                grid_warning = True
-
-        if grid_warning or radar_warning:
-            msg = "Py-ART didn't recognize this file!"
-            common.ShowWarning(msg)
-        else:
-            msg = "Could not open file, invalid mode!"
-            common.ShowWarning(msg)
+        async_loader.load(self.filename, callback=self._openDone,
+                          errback=self._openFailed)
         return
 
+    def _openDone(self, container):
+        '''Receive container read by open.'''
+        if isinstance(container, pyart.core.Grid):
+            self.Vgrid.change(container)
+        else:
+            self.Vradar.change(container)
+
+    def _openFailed(self, request):
+        '''Warn about a file open could not read.'''
+        common.ShowWarning(request.error)
+
     def contextMenu(self, pos):
         '''Contruct right-click menu.'''
         menu = QtWidgets.QMenu(self)
@@ -274,6 +252,9 @@ class FileDetail(Component):
         self.menu.addAction("Show Short Info File", self._show_RadarShortInfo)
         self.menu.addAction("Save Short Info File", self._save_RadarShortInfo)
         self.menu.addAction("Save Long Info File", self._get_RadarLongInfo)
+        self.menu.addAction("Show Index Info", self._show_IndexInfo)
+        self.menu.addAction("Show Field Memory", self._show_FieldMemory)
+        self.menu.addAction("Release Unused Fields", self._release_Fields)
         return self.button
 
 
@@ -387,6 +368,68 @@ class FileDetail(Component):
         txOut = self._get_RadarShortInfo()
         common.ShowLongText(txOut)
 
+    def _get_IndexInfo(self, filename):
+        '''Return indexed metadata of filename, without opening it if
+        already indexed.'''
+        entry = get_file_index().get(filename)
+        if entry is None:
+            return "Py-ART didn't recognize this file!"
+        return (('File: %s\n' % entry['path']) +
+                ('Container: %s\n' % entry['kind']) +
+                ('Site: %s\n' % entry['site']) +
+                ('Scan time: %s\n' % entry['scan_time']) +
+                ('Scan type: %s\n' % entry['scan_type']) +
+                ('Number of sweeps/levels: %s\n' % entry['nsweeps']) +
+                ('Fields: %s\n' % ", ".join(entry['fields'])))
+
+    def _show_IndexInfo(self):
+        '''Choose a file and show its indexed metadata.'''
+        dirIn = ''
+        for container in (self.Vradar.value, self.Vgrid.value):
+            if hasattr(container, 'filename'):
+                dirIn = os.path.dirname(container.filename)
+        filename = QtWidgets.QFileDialog.getOpenFileName(
+            self, 'Show index info', dirIn)
+        if isinstance(filename, tuple): # PyQt5
+            filename = filename[0]
+        filename = str(filename)
+        if filename == '':
+            return
+        common.ShowLongText(self._get_IndexInfo(filename))
+
+    def _get_FieldMemory(self):
+        '''Return per field memory usage of radar and grid.'''
+        txOut = ''
+        for label, container in (('Radar', self.Vradar.value),
+                                 ('Grid', self.Vgrid.value)):
+            if container is None:
+                continue
+            total = 0
+            txOut += '%s: %s\n' % (label, getattr(container, 'filename', ''))
+            for name in sorted(container.fields.keys()):
+                field = container.fields[name]
+                if field_is_loaded(field):
+                    nbytes = field_nbytes(field)
+                    total += nbytes
+                    txOut += '    %s: %.2f MB\n' % (name, nbytes / 2.**20)
+                else:
+                    txOut += '    %s: not loaded\n' % name
+            txOut += '    Total: %.2f MB\n\n' % (total / 2.**20)
+        if not txOut:
+            txOut = 'No radar or grid open'
+        return txOut
+
+    def _show_FieldMemory(self):
+        common.ShowLongText(self._get_FieldMemory())
+
+    def _release_Fields(self):
+        '''Free data of fields not displayed, they are read again
+        if needed.'''
+        for container in (self.Vradar.value, self.Vgrid.value):
+            if container is not None:
+                release_fields(container)
+        self._show_FieldMemory()
+
     def showSaveDialog(self, fsuggest, txt):
 
         path = QtWidgets.QFileDialog.getSaveFileName(
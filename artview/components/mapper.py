@@ -149,6 +149,8 @@ class Mapper(Component):
         self.configMenu.addAction(QtWidgets.QAction("Set map_to_grid Parameters", self,
                                                     triggered=self.setGriddingParameters))
         self.fieldMenu = self.configMenu.addMenu("Fields")
+        self.configMenu.addAction(QtWidgets.QAction(
+            "Add to Batch Pipeline", self, triggered=self.savePipelineStep))
         self.configMenu.addAction(QtWidgets.QAction("Help", self,
                                                     triggered=self._displayHelp))
 
@@ -216,21 +218,7 @@ class Mapper(Component):
             return
         # mount options
         self.parameters['radars'] = (self.Vradar.value,)
-        self.parameters['fields'] = []
-        for field in self.field_actions.keys():
-            if self.field_actions[field].isChecked():
-                self.parameters['fields'].append(field)
-
-        self.parameters['grid_shape'] = (self.gridShapeZ.value(),
-                                         self.gridShapeY.value(),
-                                         self.gridShapeX.value())
-        self.parameters['grid_limits'] = (
-            (self.gridLimitsZmin.value(), self.gridLimitsZmax.value()),
-            (self.gridLimitsYmin.value(), self.gridLimitsYmax.value()),
-            (self.gridLimitsXmin.value(), self.gridLimitsXmax.value()))
-
-        self.parameters['grid_origin'] = (self.parameters['grid_origin_lat'],
-                                          self.parameters['grid_origin_lon'])
+        self._mountParameters()
 
         # execute
         print("mapping ..", file=log.debug)
@@ -248,6 +236,33 @@ class Mapper(Component):
         # update
         self.Vgrid.change(grid)
 
+    def _mountParameters(self):
+        '''Read fields and grid geometry from the interface into
+        parameters.'''
+        self.parameters['fields'] = []
+        for field in self.field_actions.keys():
+            if self.field_actions[field].isChecked():
+                self.parameters['fields'].append(field)
+
+        self.parameters['grid_shape'] = (self.gridShapeZ.value(),
+                                         self.gridShapeY.value(),
+                                         self.gridShapeX.value())
+        self.parameters['grid_limits'] = (
+            (self.gridLimitsZmin.value(), self.gridLimitsZmax.value()),
+            (self.gridLimitsYmin.value(), self.gridLimitsYmax.value()),
+            (self.gridLimitsXmin.value(), self.gridLimitsXmax.value()))
+
+        self.parameters['grid_origin'] = (self.parameters['grid_origin_lat'],
+                                          self.parameters['grid_origin_lon'])
+
+    def savePipelineStep(self):
+        '''Add gridding with current parameters to a batch pipeline, see
+        :py:mod:`artview.batch`.'''
+        self._mountParameters()
+        parameters = self.parameters.copy()
+        del parameters["radars"]
+        common.SavePipelineStep({"step": "grid", "parameters": parameters})
+
     def setParameters(self):
         '''Open set parameters dialog.'''
         parm = common.get_options(self.general_parameters_type, self.parameters)
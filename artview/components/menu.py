@@ -12,7 +12,9 @@ import sys
 import glob
 
 from ..core import (Variable, Component, common, QtWidgets, QtCore,
-                    componentsList, log)
+                    componentsList, log, async_loader, Prefetcher, write_queue,
+                    container_cache, deferUpdates)
+from ..core.lazy import fields_in_use
 
 
 class Menu(Component):
@@ -71,6 +73,8 @@ class Menu(Component):
         self.mode = []
         for m in mode:
             self.mode.append(m.lower())
+        self.prefetcher = Prefetcher(modes=self.mode)
+        self.loadRequest = None
         self.Vradar = Vradar
         self.current_container = self.Vradar
         self.Vgrid = Vgrid
@@ -89,12 +93,12 @@ class Menu(Component):
             self.Vfilelist = Variable(None)
         if Vradar is None and Vgrid is None and self.mode:
             if filename is None:
-                self.showFileDialog()
+                self.showFileDialog(block=True)
             elif filename is False:
                 pass
             else:
                 self.filename = filename
-                self._openfile()
+                self._openfile(block=True)
 
         # Launch the GUI interface
         self.LaunchApp()
@@ -131,6 +135,12 @@ class Menu(Component):
         else:
             QtWidgets.QWidget.keyPressEvent(self, event)
 
+    def closeEvent(self, QCloseEvent):
+        '''Re-implementation to drop the edited containers cached for this
+        component.'''
+        container_cache.release(self)
+        super(Menu, self).closeEvent(QCloseEvent)
+
     ####################
     # GUI methods #
     ####################
@@ -163,7 +173,7 @@ class Menu(Component):
         self.tabWidget.removeTab(idx)
         widget.close()
 
-    def showFileDialog(self):
+    def showFileDialog(self, block=False):
         '''Open a dialog box to choose file.'''
 
         filename = QtWidgets.QFileDialog.getOpenFileName(
@@ -177,7 +187,7 @@ class Menu(Component):
             return
         else:
             self.filename = filename
-            self._openfile()
+            self._openfile(block=block)
 
     def saveCurrent(self):
         if self.current_container == self.Vradar:
@@ -203,8 +213,8 @@ class Menu(Component):
         if filename == '' or self.Vradar.value is None:
             return
         else:
-            pyart.io.write_cfradial(filename, self.Vradar.value)
-            print("Saved %s" % (filename))
+            write_queue.save(filename, self.Vradar.value, "radar",
+                             errback=self._saveFailed)
 
     def saveGrid(self):
         '''Open a dialog box to save grid file.'''
@@ -217,7 +227,16 @@ class Menu(Component):
         if filename == '' or self.Vgrid.value is None:
             return
         else:
-            pyart.io.write_grid(filename, self.Vgrid.value)
+            write_queue.save(filename, self.Vgrid.value, "grid",
+                             errback=self._saveFailed)
+
+    def setSaveOptions(self):
+        '''Open dialog to set compression and chunking of saved files.'''
+        write_queue.options = common.get_options(
+            write_queue.options_type, write_queue.options)
+
+    def _saveFailed(self, request):
+        common.ShowWarning("Failed saving %s" % request.filename)
 
     def addLayoutWidget(self, widget):
         '''
@@ -304,7 +323,7 @@ class Menu(Component):
             openFile = QtWidgets.QAction('Open', self)
             openFile.setShortcut('Ctrl+O')
             openFile.setStatusTip('Open new File')
-            openFile.triggered.connect(self.showFileDialog)
+            openFile.triggered.connect(lambda: self.showFileDialog())
             self.filemenu.addAction(openFile)
 
         # Create Save radar and/or grid action
@@ -318,6 +337,12 @@ class Menu(Component):
             saveGrid.setStatusTip('Save Grid NetCDF')
             saveGrid.triggered.connect(self.saveGrid)
             self.filemenu.addAction(saveGrid)
+        if self.mode:
+            saveOptions = QtWidgets.QAction('Save Options', self)
+            saveOptions.setStatusTip(
+                'Set NetCDF compression and chunking of saved files')
+            saveOptions.triggered.connect(self.setSaveOptions)
+            self.filemenu.addAction(saveOptions)
 
         # Create About ARTView action
         aboutApp = QtWidgets.QAction('ARTView...', self)
@@ -613,21 +638,25 @@ class Menu(Component):
             common.ShowWarning(msg)
             findex = 0
             return
+        if abs(findex - self.fileindex) > 1:
+            # jump, files prefetched around old position are useless
+            self.prefetcher.cancel()
         self.fileindex = findex
         self.filename = self.Vfilelist.value[findex]
         self._openfile()
+        print(self.prefetcher.stats(), file=log.debug)
 
     ########################
     # Menu display methods #
     ########################
 
-    def _openfile(self, filename=None):
-        '''Open a file via a file selection window.'''
+    def _openfile(self, filename=None, block=False):
+        '''Open a file via a file selection window.
+
+        The file is read in the background unless block is True.'''
         if filename is not None:
             self.filename = filename
 
-        print("Opening file " + self.filename, file=log.info)
-
         # Update to current directory when file is chosen
         self.dirIn = os.path.dirname(self.filename)
 
@@ -643,51 +672,37 @@ class Menu(Component):
         else:
             self.fileindex = 0
 
-        # Read the data from file
-        radar_warning = False
-        grid_warning = False
-        if "radar" in self.mode:
-            try:
-                radar = pyart.io.read(self.filename, delay_field_loading=True)
-                # Add the filename for Display
-                radar.filename = self.filename
-                self.Vradar.change(radar)
-                self.current_container = self.Vradar
-                return
-            except:
-                try:
-                    radar = pyart.io.read(self.filename)
-                    # Add the filename for Display
-                    radar.filename = self.filename
-                    self.Vradar.change(radar)
-                    self.current_container = self.Vradar
-                    return
-                except:
-                    import traceback
-                    print(traceback.format_exc())
-                    radar_warning = True
-        if "grid" in self.mode:
-            try:
-                grid = pyart.io.read_grid(
-                    self.filename, delay_field_loading=True)
-                self.Vgrid.change(grid)
-                self.current_container = self.Vgrid
-                return
-            except:
-                try:
-                    grid = pyart.io.read_grid(self.filename)
-                    self.Vgrid.change(grid)
-                    self.current_container = self.Vgrid
-                    return
-                except:
-                    import traceback
-                    print(traceback.format_exc())
-                    grid_warning = True
-
-        if grid_warning or radar_warning:
-            msg = "Py-ART didn't recognize this file!"
-            common.ShowWarning(msg)
+        # Read the data from file, only the last request matters
+        if self.loadRequest is not None:
+            self.loadRequest.cancel()
+            self.loadRequest = None
+        if self.mode:
+            self.loadRequest = async_loader.load(
+                self.filename, self.mode, callback=self._openfileDone,
+                errback=self._openfileFailed, prefetcher=self.prefetcher,
+                block=block, owner=self)
+            if block:
+                self.loadRequest = None
         else:
             msg = "Could not open file, invalid mode!"
             common.ShowWarning(msg)
         return
+
+    def _openfileDone(self, container):
+        '''Receive container read by _openfile.'''
+        self.loadRequest = None
+        # displays reset limits and colormaps of the new file, redraw once
+        with deferUpdates():
+            if isinstance(container, pyart.core.Grid):
+                self.Vgrid.change(container)
+                self.current_container = self.Vgrid
+            else:
+                self.Vradar.change(container)
+                self.current_container = self.Vradar
+        self.prefetcher.prefetch(self.Vfilelist.value, self.fileindex,
+                                 fields_in_use())
+
+    def _openfileFailed(self, request):
+        '''Warn about a file _openfile could not read.'''
+        self.loadRequest = None
+        common.ShowWarning(request.error)
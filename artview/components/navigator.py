@@ -11,12 +11,16 @@ from __future__ import print_function
 # Load the needed packages
 from functools import partial
 import os, glob
+import bisect
 import numpy as np
 import pyart
 import time
 
 from ..core import (Component, Variable, common, QtWidgets, QtCore, QtGui,
-                    log)
+                    log, async_loader, container_cache, Prefetcher,
+                    get_file_index, DirectoryWatcher, write_queue,
+                    deferUpdates)
+from ..core.lazy import fields_in_use
 
 class FileNavigator(Component):
     '''
@@ -71,6 +75,18 @@ class FileNavigator(Component):
         if pathDir is None:
             pathDir = os.getcwd()
         self.fileindex = 0
+        self.prefetcher = Prefetcher()
+        self.loadRequest = None
+        self.sortKey = 'name'
+        self.fieldFilter = None
+        self.scanTypeFilter = None
+        self._dirFilelist = []
+        self.fileIndex = get_file_index()
+        self.fileIndex.directoryIndexed.connect(self._directoryIndexed)
+        self.autoAdvance = False
+        self.watcher = DirectoryWatcher(parent=self)
+        self.watcher.filesAdded.connect(self._filesAdded)
+        self.watcher.filesRemoved.connect(self._filesRemoved)
 
         # Set up signal, so that DISPLAY can react to
         # changes in radar or gatefilter shared variables
@@ -99,9 +115,9 @@ class FileNavigator(Component):
         self.filename = ''
         if Vradar is None and Vgrid is None:
             if filename is None:
-                self._openfile(filename)
+                self._openfile(filename, block=True)
             elif filename is not False:
-                self._openfile(filename)
+                self._openfile(filename, block=True)
 
         self.directoryAction.setText(pathDir)
 
@@ -162,6 +178,13 @@ class FileNavigator(Component):
         self.act_last.clicked.connect(self.goto_last_file)
         self.layout.addWidget(self.act_last, 0, 5)
 
+        self.act_cancel = QtWidgets.QToolButton()
+        self.act_cancel.setText("Cancel")
+        self.act_cancel.setToolTip("Cancel opening file")
+        self.act_cancel.setEnabled(False)
+        self.act_cancel.clicked.connect(self.cancel_open)
+        self.layout.addWidget(self.act_cancel, 0, 6)
+
         self.openMenu = QtWidgets.QMenu()
         self.openButton.setMenu(self.openMenu)
 
@@ -191,13 +214,48 @@ class FileNavigator(Component):
             self.saveGridAction.setEnabled(False)
         self.saveMenu.addAction(self.saveGridAction)
 
+        self.saveMenu.addAction(QtWidgets.QAction(
+            "Save Options", self, triggered=self.setSaveOptions))
+
+        self.sortMenu = self.openMenu.addMenu("Sort by")
+        sortGroup = QtWidgets.QActionGroup(self)
+        for key, label in (('name', "Name"), ('time', "Scan time"),
+                           ('scan_type', "Scan type"), ('site', "Site")):
+            action = sortGroup.addAction(label)
+            action.setCheckable(True)
+            action.setChecked(key == 'name')
+            action.triggered.connect(
+                lambda checked, key=key: self.setSortKey(key))
+            self.sortMenu.addAction(action)
+
+        self.filterMenu = self.openMenu.addMenu("Filter")
+        self.filterMenu.addAction("By field", self._filter_field_dialog)
+        self.filterMenu.addAction("By scan type", self._filter_scan_dialog)
+        self.filterMenu.addAction("Clear filters", self.clearFilters)
+
+        self.watchAction = QtWidgets.QAction(
+            "Watch directory", self, checkable=True,
+            toggled=self.setWatch)
+        self.watchAction.setToolTip("Add new files of the directory to the "
+                                    "file list as they arrive")
+        self.openMenu.addAction(self.watchAction)
+
+        self.autoAdvanceAction = QtWidgets.QAction(
+            "Auto advance to newest", self, checkable=True,
+            toggled=self.setAutoAdvance)
+        self.openMenu.addAction(self.autoAdvanceAction)
+
+        action = QtWidgets.QAction("Prefetch Statistics", self,
+                               triggered=self._show_prefetch_stats)
+        self.openMenu.addAction(action)
+
         action = QtWidgets.QAction("Help", self,
                                triggered=self._show_help)
         self.openMenu.addAction(action)
 
         self.layout.addItem(QtWidgets.QSpacerItem(
             0, 0, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding),
-                            0, 5)
+                            0, 7)
 
     ######################
     #   Update Methods   #
@@ -212,6 +270,10 @@ class FileNavigator(Component):
                     )
         common.ShowLongText(helptext)
 
+    def _show_prefetch_stats(self):
+        common.ShowLongText("<br>".join([self.prefetcher.stats(),
+                                         container_cache.stats()]))
+
     def _update_tools(self):
         '''Update the navigation button.'''
         filelist = self.Vfilelist.value
@@ -277,12 +339,15 @@ class FileNavigator(Component):
         self.fileindex = findex
         self.filename = self.Vfilelist.value[findex]
         self._openfile(self.filename)
+        print(self.prefetcher.stats(), file=log.debug)
 
     def goto_first_file(self):
+        self.prefetcher.cancel()
         self.fileindex = 0
         self.AdvanceFileSelect(self.fileindex)
 
     def goto_last_file(self):
+        self.prefetcher.cancel()
         self.fileindex = len(self.Vfilelist.value) - 1
         self.AdvanceFileSelect(self.fileindex)
 
@@ -294,8 +359,10 @@ class FileNavigator(Component):
         self.fileindex = self.fileindex + 1
         self.AdvanceFileSelect(self.fileindex)
 
-    def _openfile(self, filename=None):
-        '''Open a file via a file selection window.'''
+    def _openfile(self, filename=None, block=False):
+        '''Open a file via a file selection window.
+
+        The file is read in the background unless block is True.'''
         if filename is None:
             dirIn = str(self.directoryAction.text())
             filename = QtWidgets.QFileDialog.getOpenFileName(
@@ -306,53 +373,46 @@ class FileNavigator(Component):
                 return
             filename = str(filename)
             self.filename = filename
-        print("Opening file " + filename, file=log.info)
-
-        # Read the data from file
-        radar_warning = False
-        grid_warning = False
-
-        try:
-            radar = pyart.io.read(filename, delay_field_loading=True)
-            # Add the filename for Display
-            radar.filename = filename
-            self.replaceRadar(radar)
-            return
-        except:
-            try:
-                radar = pyart.io.read(filename)
-                # Add the filename for Display
-                radar.filename = filename
-                self.replaceRadar(radar)
-                return
-            except:
-                import traceback
-                print(traceback.format_exc(), file=log.error)
-                radar_warning = True
-
-        try:
-            grid = pyart.io.read_grid(
-                filename, delay_field_loading=True)
-            self.replaceGrid(grid)
-            return
-        except:
-            try:
-                grid = pyart.io.read_grid(filename)
-                self.replaceGrid(grid)
-                return
-            except:
-                import traceback
-                print(traceback.format_exc(), file=log.error)
-                grid_warning = True
 
-        if grid_warning or radar_warning:
-            msg = "Py-ART didn't recognize this file!"
-            common.ShowWarning(msg)
-        else:
-            msg = "Could not open file, invalid mode!"
-            common.ShowWarning(msg)
+        # Read the data from file, only the last request matters
+        if self.loadRequest is not None:
+            self.loadRequest.cancel()
+        self.act_cancel.setEnabled(True)
+        self.loadRequest = async_loader.load(
+            filename, callback=self._openfileDone,
+            errback=self._openfileFailed, prefetcher=self.prefetcher,
+            block=block, owner=self)
+        if block:
+            self.loadRequest = None
         return
 
+    def _openfileDone(self, container):
+        '''Receive container read by _openfile.'''
+        self.loadRequest = None
+        self.act_cancel.setEnabled(False)
+        self._replaceContainer(container)
+
+    def _openfileFailed(self, request):
+        '''Warn about a file _openfile could not read.'''
+        self.loadRequest = None
+        self.act_cancel.setEnabled(False)
+        self._restore_position()
+        common.ShowWarning(request.error)
+
+    def cancel_open(self):
+        '''Cancel the file being opened.'''
+        if self.loadRequest is not None:
+            self.loadRequest.cancel()
+            self.loadRequest = None
+        self.act_cancel.setEnabled(False)
+        self._restore_position()
+
+    def _restore_position(self):
+        '''Point the navigation back to the displayed file.'''
+        self.filename = os.path.join(str(self.directoryAction.text()),
+                                     str(self.fileAction.text()))
+        self._update_tools()
+
     def NewFilelist(self, variable, strong):
         '''respond to change in filelist.'''
         if strong:
@@ -368,19 +428,163 @@ class FileNavigator(Component):
             self.fileAction.setText(os.path.basename(self.filename))
             if (self.Vfilelist.value is None or
                 self.filename not in self.Vfilelist.value):
-                filelist = [path for path in glob.glob(os.path.join(dirIn, '*'))
-                            if os.path.isfile(path)]
-                filelist.sort()
+                filelist = self._list_directory(dirIn)
                 self.fileindex = filelist.index(self.filename)
                 self.Vfilelist.change(filelist)
             else:
                 self.fileindex = self.Vfilelist.value.index(self.filename)
                 self._update_tools()
+            self.prefetcher.prefetch(self.Vfilelist.value, self.fileindex,
+                                     fields_in_use())
         if variable == self.Vradar:
             self.saveRadarAction.setEnabled(variable.value is not None)
         else:
             self.saveGridAction.setEnabled(variable.value is not None)
 
+    def _list_directory(self, dirIn, rescan=True):
+        '''Return files in dirIn, sorted and filtered using the metadata
+        index. The current file is always kept.'''
+        if rescan or not self._dirFilelist:
+            self._dirFilelist = [
+                path for path in glob.glob(os.path.join(dirIn, '*'))
+                if os.path.isfile(path)]
+            if self._sorted_or_filtered():
+                self.fileIndex.index(self._dirFilelist)
+            if self.watcher.isActive():
+                self.watcher.setDirectory(dirIn, self._dirFilelist)
+        filelist = self.fileIndex.query(
+            self._dirFilelist, sort=self.sortKey, field=self.fieldFilter,
+            scan_type=self.scanTypeFilter)
+        if self.filename in self._dirFilelist and \
+                self.filename not in filelist:
+            filelist.append(self.filename)
+            if self.sortKey == 'name':
+                filelist.sort()
+        return filelist
+
+    def _sorted_or_filtered(self):
+        '''Test if the file list needs the metadata index.'''
+        return bool(self.sortKey != 'name' or self.fieldFilter or
+                    self.scanTypeFilter)
+
+    def _refresh_filelist(self):
+        '''Apply sorting and filters to the current directory, indexing
+        it if they need it.'''
+        if not self.filename:
+            return
+        if self._sorted_or_filtered():
+            self.fileIndex.index(self._dirFilelist)
+        dirIn = os.path.dirname(self.filename)
+        self.Vfilelist.change(self._list_directory(dirIn, rescan=False))
+
+    def _directoryIndexed(self, directory):
+        '''Refresh file list when its directory finishes indexing.'''
+        if (self.filename and
+                os.path.dirname(self.filename) == str(directory) and
+                self._sorted_or_filtered()):
+            self._refresh_filelist()
+
+    def setSortKey(self, key):
+        '''Sort file list by 'name', 'time', 'scan_type' or 'site'.'''
+        self.sortKey = key
+        self._refresh_filelist()
+
+    def setFilters(self, field=None, scan_type=None):
+        '''Keep in file list only files with field and scan_type.'''
+        self.fieldFilter = field
+        self.scanTypeFilter = scan_type
+        self._refresh_filelist()
+
+    def clearFilters(self):
+        self.setFilters(None, None)
+
+    def _filter_field_dialog(self):
+        # values are listed as they get indexed
+        self.fileIndex.index(self._dirFilelist)
+        fields = self.fileIndex.values(self._dirFilelist, 'fields')
+        value, entry = common.string_dialog(
+            self.fieldFilter, "Filter by field",
+            "Field name (indexed: %s)" % ", ".join(fields))
+        if entry:
+            self.setFilters(str(value) or None, self.scanTypeFilter)
+
+    def _filter_scan_dialog(self):
+        self.fileIndex.index(self._dirFilelist)
+        types = self.fileIndex.values(self._dirFilelist, 'scan_type')
+        value, entry = common.string_dialog(
+            self.scanTypeFilter, "Filter by scan type",
+            "Scan type (indexed: %s)" % ", ".join(types))
+        if entry:
+            self.setFilters(self.fieldFilter, str(value) or None)
+
+    def setWatch(self, watch):
+        '''Start or stop watching the current directory for new files.'''
+        if watch and self.filename:
+            self.watcher.setDirectory(os.path.dirname(self.filename),
+                                      self._dirFilelist or None)
+        elif not watch:
+            self.watcher.stop()
+        if self.watchAction.isChecked() != bool(watch):
+            self.watchAction.setChecked(bool(watch))
+
+    def setAutoAdvance(self, advance):
+        '''Open new files as soon as they arrive in the watched
+        directory.'''
+        self.autoAdvance = advance
+        if advance and not self.watcher.isActive():
+            self.setWatch(True)
+
+    def _filesAdded(self, paths):
+        '''Add new files to the file list, without rescanning.'''
+        dirIn = os.path.dirname(self.filename)
+        paths = [path for path in paths if os.path.dirname(path) == dirIn]
+        if not paths:
+            return
+        self._dirFilelist.extend(paths)
+        filelist = list(self.Vfilelist.value or [])
+        if not self._sorted_or_filtered():
+            for path in paths:
+                bisect.insort(filelist, path)
+        else:
+            self.fileIndex.index(paths)
+            filelist = self._list_directory(dirIn, rescan=False)
+        self.Vfilelist.change(filelist, False)
+        self._update_tools()
+        if self.autoAdvance:
+            self.AdvanceFileSelect(len(filelist) - 1)
+        else:
+            self.prefetcher.prefetch(filelist, self.fileindex,
+                                     fields_in_use())
+
+    def _filesRemoved(self, paths):
+        '''Remove deleted files from the file list.'''
+        paths = set(paths)
+        paths.discard(self.filename)
+        self._dirFilelist = [path for path in self._dirFilelist
+                             if path not in paths]
+        filelist = [path for path in (self.Vfilelist.value or [])
+                    if path not in paths]
+        self.Vfilelist.change(filelist, False)
+        self._update_tools()
+
+    def closeEvent(self, QCloseEvent):
+        '''Re-implementation to disconnect from the file index and drop
+        the edited containers cached for this component.'''
+        self.fileIndex.directoryIndexed.disconnect(self._directoryIndexed)
+        self.watcher.stop()
+        self.cancel_open()
+        container_cache.release(self)
+        super(FileNavigator, self).closeEvent(QCloseEvent)
+
+    def _replaceContainer(self, container):
+        '''Replace current radar or grid, depending on container type.'''
+        # displays reset limits and colormaps of the new file, redraw once
+        with deferUpdates():
+            if isinstance(container, pyart.core.Grid):
+                self.replaceGrid(container)
+            else:
+                self.replaceRadar(container)
+
     def replaceRadar(self, radar):
         '''Replace current radar, warning for data lost.'''
         if hasattr(self.Vradar.value, 'changed') and self.Vradar.value.changed:
@@ -421,8 +625,8 @@ class FileNavigator(Component):
         if filename == '' or self.Vradar.value is None:
             return
         else:
-            pyart.io.write_cfradial(filename, self.Vradar.value)
-            print("Saved %s" % (filename), file=log.info)
+            write_queue.save(filename, self.Vradar.value, "radar",
+                             errback=self._saveFailed)
 
     def saveGrid(self):
         '''Open a dialog box to save grid file.'''
@@ -435,7 +639,16 @@ class FileNavigator(Component):
         if filename == '' or self.Vgrid.value is None:
             return
         else:
-            pyart.io.write_grid(filename, self.Vgrid.value)
+            write_queue.save(filename, self.Vgrid.value, "grid",
+                             errback=self._saveFailed)
+
+    def setSaveOptions(self):
+        '''Open dialog to set compression and chunking of saved files.'''
+        write_queue.options = common.get_options(
+            write_queue.options_type, write_queue.options)
+
+    def _saveFailed(self, request):
+        common.ShowWarning("Failed saving %s" % request.filename)
 
 
 _plugins = [FileNavigator]
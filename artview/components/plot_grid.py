@@ -3,6 +3,7 @@ plot_grid.py
 
 Class instance used to make Display.
 """
+from __future__ import print_function
 # Load the needed packages
 import numpy as np
 import os
@@ -16,12 +17,18 @@ NavigationToolbar = backend.NavigationToolbar2QT
 #from matplotlib.backends.backend_qt4agg import NavigationToolbar2QT as \
 #    NavigationToolbar
 from matplotlib.figure import Figure
-from matplotlib.colors import Normalize as mlabNormalize
 from matplotlib.colorbar import ColorbarBase as mlabColorbarBase
+from matplotlib.path import Path
 from matplotlib.pyplot import cm
 
-from ..core import Variable, Component, common, VariableChoose, QtWidgets, QtCore
-from ..core.points import Points
+from ..core import (Variable, Component, common, VariableChoose, QtWidgets,
+                    QtCore, log, deferUpdates)
+from ..core.points import IndexedPoints
+from ._blit import ArtistBlitter, artists_above, colormap_norm
+from ._lod import LevelOfDetail, METHODS as LOD_METHODS
+from ._redraw import RedrawScheduler
+from ._overlay import OverlayCache, capture, readd
+from ._index import GridIndex, container_index, drop_indexes
 
 # Save image file type and DPI (resolution)
 IMAGE_EXT = 'png'
@@ -139,6 +146,14 @@ class GridDisplay(Component):
         self.VplotAxes = Variable(None)
         self.VpyartDisplay = Variable(None)
 
+        # reduced resolution meshes, see _set_lod, off unless chosen in
+        # the Level of Detail menu
+        self.lod = None
+        self.lodMethod = None
+        # map layers, see _plot_basemap
+        self.overlays = OverlayCache()
+        self.overlayArtists = []
+
         self.sharedVariables = {"Vgrid": self.NewGrid,
                                 "Vfield": self.NewField,
                                 "Vlimits": self.NewLimits,
@@ -191,9 +206,9 @@ class GridDisplay(Component):
     def keyPressEvent(self, event):
         '''Allow level adjustment via the Up-Down arrow keys.'''
         if event.key() == QtCore.Qt.Key_Up:
-            self.LevelSelectCmd(self.Vlevel.value + 1)
+            self.LevelSelectCmd(self.Vlevel.value + 1, later=True)
         elif event.key() == QtCore.Qt.Key_Down:
-            self.LevelSelectCmd(self.Vlevel.value - 1)
+            self.LevelSelectCmd(self.Vlevel.value - 1, later=True)
         else:
             super(GridDisplay, self).keyPressEvent(event)
 
@@ -263,8 +278,9 @@ class GridDisplay(Component):
                     "Changing Aspect Radio does not work in Altitude"
                     "Plot. This is a result of pyart forcing equal ratio.")
         if change == 1:
-            self.Vcolormap.change(cmap)
-            self.Vlimits.change(limits)
+            with deferUpdates():
+                self.Vcolormap.change(cmap)
+                self.Vlimits.change(limits)
 
     def _fillLevelBox(self):
         '''Fill in the Level Window Box with current levels.'''
@@ -321,6 +337,10 @@ class GridDisplay(Component):
             self.units = val
             self._update_plot()
 
+    def _show_redraw_stats(self):
+        '''Show frame statistics of the plot redraws.'''
+        common.ShowLongText(self.redraw.summary())
+
     def _add_ImageText(self):
         '''Add a text box to display.'''
         from .image_text import ImageTextBox
@@ -348,6 +368,18 @@ class GridDisplay(Component):
             self.Vgrid, self.Vfield,
             name=self.name+" Field Selection", parent=self.parent)
 
+    def _add_lod_to_button(self):
+        '''Add a menu to choose the reducer of the level of detail.'''
+        group = QtWidgets.QActionGroup(self.dispLodmenu)
+        for method in (None,) + LOD_METHODS:
+            name = "Off" if method is None else method.capitalize()
+            lodAction = QtWidgets.QAction(name, group, checkable=True)
+            lodAction.setChecked(method == self.lodMethod)
+            lodAction.triggered.connect(
+                lambda check, method=method: self.LodSelectCmd(method))
+            self.dispLodmenu.addAction(lodAction)
+        self.dispLod.setMenu(self.dispLodmenu)
+
     def _add_cmaps_to_button(self):
         '''Add a menu to change colormap used for plot.'''
         for cm_name in self.cm_names:
@@ -377,6 +409,11 @@ class GridDisplay(Component):
         self.dispCmap = dispmenu.addAction("Change Colormap")
         self.dispCmapmenu = QtWidgets.QMenu("Change Cmap")
         self.dispCmapmenu.setFocusPolicy(QtCore.Qt.NoFocus)
+        self.dispLod = dispmenu.addAction("Level of Detail")
+        self.dispLod.setToolTip(
+            "Draw reduced resolution plot when zoomed out")
+        self.dispLodmenu = QtWidgets.QMenu("Level of Detail")
+        self.dispLodmenu.setFocusPolicy(QtCore.Qt.NoFocus)
 
         self.dispPlotType = dispmenu.addMenu("Change Plot Type")
         self.dispPlotType.setFocusPolicy(QtCore.Qt.NoFocus)
@@ -401,6 +438,8 @@ class GridDisplay(Component):
         dispSaveFile = dispmenu.addAction("Save Image")
         dispSaveFile.setShortcut("Ctrl+S")
         dispSaveFile.setStatusTip("Save Image using dialog")
+        dispRedrawStats = dispmenu.addAction("Show Redraw Stats")
+        dispRedrawStats.setToolTip("Show frame times of the plot redraws")
 
         dispLimits.triggered.connect(self._open_LimsDialog)
         dispTitle.triggered.connect(self._title_input)
@@ -409,7 +448,9 @@ class GridDisplay(Component):
         self.dispImageText.triggered.connect(self._add_ImageText)
         dispQuickSave.triggered.connect(self._quick_savefile)
         dispSaveFile.triggered.connect(self._savefile)
+        dispRedrawStats.triggered.connect(self._show_redraw_stats)
 
+        self._add_lod_to_button()
         self._add_cmaps_to_button()
         self.dispButton.setMenu(dispmenu)
 
@@ -440,10 +481,12 @@ class GridDisplay(Component):
         toolmenu = QtWidgets.QMenu(self)
         toolZoomPan = toolmenu.addAction("Zoom/Pan")
         toolValueClick = toolmenu.addAction("Click for Value")
+        toolValueHover = toolmenu.addAction("Hover for Values")
         toolReset = toolmenu.addAction("Reset Tools")
         toolDefault = toolmenu.addAction("Reset File Defaults")
         toolZoomPan.triggered.connect(self.toolZoomPanCmd)
         toolValueClick.triggered.connect(self.toolValueClickCmd)
+        toolValueHover.triggered.connect(self.toolValueHoverCmd)
         toolReset.triggered.connect(self.toolResetCmd)
         toolDefault.triggered.connect(self.toolDefaultCmd)
         self.toolmenu = toolmenu
@@ -512,6 +555,8 @@ class GridDisplay(Component):
         self.units = self._get_default_units()
         self.title = self._get_default_title()
         if strong:
+            # the grid axes may have changed, weak updates keep the indexes
+            drop_indexes(self.Vgrid.value)
             display = pyart.graph.GridMapDisplay(self.Vgrid.value)
             self.VpyartDisplay.change(display)
             self._update_infolabel()
@@ -559,9 +604,10 @@ class GridDisplay(Component):
 
         This will:
 
-        * If strong update: update plot
+        * If strong update: update colormap of plot in place, or update
+          plot
         '''
-        if strong:
+        if strong and not self._update_colormap():
             self._update_plot()
 
     def NewLevel(self, variable, strong):
@@ -595,18 +641,23 @@ class GridDisplay(Component):
         if strong:
             self._update_plot()
         else:
-            self.canvas.draw()
+            self.redraw.mark()
 
-    def LevelSelectCmd(self, nlevel):
+    def LevelSelectCmd(self, nlevel, later=False):
         '''
         Captures Level selection and update Level
         :py:class:`~artview.core.core.Variable`.
+        If later, repeated selections before the display is updated are
+        merged, see :py:func:`~artview.core.core.Variable.changeLater`.
         '''
         if nlevel < 0:
             nlevel = len(self.levels)-1
         elif nlevel >= len(self.levels):
             nlevel = 0
-        self.Vlevel.change(nlevel)
+        if later:
+            self.Vlevel.changeLater(nlevel)
+        else:
+            self.Vlevel.change(nlevel)
 
     def FieldSelectCmd(self, name):
         '''
@@ -615,6 +666,12 @@ class GridDisplay(Component):
         '''
         self.Vfield.change(name)
 
+    def LodSelectCmd(self, method):
+        '''Captures level of detail reducer selection and redraws.'''
+        self.lodMethod = method
+        self._set_lod()
+        self.redraw.mark("mesh")
+
     def cmapSelectCmd(self, cm_name):
         '''Captures colormap selection and redraws.'''
         CMAP = cm_name
@@ -643,6 +700,13 @@ class GridDisplay(Component):
             self.VplotAxes, self.VpathInteriorFunc, self.Vfield,
             name=self.name + " SelectRegion", parent=self)
 
+    def toolValueHoverCmd(self):
+        '''Creates and connects to values under the cursor retrieval.'''
+        from .toolbox import ValueHover
+        self.tools['valuehover'] = ValueHover(
+            self, name=self.name + "ValueHover", parent=self)
+        self.tools['valuehover'].connect()
+
     def toolResetCmd(self):
         '''Reset tools via disconnect.'''
         from . import toolbox
@@ -671,14 +735,15 @@ class GridDisplay(Component):
         points : :py:class`artview.core.points.Points`
 
             Points object containing all bins of the current grid
-            and level inside path. Axes : 'x_disp', 'y_disp', 'x_disp',
-            'x_index', 'y_index', 'z_index'. Fields: just current field
+            and level inside any of paths, once each. Axes : 'x_disp',
+            'y_disp', 'z_disp', 'x_index', 'y_index', 'z_index'. Fields:
+            all fields of the grid, the current one first, see
+            :py:class:`~artview.core.points.IndexedPoints`
 
         Notes
         -----
             If Vgrid.value is None, returns None
         '''
-        from .toolbox import interior_grid
         grid = self.Vgrid.value
         if grid is None:
             return None
@@ -688,36 +753,29 @@ class GridDisplay(Component):
         except:
             paths = [paths]
 
-        xy = np.empty((0, 2))
-        idx = np.empty((0, 2), dtype=np.int)
-
-        for path in paths:
-            _xy, _idx = interior_grid(path, grid, self.basemap,
-                                      self.Vlevel.value, self.plot_type)
-            xy = np.concatenate((xy, _xy))
-            idx = np.concatenate((idx, _idx))
+        # masks of each path are kept by the index, so only new paths are
+        # tested, e.g. when a polygon is added or the field changes
+        index = self.getSectionIndex()
+        ind = np.nonzero(index.region(
+            [self._section_path(path) for path in paths]))[0]
+        column = ind % index.xs.size
+        row = ind // index.xs.size
 
         if self.plot_type == "gridZ":
-            x = xy[:, 0]
-            y = xy[:, 1]
-            z = np.ones_like(xy[:, 0]) * self.levels[self.VlevelZ.value]
-            x_idx = idx[:, 0]
-            y_idx = idx[:, 1]
-            z_idx = np.ones_like(idx[:, 0]) * self.VlevelZ.value
+            x_idx = column
+            y_idx = row
+            z_idx = np.ones_like(ind) * self.VlevelZ.value
         elif self.plot_type == "gridY":
-            x = xy[:, 0] * 1000.
-            z = xy[:, 1] * 1000.
-            y = np.ones_like(xy[:, 0]) * self.levels[self.VlevelY.value]
-            x_idx = idx[:, 0]
-            z_idx = idx[:, 1]
-            y_idx = np.ones_like(idx[:, 0]) * self.VlevelY.value
+            x_idx = column
+            z_idx = row
+            y_idx = np.ones_like(ind) * self.VlevelY.value
         elif self.plot_type == "gridX":
-            z = xy[:, 0] * 1000.
-            y = xy[:, 1] * 1000.
-            x = np.ones_like(xy[:, 0]) * self.levels[self.VlevelX.value]
-            z_idx = idx[:, 0]
-            y_idx = idx[:, 1]
-            x_idx = np.ones_like(idx[:, 0]) * self.VlevelX.value
+            y_idx = column
+            z_idx = row
+            x_idx = np.ones_like(ind) * self.VlevelX.value
+        x = grid.x['data'][x_idx]
+        y = grid.y['data'][y_idx]
+        z = grid.z['data'][z_idx]
 
         xaxis = {'data':  x,
                  'long_name': 'X-coordinate in Cartesian system',
@@ -734,10 +792,6 @@ class GridDisplay(Component):
                  'axis': 'Z',
                  'units': 'm'}
 
-        field = grid.fields[self.Vfield.value].copy()
-        field['data'] = grid.fields[self.Vfield.value]['data'][
-            z_idx, y_idx, x_idx]
-
         x_idx = {'data': x_idx,
                  'long_name': 'index in nx dimension'}
         y_idx = {'data': y_idx,
@@ -752,12 +806,48 @@ class GridDisplay(Component):
                 'y_index': y_idx,
                 'z_index': z_idx, }
 
-        fields = {self.Vfield.value: field}
-
-        points = Points(fields, axes, grid.metadata.copy(), xy.shape[0])
+        # all fields, gathered when used
+        points = IndexedPoints(grid, (z_idx['data'], y_idx['data'],
+                                      x_idx['data']),
+                               axes, grid.metadata.copy(), self.Vfield.value)
 
         return points
 
+    def getSectionIndex(self):
+        '''
+        Return spatial index of the points of the current grid section.
+
+        Returns
+        -------
+        index : :py:class:`~artview.components._index.GridIndex`
+            Index in meters, built once per grid and plot type. None if
+            there is no grid.
+        '''
+        grid = self.Vgrid.value
+        if grid is None:
+            return None
+        if self.plot_type == "gridZ":
+            axes = (grid.x['data'], grid.y['data'])
+        elif self.plot_type == "gridY":
+            axes = (grid.x['data'], grid.z['data'])
+        elif self.plot_type == "gridX":
+            axes = (grid.y['data'], grid.z['data'])
+        return container_index(grid, self.plot_type,
+                               lambda: GridIndex(*axes))
+
+    def _section_path(self, path):
+        '''Return path drawn in the plot in the coordinates of the section
+        index, meters.'''
+        if self.plot_type == "gridZ":
+            if self.basemap is None:
+                return path
+            lon, lat = self.basemap(path.vertices[:, 0], path.vertices[:, 1],
+                                    inverse=True)
+            x, y = pyart.core.geographic_to_cartesian(
+                lon, lat, self.Vgrid.value.get_projparams())
+            return Path(np.column_stack((x, y)), path.codes)
+        return Path(path.vertices * 1000., path.codes)
+
     def getNearestPoints(self, xdata, ydata):
         '''
         Return the bins values nearest to point.
@@ -776,28 +866,25 @@ class GridDisplay(Component):
         -----
             If Vgrid.value is None, returns None
         '''
-        from .toolbox import nearest_point_grid
         grid = self.Vgrid.value
-
-        # map center
-        lat0 = self.Vgrid.value.origin_latitude['data'][0]
-        lon0 = self.Vgrid.value.origin_longitude['data'][0]
-
         if grid is None:
             return (np.array([]),)*7
 
+        index = self.getSectionIndex()
         if self.plot_type == "gridZ":
-            idx = nearest_point_grid(
-                grid, self.basemap, self.levels[self.VlevelZ.value], ydata,
-                xdata)
+            if self.basemap is not None:
+                lon, lat = self.basemap(xdata, ydata, inverse=True)
+                xdata, ydata = pyart.core.geographic_to_cartesian(
+                    lon, lat, grid.get_projparams())
+            x_idx, y_idx = index.nearest(xdata, ydata)
+            z_idx = np.ones_like(x_idx) * self.VlevelZ.value
         elif self.plot_type == "gridY":
-            idx = nearest_point_grid(
-                grid, self.basemap, ydata * 1000.,
-                self.levels[self.VlevelY.value], xdata * 1000.)
+            x_idx, z_idx = index.nearest(xdata * 1000., ydata * 1000.)
+            y_idx = np.ones_like(x_idx) * self.VlevelY.value
         elif self.plot_type == "gridX":
-            idx = nearest_point_grid(
-                grid, self.basemap, ydata * 1000., xdata * 1000.,
-                self.levels[self.VlevelX.value])
+            y_idx, z_idx = index.nearest(xdata * 1000., ydata * 1000.)
+            x_idx = np.ones_like(y_idx) * self.VlevelX.value
+        idx = np.column_stack((z_idx, y_idx, x_idx))
         aux = (grid.x['data'][idx[:, 2]],
                grid.y['data'][idx[:, 1]],
                grid.z['data'][idx[:, 0]],
@@ -806,6 +893,24 @@ class GridDisplay(Component):
                idx[:, 2], idx[:, 1], idx[:, 0])
         return aux
 
+    def getReadout(self, xdata, ydata):
+        '''
+        Return text describing the grid point nearest to a point of the
+        plot: its position and the value of all fields, see
+        :py:func:`~artview.components.toolbox.field_values_message`. None
+        if there is no grid.
+        '''
+        from .toolbox import field_values_message
+        grid = self.Vgrid.value
+        if grid is None:
+            return None
+        x, y, z, value, x_idx, y_idx, z_idx = self.getNearestPoints(
+            xdata, ydata)
+        msg = ('x = %4.2f km,  y = %4.2f km,  z = %4.2f km,  ' %
+               (x[0] / 1000., y[0] / 1000., z[0] / 1000.))
+        return msg + field_values_message(
+            grid.fields, (z_idx[0], y_idx[0], x_idx[0]))
+
     ####################
     # Plotting methods #
     ####################
@@ -877,6 +982,11 @@ class GridDisplay(Component):
     def _set_figure_canvas(self):
         '''Set the figure canvas to draw in window area.'''
         self.canvas = FigureCanvasQTAgg(self.fig)
+        self.blitter = ArtistBlitter(self.canvas)
+        self.redraw = RedrawScheduler(self.canvas, self.blitter)
+        self.redraw.register("mesh", self._mesh_artists)
+        self.redraw.register("colorbar", lambda: [self.cax])
+        self.redraw.register("overlay", lambda: self.overlayArtists or None)
         # Add the widget to the canvas
         self.layout.addWidget(self.canvas, 1, 0, 7, 6)
 
@@ -889,9 +999,14 @@ class GridDisplay(Component):
         # Create the plot with PyArt GridMapDisplay
         self.ax.cla()  # Clear the plot axes
         self.cax.cla()  # Clear the colorbar axes
+        self.plot = None
+        self.lod = None
+        self.overlayArtists = []
+
+        self.VplotAxes.update()
 
         if self.Vfield.value not in self.Vgrid.value.fields.keys():
-            self.canvas.draw()
+            self.redraw.mark()
             self.statusbar.setStyleSheet("QStatusBar{padding-left:8px;" +
                                          "background:rgba(255,0,0,255);" +
                                          "color:black;font-weight:bold;}")
@@ -908,35 +1023,38 @@ class GridDisplay(Component):
         cmap = self.Vcolormap.value
         display = self.VpyartDisplay.value
 
-        if 'norm' in cmap:
-            norm = cmap['norm']
-        else:
-            norm = None
+        colormap, norm = colormap_norm(cmap)
 
         # Create Plot
         if self.plot_type == "gridZ":
-            display.plot_basemap(
-                self.lat_lines, self.lon_lines, ax=self.ax)
+            self._plot_basemap(display)
             self.basemap = display.get_basemap()
             self.plot = display.plot_grid(
                 self.Vfield.value, self.VlevelZ.value, vmin=cmap['vmin'],
-                vmax=cmap['vmax'], cmap=cmap['cmap'], norm=norm,
+                vmax=cmap['vmax'], cmap=colormap, norm=norm,
                 colorbar_flag=False, title=title, ax=self.ax, fig=self.fig)
         elif self.plot_type == "gridY":
             self.basemap = None
             self.plot = display.plot_latitudinal_level(
                 self.Vfield.value, self.VlevelY.value, vmin=cmap['vmin'],
-                vmax=cmap['vmax'], cmap=cmap['cmap'], norm=norm,
+                vmax=cmap['vmax'], cmap=colormap, norm=norm,
                 colorbar_flag=False, title=title, ax=self.ax, fig=self.fig)
             self.ax.set_aspect('auto')
         elif self.plot_type == "gridX":
             self.basemap = None
             self.plot = display.plot_longitudinal_level(
                 self.Vfield.value, self.VlevelX.value, vmin=cmap['vmin'],
-                vmax=cmap['vmax'], cmap=cmap['cmap'], norm=norm,
+                vmax=cmap['vmax'], cmap=colormap, norm=norm,
                 colorbar_flag=False, title=title, ax=self.ax, fig=self.fig)
             self.ax.set_aspect('auto')
 
+        if not hasattr(self.plot, 'set_cmap'):
+            # Py-ART plot methods do not return the mesh, keep it
+            plots = getattr(display, 'mappables', None) or getattr(
+                display, 'plots', [])
+            self.plot = plots[-1] if plots else None
+        self._set_lod(update=False)
+
         limits = self.Vlimits.value
         x = self.ax.get_xlim()
         y = self.ax.get_ylim()
@@ -946,16 +1064,7 @@ class GridDisplay(Component):
         limits['ymax'] = y[1]
 
         self._update_axes()
-        if norm is None:
-            norm = mlabNormalize(vmin=cmap['vmin'],
-                                 vmax=cmap['vmax'])
-        if self.colormapToggle.isChecked():
-            self.cbar = mlabColorbarBase(self.cax, cmap=cmap['cmap'],
-                                        norm=norm, orientation='vertical')
-            self.cbar.set_label(self.units)
-            self.cax.set_visible(True)
-        else:
-            self.cax.set_visible(False)
+        self._update_colorbar(colormap, norm)
 
         if self.plot_type == "gridZ":
             print("Plotting %s field, Z level %d in %s" % (
@@ -967,14 +1076,93 @@ class GridDisplay(Component):
             print("Plotting %s field, X level %d in %s" % (
                 self.Vfield.value, self.VlevelX.value+1, self.name))
 
-        self.canvas.draw()
+        self.redraw.mark()
+
+    def _plot_basemap(self, display):
+        '''
+        Plot basemap with display.plot_basemap, reusing the basemap and
+        its layers (coastlines, lat/lon lines) of previous plots of grids
+        with the same origin and extent.
+        '''
+        grid = self.Vgrid.value
+        key = ("map", float(grid.origin_latitude['data'][0]),
+               float(grid.origin_longitude['data'][0]),
+               tuple(float(a['data'][i]) for a in (grid.x, grid.y)
+                     for i in (0, -1)),
+               tuple(float(lat) for lat in self.lat_lines),
+               tuple(float(lon) for lon in self.lon_lines))
+        cached = self.overlays.get(key)
+        if cached is not None:
+            basemap, layers = cached
+            display.basemap = basemap
+            readd(self.ax, layers)
+        else:
+            result, layers = capture(self.ax, lambda: display.plot_basemap(
+                self.lat_lines, self.lon_lines, ax=self.ax))
+            self.overlays.put(key, (display.get_basemap(), layers))
+        self.overlayArtists.extend(layers)
+
+    def _update_colorbar(self, colormap, norm):
+        '''Draw the colorbar in cax.'''
+        if self.colormapToggle.isChecked():
+            self.cbar = mlabColorbarBase(self.cax, cmap=colormap,
+                                         norm=norm, orientation='vertical')
+            self.cbar.set_label(self.units)
+            self.cax.set_visible(True)
+        else:
+            self.cax.set_visible(False)
+
+    def _mesh_artists(self):
+        '''Artists to redraw when only the plot mesh changed.'''
+        if not hasattr(self.plot, 'set_cmap') or self.plot.axes is not self.ax:
+            return None
+        return artists_above(self.ax, self.plot)
+
+    def _update_colormap(self):
+        '''Change colormap and limits of the plot in place, redrawing only
+        the mesh and colorbar. Returns False if the plot must be
+        redrawn.'''
+        mesh = self.plot
+        if (self.Vgrid.value is None or
+                not hasattr(mesh, 'set_cmap') or mesh.axes is not self.ax or
+                self.Vfield.value not in self.Vgrid.value.fields):
+            return False
+        colormap, norm = colormap_norm(self.Vcolormap.value)
+        mesh.set_cmap(colormap)
+        mesh.set_norm(norm)
+        if self.lod is not None:
+            self.lod.sync()
+        self.cax.cla()
+        self._update_colorbar(colormap, norm)
+        self.redraw.mark("mesh", "colorbar")
+        return True
 
     def _update_axes(self):
         '''Change the Plot Axes.'''
         limits = self.Vlimits.value
         self.ax.set_xlim(limits['xmin'], limits['xmax'])
         self.ax.set_ylim(limits['ymin'], limits['ymax'])
-        self.ax.figure.canvas.draw()
+        if self.lod is not None:
+            self.lod.update()
+        self.redraw.mark("axes")
+
+    def _set_lod(self, update=True):
+        '''Make level of detail of the plot mesh, with reducer
+        lodMethod.'''
+        if self.lod is not None:
+            self.lod.remove()
+            self.lod = None
+        if (self.lodMethod is None or not hasattr(self.plot, 'set_array') or
+                self.plot.axes is not self.ax):
+            return
+        try:
+            self.lod = LevelOfDetail(self.plot, self.lodMethod)
+            if update:
+                self.lod.update()
+        except:
+            import traceback
+            print(traceback.format_exc(), file=log.debug)
+            self.lod = None
 
     #########################
     # Check methods #
@@ -1108,8 +1296,7 @@ class GridDisplay(Component):
         '''Save the current display via PyArt interface.'''
         imagename = self.VpyartDisplay.value.generate_filename(
             self.Vfield.value, self.Vlevel.value, ext=IMAGE_EXT)
-        self.canvas.print_figure(os.path.join(os.getcwd(), imagename),
-                                 dpi=DPI)
+        self._print_figure(os.path.join(os.getcwd(), imagename))
         self.statusbar.showMessage('Saved to %s' % os.path.join(os.getcwd(),
                                                                 imagename))
 
@@ -1121,9 +1308,19 @@ class GridDisplay(Component):
         path = unicode(QtWidgets.QFileDialog.getSaveFileName(
             self, 'Save file', imagename, file_choices))
         if path:
-            self.canvas.print_figure(path, dpi=DPI)
+            self._print_figure(path)
             self.statusbar.showMessage('Saved to %s' % path)
 
+    def _print_figure(self, path):
+        '''Save figure to path, at full resolution.'''
+        if self.lod is not None:
+            self.lod.show(1)
+        try:
+            self.canvas.print_figure(path, dpi=DPI)
+        finally:
+            if self.lod is not None:
+                self.lod.update()
+
     def minimumSizeHint(self):
         return QtCore.QSize(0, 0)
 
@@ -1147,6 +1344,10 @@ class GridDisplay(Component):
         ''' get current units '''
         return self.units
 
+    def getContainer(self):
+        ''' get current grid, the container of the read-out '''
+        return self.Vgrid.value
+
     ########################
     #      Properties      #
     ########################
@@ -621,7 +621,7 @@ class GridDisplay(Component):
             paths = [paths]
 
         xy = np.empty((0, 2))
-        idx = np.empty((0, 2), dtype=np.int)
+        idx = np.empty((0, 2), dtype=int)
 
         for path in paths:
             _xy, _idx = interior_grid(path, grid, self.basemap,
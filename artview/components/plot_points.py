@@ -21,6 +21,7 @@ from matplotlib.colorbar import ColorbarBase as mlabColorbarBase
 from matplotlib.pyplot import cm
 
 from ..core import Variable, Component, common, VariableChoose, QtWidgets, QtCore
+from ._blit import ArtistBlitter, artists_above
 
 # Save image file type and DPI (resolution)
 IMAGE_EXT = 'png'
@@ -373,11 +374,11 @@ class PointsDisplay(Component):
 
         This will:
 
-        * If strong update: update plot
+        * If strong update: update histogram range in place, or redraw it
         '''
-        if strong:
-            pass
-            # self._update_plot()
+        if strong and self.plot_type == "histogram":
+            if not self._update_histogram():
+                self._update_plot()
 
     ########################
     # Selectionion methods #
@@ -397,6 +398,7 @@ class PointsDisplay(Component):
     def _set_figure_canvas(self):
         '''Set the figure canvas to draw in window area.'''
         self.canvas = FigureCanvasQTAgg(self.fig)
+        self.blitter = ArtistBlitter(self.canvas)
 
     def _update_plot(self):
         '''Draw/Redraw the plot.'''
@@ -501,6 +503,50 @@ class PointsDisplay(Component):
         self.ax.set_ylim(limits['ymin'], limits['ymax'])
         self.canvas.draw()
 
+    def _update_histogram(self):
+        '''Recompute histogram for the colormap limits, changing the bars
+        in place and redrawing only them and the colorbar axis. Returns
+        False if the plot must be redrawn.'''
+        points = self.Vpoints.value
+        field = self.Vfield.value
+        cmap = self.Vcolormap.value
+        if (self.plot_type != "histogram" or points is None or
+                field not in points.fields or
+                not isinstance(self.plot, tuple) or len(self.plot) != 3):
+            return False
+        n, bins, patches = self.plot
+        if len(patches) == 0 or patches[0].axes is not self.ax:
+            return False
+        data = np.ma.compressed(np.ma.asarray(points.fields[field]['data']))
+        n, bins = np.histogram(data, bins=len(patches),
+                               range=(cmap['vmin'], cmap['vmax']))
+        for patch, count, left, right in zip(patches, n, bins[:-1],
+                                             bins[1:]):
+            patch.set_x(left)
+            patch.set_width(right - left)
+            patch.set_height(count)
+        self.plot = (n, bins, patches)
+        old_limits = (self.ax.get_xlim(), self.ax.get_ylim())
+        self.ax.set_xlim(bins[0], bins[-1])
+        self.ax.set_ylim(0, max(n.max(), 1) * 1.05)
+        limits = self.Vlimits.value
+        limits['xmin'], limits['xmax'] = self.ax.get_xlim()
+        limits['ymin'], limits['ymax'] = self.ax.get_ylim()
+        if (self.ax.get_xlim(), self.ax.get_ylim()) != old_limits:
+            # the cached background was captured with the old limits
+            self.blitter.invalidate()
+        artists = artists_above(self.ax, patches[0])
+        if getattr(self, 'cbar', None) is not None:
+            self.cax.cla()
+            norm = mlabNormalize(vmin=cmap['vmin'], vmax=cmap['vmax'])
+            self.cbar = mlabColorbarBase(self.cax, cmap=cmap['cmap'],
+                                         norm=norm,
+                                         orientation='horizontal')
+            self.cbar.set_label(self.units)
+            artists.append(self.cax)
+        self.blitter.blit(artists)
+        return True
+
     def _update_limits(self):
         limits = self.Vlimits.value
         ax = self.ax.get_xlim()
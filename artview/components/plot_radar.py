@@ -7,6 +7,7 @@ from __future__ import print_function
 # Load the needed packages
 import numpy as np
 import os
+import hashlib
 import pyart
 
 from matplotlib.backends import pylab_setup
@@ -17,13 +18,18 @@ NavigationToolbar = backend.NavigationToolbar2QT
 #from matplotlib.backends.backend_qt4agg import NavigationToolbar2QT as \
 #    NavigationToolbar
 from matplotlib.figure import Figure
-from matplotlib.colors import Normalize as mlabNormalize
 from matplotlib.colorbar import ColorbarBase as mlabColorbarBase
 from matplotlib.pyplot import cm
 
 from ..core import (Variable, Component, common, VariableChoose, QtCore,
-                    QtGui, QtWidgets, log)
-from ..core.points import Points
+                    QtGui, QtWidgets, log, deferUpdates)
+from ..core.points import IndexedPoints
+from ._blit import ArtistBlitter, artists_above, colormap_norm
+from ._lod import LevelOfDetail, METHODS as LOD_METHODS
+from ._raster import PolarRaster
+from ._redraw import RedrawScheduler
+from ._overlay import OverlayCache, capture, readd, argument_names
+from ._index import PolarIndex, container_index, drop_indexes
 
 # Save image file type and DPI (resolution)
 IMAGE_EXT = 'png'
@@ -125,6 +131,20 @@ class RadarDisplay(Component):
         self.VplotAxes = Variable(None)
         self.VpyartDisplay = Variable(None)
 
+        # gate geometry of the radar sweeps, see _update_mesh
+        self._layouts = {}
+        self._geometry = {}
+        self._meshKey = None
+        # reduced resolution meshes, see _set_lod, off unless chosen in
+        # the Level of Detail menu
+        self.lod = None
+        self.lodMethod = None
+        # image of PPI sweep, see _set_raster
+        self.raster = None
+        # range rings, cross hair and map layers, see _add_overlay
+        self.overlays = OverlayCache()
+        self.overlayArtists = []
+
         self.sharedVariables = {"Vradar": self.NewRadar,
                                 "Vfield": self.NewField,
                                 "Vtilt": self.NewTilt,
@@ -181,9 +201,9 @@ class RadarDisplay(Component):
     def keyPressEvent(self, event):
         '''Allow tilt adjustment via the Up-Down arrow keys.'''
         if event.key() == QtCore.Qt.Key_Up:
-            self.TiltSelectCmd(self.Vtilt.value + 1)
+            self.TiltSelectCmd(self.Vtilt.value + 1, later=True)
         elif event.key() == QtCore.Qt.Key_Down:
-            self.TiltSelectCmd(self.Vtilt.value - 1)
+            self.TiltSelectCmd(self.Vtilt.value - 1, later=True)
         else:
             super(RadarDisplay, self).keyPressEvent(event)
 
@@ -249,8 +269,9 @@ class RadarDisplay(Component):
         if aspect != self.ax.get_aspect():
             self.ax.set_aspect(aspect)
         if change == 1:
-            self.Vcolormap.change(cmap)
-            self.Vlimits.change(limits)
+            with deferUpdates():
+                self.Vcolormap.change(cmap)
+                self.Vlimits.change(limits)
 
     def _fillTiltBox(self):
         '''Fill in the Tilt Window Box with current elevation angles.'''
@@ -322,6 +343,10 @@ class RadarDisplay(Component):
             self.units = val
             self._update_plot()
 
+    def _show_redraw_stats(self):
+        '''Show frame statistics of the plot redraws.'''
+        common.ShowLongText(self.redraw.summary())
+
     def _add_ImageText(self):
         '''Add a text box to display.'''
         from .image_text import ImageTextBox
@@ -351,6 +376,18 @@ class RadarDisplay(Component):
                 lambda check, RngRing=RngRing: self.RngRingSelectCmd(RngRing))
             self.dispRngRing.setMenu(self.dispRngRingmenu)
 
+    def _add_lod_to_button(self):
+        '''Add a menu to choose the reducer of the level of detail.'''
+        group = QtWidgets.QActionGroup(self.dispLodmenu)
+        for method in (None,) + LOD_METHODS:
+            name = "Off" if method is None else method.capitalize()
+            lodAction = QtWidgets.QAction(name, group, checkable=True)
+            lodAction.setChecked(method == self.lodMethod)
+            lodAction.triggered.connect(
+                lambda check, method=method: self.LodSelectCmd(method))
+            self.dispLodmenu.addAction(lodAction)
+        self.dispLod.setMenu(self.dispLodmenu)
+
     def _add_cmaps_to_button(self):
         '''Add a menu to change colormap used for plot.'''
         for cm_name in self.cm_names:
@@ -383,11 +420,23 @@ class RadarDisplay(Component):
             triggered=self._IgnoreEdgesToggleAction)
         dispmenu.addAction(self.ignoreEdgesToggle)
         self.ignoreEdgesToggle.setChecked(False)
+        self.rasterToggle = QtWidgets.QAction(
+            'Raster PPI', dispmenu, checkable=True,
+            triggered=self._update_plot)
+        self.rasterToggle.setToolTip(
+            "Draw PPI sweeps as an image at screen resolution")
+        dispmenu.addAction(self.rasterToggle)
+        self.rasterToggle.setChecked(False)
         self.useMapToggle = QtWidgets.QAction(
             'Use MapDisplay', dispmenu, checkable=True,
             triggered=self._UseMapToggleAction)
         dispmenu.addAction(self.useMapToggle)
         self.useMapToggle.setChecked(False)
+        self.dispLod = dispmenu.addAction("Level of Detail")
+        self.dispLod.setToolTip(
+            "Draw reduced resolution plot when zoomed out")
+        self.dispLodmenu = QtWidgets.QMenu("Level of Detail")
+        self.dispLodmenu.setFocusPolicy(QtCore.Qt.NoFocus)
         dispTitle = dispmenu.addAction("Change Title")
         dispTitle.setToolTip("Change plot title")
         dispUnit = dispmenu.addAction("Change Units")
@@ -408,6 +457,8 @@ class RadarDisplay(Component):
         dispSaveFile = dispmenu.addAction("Save Image")
         dispSaveFile.setShortcut("Ctrl+S")
         dispSaveFile.setStatusTip("Save Image using dialog")
+        dispRedrawStats = dispmenu.addAction("Show Redraw Stats")
+        dispRedrawStats.setToolTip("Show frame times of the plot redraws")
 
         dispLimits.triggered.connect(self._open_LimsDialog)
         dispTitle.triggered.connect(self._title_input)
@@ -416,8 +467,10 @@ class RadarDisplay(Component):
         self.dispImageText.triggered.connect(self._add_ImageText)
         dispQuickSave.triggered.connect(self._quick_savefile)
         dispSaveFile.triggered.connect(self._savefile)
+        dispRedrawStats.triggered.connect(self._show_redraw_stats)
 
         self._add_RngRing_to_button()
+        self._add_lod_to_button()
         self._add_cmaps_to_button()
         self.dispButton.setMenu(dispmenu)
 
@@ -446,10 +499,12 @@ class RadarDisplay(Component):
         toolmenu = QtWidgets.QMenu(self)
         toolZoomPan = toolmenu.addAction("Zoom/Pan")
         toolValueClick = toolmenu.addAction("Click for Value")
+        toolValueHover = toolmenu.addAction("Hover for Values")
         toolReset = toolmenu.addAction("Reset Tools")
         toolDefault = toolmenu.addAction("Reset File Defaults")
         toolZoomPan.triggered.connect(self.toolZoomPanCmd)
         toolValueClick.triggered.connect(self.toolValueClickCmd)
+        toolValueHover.triggered.connect(self.toolValueHoverCmd)
         toolReset.triggered.connect(self.toolResetCmd)
         toolDefault.triggered.connect(self.toolDefaultCmd)
         self.toolmenu = toolmenu
@@ -521,6 +576,8 @@ class RadarDisplay(Component):
         self.units = self._get_default_units()
         self.title = self._get_default_title()
         if strong:
+            # the gates may have moved, weak updates keep the indexes
+            drop_indexes(self.Vradar.value)
             self._update_display()
             self._update_infolabel()
             self.VpathInteriorFunc.update(True)
@@ -544,7 +601,8 @@ class RadarDisplay(Component):
         idx = self.fieldBox.findText(self.Vfield.value)
         self.fieldBox.setCurrentIndex(idx)
         if strong:
-            self._update_plot()
+            if not self._update_mesh():
+                self._update_plot()
             self._update_infolabel()
             self.VpathInteriorFunc.update(True)
 
@@ -567,9 +625,10 @@ class RadarDisplay(Component):
 
         This will:
 
-        * If strong update: update plot
+        * If strong update: update colormap of plot in place, or update
+          plot
         '''
-        if strong:
+        if strong and not self._update_colormap():
             self._update_plot()
 
     def NewGatefilter(self, variable, strong):
@@ -598,7 +657,8 @@ class RadarDisplay(Component):
         self.tiltBox.setCurrentIndex(self.Vtilt.value+1)
         if strong:
             self.title = self._get_default_title()
-            self._update_plot()
+            if not self._update_mesh():
+                self._update_plot()
             self._update_infolabel()
             self.VpathInteriorFunc.update(True)
 
@@ -615,18 +675,23 @@ class RadarDisplay(Component):
         if strong:
             self._update_plot()
         else:
-            self.canvas.draw()
+            self.redraw.mark()
 
-    def TiltSelectCmd(self, ntilt):
+    def TiltSelectCmd(self, ntilt, later=False):
         '''
         Captures tilt selection and update tilt
         :py:class:`~artview.core.core.Variable`.
+        If later, repeated selections before the display is updated are
+        merged, see :py:func:`~artview.core.core.Variable.changeLater`.
         '''
         if ntilt < 0:
             ntilt = len(self.rTilts)-1
         elif ntilt >= len(self.rTilts):
             ntilt = 0
-        self.Vtilt.change(ntilt)
+        if later:
+            self.Vtilt.changeLater(ntilt)
+        else:
+            self.Vtilt.change(ntilt)
 
     def FieldSelectCmd(self, name):
         '''
@@ -668,6 +733,12 @@ class RadarDisplay(Component):
 
         self._update_plot()
 
+    def LodSelectCmd(self, method):
+        '''Captures level of detail reducer selection and redraws.'''
+        self.lodMethod = method
+        self._set_lod()
+        self.redraw.mark("mesh")
+
     def cmapSelectCmd(self, cm_name):
         '''Captures colormap selection and redraws.'''
         CMAP = cm_name
@@ -690,6 +761,13 @@ class RadarDisplay(Component):
             self, name=self.name + "ValueClick", parent=self.parent)
         self.tools['valueclick'].connect()
 
+    def toolValueHoverCmd(self):
+        '''Creates and connects to values under the cursor retrieval.'''
+        from .toolbox import ValueHover
+        self.tools['valuehover'] = ValueHover(
+            self, name=self.name + "ValueHover", parent=self.parent)
+        self.tools['valuehover'].connect()
+
     def toolResetCmd(self):
         '''Reset tools via disconnect.'''
         from . import toolbox
@@ -705,6 +783,69 @@ class RadarDisplay(Component):
             self._set_default_cmap()
         self._set_default_limits()
 
+    def _plot_coordinates(self, tilt):
+        '''Return position (nrays, ngates) of the gates of tilt in the plot
+        axes.'''
+        try:
+            x, y, z = self.VpyartDisplay.value._get_x_y_z(
+                tilt, False, True)
+        except:
+            x, y, z = self.VpyartDisplay.value._get_x_y_z(
+                self.Vfield.value, tilt, False, True)
+        if self.plot_type == "radarAirborne":
+            return x, z
+        elif self.plot_type == "radarPpi":
+            return x, y
+        elif self.plot_type == "radarRhi":
+            r = np.sqrt(x ** 2 + y ** 2) * np.sign(y)
+            if np.all(r < 1.):
+                r = -r
+            return r, z
+
+    def getSweepIndex(self):
+        '''
+        Return spatial index of the gates of the current radar and tilt.
+
+        Returns
+        -------
+        index : :py:class:`~artview.components._index.PolarIndex`
+            Index in the plot coordinates, built once per radar, tilt and
+            plot type. None if there is no radar or display.
+        '''
+        radar = self.Vradar.value
+        tilt = self.Vtilt.value
+        if radar is None or not self.VpyartDisplay.value:
+            return None
+        return container_index(
+            radar, (tilt, self.plot_type),
+            lambda: PolarIndex(*self._plot_coordinates(tilt)))
+
+    def getReadout(self, xdata, ydata):
+        '''
+        Return text describing the gate nearest to a point of the plot:
+        azimuth, elevation, range, height and the value of all fields,
+        see :py:func:`~artview.components.toolbox.field_values_message`.
+        None if there is no radar.
+        '''
+        from .toolbox import field_values_message
+        radar = self.Vradar.value
+        index = self.getSweepIndex()
+        if radar is None or index is None:
+            return None
+        ray, gate, _ = index.nearest(xdata, ydata)
+        ray = radar.sweep_start_ray_index['data'][self.Vtilt.value] + ray[0]
+        gate = gate[0]
+        azimuth = radar.azimuth['data'][ray]
+        elevation = radar.elevation['data'][ray]
+        rng = radar.range['data'][gate]
+        x, y, z = pyart.core.antenna_to_cartesian(
+            rng / 1000., azimuth, elevation)
+        height = float(np.ravel(z)[0]) + float(radar.altitude['data'][0])
+        msg = ('Azimuth = %4.2f deg.,  Elevation = %4.2f deg.,  '
+               'Range = %4.3f km,  Height = %4.3f km,  ' %
+               (azimuth, elevation, rng / 1000., height / 1000.))
+        return msg + field_values_message(radar.fields, (ray, gate))
+
     def getPathInteriorValues(self, paths):
         '''
         Return the bins values path.
@@ -717,14 +858,15 @@ class RadarDisplay(Component):
         -------
         points : :py:class`artview.core.points.Points`
             Points object containing all bins of the current radar
-            and tilt inside path. Axes : 'x_disp', 'y_disp', 'ray_index',
-            'range_index', 'azimuth', 'range'. Fields: just current field
+            and tilt inside any of paths, once each. Axes : 'x_disp',
+            'y_disp', 'ray_index', 'range_index', 'azimuth', 'range'.
+            Fields: all fields of the radar, the current one first, see
+            :py:class:`~artview.core.points.IndexedPoints`
 
         Notes
         -----
             If Vradar.value is None, returns None
         '''
-        from .toolbox import interior_radar
         radar = self.Vradar.value
         tilt = self.Vtilt.value
         if radar is None or not self.VpyartDisplay.value:
@@ -735,64 +877,18 @@ class RadarDisplay(Component):
         except:
             paths = [paths]
 
-        xy = np.empty((0, 2))
-        idx = np.empty((0, 2), dtype=np.int)
+        # masks of each path are kept by the index, so only new paths are
+        # tested, e.g. when a polygon is added or the field changes
+        index = self.getSweepIndex()
+        ngates = radar.range['data'].size
+        ind = np.nonzero(index.region(paths))[0]
 
-        for path in paths:
-            try:
-                x, y, z = self.VpyartDisplay.value._get_x_y_z(
-                    tilt, False, True)
-            except:
-                x, y, z = self.VpyartDisplay.value._get_x_y_z(
-                    self.Vfield.value, tilt, False, True)
-            if self.plot_type == "radarAirborne":
-                _xy = np.empty(shape=(x.size, 2))
-                _xy[:, 0] = x.flatten()
-                _xy[:, 1] = z.flatten()
-                ind = np.nonzero([path.contains_point(p) for p in _xy])[0]
-
-                _xy = _xy[ind]
-                ngates = radar.range['data'].size
-                rayIndex = (radar.sweep_start_ray_index['data'][tilt] +
-                            ind / ngates)
-                gateIndex = ind % ngates
-                _idx = np.concatenate((rayIndex[np.newaxis],
-                                       gateIndex[np.newaxis]), axis=0)
-                _idx = _idx.transpose().astype(np.int)
-            elif self.plot_type == "radarPpi":
-                _xy = np.empty(shape=(x.size, 2))
-                _xy[:, 0] = x.flatten()
-                _xy[:, 1] = y.flatten()
-                ind = np.nonzero([path.contains_point(p) for p in _xy])[0]
-
-                _xy = _xy[ind]
-                ngates = radar.range['data'].size
-                rayIndex = (radar.sweep_start_ray_index['data'][tilt] +
-                            ind / ngates)
-                gateIndex = ind % ngates
-                _idx = np.concatenate((rayIndex[np.newaxis],
-                                       gateIndex[np.newaxis]), axis=0)
-                _idx = _idx.transpose().astype(np.int)
-            elif self.plot_type == "radarRhi":
-                _xy = np.empty(shape=(x.size, 2))
-                r = np.sqrt(x ** 2 + y ** 2) * np.sign(y)
-                if np.all(r < 1.):
-                    r = -r
-                _xy[:, 0] = r.flatten()
-                _xy[:, 1] = z.flatten()
-                ind = np.nonzero([path.contains_point(p) for p in _xy])[0]
-
-                _xy = _xy[ind]
-                ngates = radar.range['data'].size
-                rayIndex = (radar.sweep_start_ray_index['data'][tilt] +
-                            ind / ngates)
-                gateIndex = ind % ngates
-                _idx = np.concatenate((rayIndex[np.newaxis],
-                                       gateIndex[np.newaxis]), axis=0)
-                _idx = _idx.transpose().astype(np.int)
-
-            xy = np.concatenate((xy, _xy))
-            idx = np.concatenate((idx, _idx))
+        xy = np.empty(shape=(ind.size, 2))
+        xy[:, 0] = index.x.ravel()[ind]
+        xy[:, 1] = index.y.ravel()[ind]
+        idx = np.empty(shape=(ind.size, 2), dtype=int)
+        idx[:, 0] = radar.sweep_start_ray_index['data'][tilt] + ind // ngates
+        idx[:, 1] = ind % ngates
 
         xaxis = {'data':  xy[:, 0] * 1000.,
                  'long_name': 'X-coordinate in Cartesian system',
@@ -810,10 +906,6 @@ class RadarDisplay(Component):
         rng = radar.range.copy()
         rng['data'] = radar.range['data'][idx[:, 1]]
 
-        field = radar.fields[self.Vfield.value].copy()
-        field['data'] = radar.fields[self.Vfield.value]['data'][
-            idx[:, 0], idx[:, 1]]
-
         ray_idx = {'data': idx[:, 0],
                    'long_name': 'index in ray dimension'}
         rng_idx = {'data': idx[:, 1],
@@ -826,9 +918,9 @@ class RadarDisplay(Component):
                 'azimuth': azi,
                 'range': rng}
 
-        fields = {self.Vfield.value: field}
-
-        points = Points(fields, axes, radar.metadata.copy(), xy.shape[0])
+        # all fields, gathered when used
+        points = IndexedPoints(radar, (idx[:, 0], idx[:, 1]), axes,
+                               radar.metadata.copy(), self.Vfield.value)
 
         return points
 
@@ -902,6 +994,11 @@ class RadarDisplay(Component):
     def _set_figure_canvas(self):
         '''Set the figure canvas to draw in window area.'''
         self.canvas = FigureCanvasQTAgg(self.fig)
+        self.blitter = ArtistBlitter(self.canvas)
+        self.redraw = RedrawScheduler(self.canvas, self.blitter)
+        self.redraw.register("mesh", self._mesh_artists)
+        self.redraw.register("colorbar", lambda: [self.cax])
+        self.redraw.register("overlay", lambda: self.overlayArtists or None)
         # Add the widget to the canvas
         self.layout.addWidget(self.canvas, 1, 0, 7, 6)
 
@@ -917,6 +1014,9 @@ class RadarDisplay(Component):
             display = pyart.graph.RadarDisplay(self.Vradar.value)
         elif self.plot_type == "radarRhi":
             display = pyart.graph.RadarDisplay(self.Vradar.value)
+        self._layouts = {}
+        self._geometry = {}
+        self._meshKey = None
         self.VpyartDisplay.change(display)
 
     def _update_plot(self):
@@ -928,11 +1028,16 @@ class RadarDisplay(Component):
         # Create the plot with PyArt RadarDisplay
         self.ax.cla()  # Clear the plot axes
         self.cax.cla()  # Clear the colorbar axes
+        self.plot = None
+        self._meshKey = None
+        self.lod = None
+        self.raster = None
+        self.overlayArtists = []
 
         self.VplotAxes.update()
 
         if self.Vfield.value not in self.Vradar.value.fields.keys():
-            self.canvas.draw()
+            self.redraw.mark()
             self.statusbar.setStyleSheet("QStatusBar{padding-left:8px;" +
                                          "background:rgba(255,0,0,255);" +
                                          "color:black;font-weight:bold;}")
@@ -957,17 +1062,15 @@ class RadarDisplay(Component):
         else:
             ignoreEdges = True
 
-        if 'norm' in cmap:
-            norm = cmap['norm']
-            mask_outside = False
-        else:
-            norm = None
-            mask_outside = True
+        # values outside limits are hidden by the colormap, not masked, so
+        # limits can be changed in place, see _update_colormap
+        colormap, norm = colormap_norm(cmap, 'norm' not in cmap)
+        mask_outside = False
 
         if self.plot_type == "radarAirborne":
             self.plot = display.plot_sweep_grid(
                 self.Vfield.value, vmin=cmap['vmin'],
-                vmax=cmap['vmax'], colorbar_flag=False, cmap=cmap['cmap'],
+                vmax=cmap['vmax'], colorbar_flag=False, cmap=colormap,
                 norm=norm, mask_outside=mask_outside,
                 edges=ignoreEdges, gatefilter=gatefilter,
                 ax=self.ax, fig=self.fig, title=title)
@@ -975,57 +1078,328 @@ class RadarDisplay(Component):
 
         elif self.plot_type == "radarPpi" or self.plot_type == "radarPpiMap":
             # Create Plot
-            if self.useMapToggle.isChecked():
-                plot_ppi = display.plot_ppi_map
-            else:
-                plot_ppi = display.plot_ppi
-
-            self.plot = plot_ppi(
-                self.Vfield.value, self.Vtilt.value,
+            kwargs = dict(
                 vmin=cmap['vmin'], vmax=cmap['vmax'], norm=norm,
-                colorbar_flag=False, cmap=cmap['cmap'], mask_outside=mask_outside,
+                colorbar_flag=False, cmap=colormap, mask_outside=mask_outside,
                 edges=ignoreEdges, gatefilter=gatefilter,
                 ax=self.ax, fig=self.fig, title=title)
+            if self.useMapToggle.isChecked():
+                mapKey = self._map_key()
+                self.plot = self._plot_ppi_map(display, mapKey, kwargs)
+            else:
+                mapKey = None
+                self.plot = display.plot_ppi(
+                    self.Vfield.value, self.Vtilt.value, **kwargs)
             # Add range rings
             if self.RngRing:
-                display.plot_range_rings(self.RNG_RINGS, ax=self.ax)
+                self._add_overlay(
+                    ("rings", mapKey, tuple(self.RNG_RINGS)),
+                    lambda: display.plot_range_rings(self.RNG_RINGS,
+                                                     ax=self.ax))
             # Add radar location
-            display.plot_cross_hair(5., ax=self.ax)
+            self._add_overlay(
+                ("crosshair", mapKey),
+                lambda: display.plot_cross_hair(5., ax=self.ax))
 
         elif self.plot_type == "radarRhi":
             # Create Plot
             self.plot = display.plot_rhi(
                 self.Vfield.value, self.Vtilt.value,
                 vmin=cmap['vmin'], vmax=cmap['vmax'], norm=norm,
-                colorbar_flag=False, cmap=cmap['cmap'], mask_outside=mask_outside,
+                colorbar_flag=False, cmap=colormap, mask_outside=mask_outside,
                 edges=ignoreEdges, gatefilter=gatefilter,
                 ax=self.ax, fig=self.fig, title=title)
             # Add range rings
             if self.RngRing:
-                display.plot_range_rings(self.RNG_RINGS, ax=self.ax)
+                self._add_overlay(
+                    ("rings", "rhi", tuple(self.RNG_RINGS)),
+                    lambda: display.plot_range_rings(self.RNG_RINGS,
+                                                     ax=self.ax))
+
+        if not hasattr(self.plot, 'set_cmap'):
+            # Py-ART plot methods do not return the mesh, keep it
+            plots = getattr(display, 'plots', [])
+            self.plot = plots[-1] if plots else None
+        if self.plot is not None:
+            self._meshKey = self._mesh_key(self.Vtilt.value)
+            if self._use_raster():
+                self._set_raster()
+            else:
+                self._set_lod(update=False)
 
         self._update_axes()
-        if norm is None:
-            norm = mlabNormalize(vmin=cmap['vmin'],
-                                 vmax=cmap['vmax'])
+        self._update_colorbar(colormap, norm)
+
+#        print "Plotting %s field, Tilt %d in %s" % (
+#            self.Vfield.value, self.Vtilt.value+1, self.name)
+        self.redraw.mark()
+
+    def _add_overlay(self, key, draw):
+        '''Add overlay artists kept under key to the plot, draw() makes
+        them the first time.'''
+        self.overlayArtists.extend(self.overlays.add(self.ax, key, draw))
+
+    def _map_key(self):
+        '''Return key of the map of the radar site.'''
+        radar = self.Vradar.value
+        return ("map", float(radar.latitude['data'][0]),
+                float(radar.longitude['data'][0]),
+                float(radar.range['data'][-1]))
+
+    def _plot_ppi_map(self, display, mapKey, kwargs):
+        '''
+        Plot with display.plot_ppi_map, reusing the basemap and map layers
+        (coastlines, lat/lon lines) of previous plots of the radar site.
+
+        Making the basemap and its layers takes most of the time of the
+        plot, Py-ART versions without the basemap and embelish arguments
+        make them every time.
+        '''
+        cached = self.overlays.get(mapKey)
+        reuse = (cached is not None and
+                 {'basemap', 'embelish'}.issubset(
+                     argument_names(display.plot_ppi_map)))
+        if reuse:
+            kwargs = dict(kwargs, basemap=cached[0], embelish=False)
+        plot, added = capture(self.ax, lambda: display.plot_ppi_map(
+            self.Vfield.value, self.Vtilt.value, **kwargs))
+        if reuse:
+            layers = cached[1]
+            readd(self.ax, layers)
+        else:
+            meshes = getattr(display, 'plots', [])[-1:]
+            layers = [artist for artist in added
+                      if not any(artist is mesh for mesh in meshes)]
+            basemap = getattr(display, 'basemap', None)
+            if basemap is not None:
+                self.overlays.put(mapKey, (basemap, layers))
+        self.overlayArtists.extend(layers)
+        return plot
+
+    def _update_colorbar(self, colormap, norm):
+        '''Draw the colorbar in cax.'''
         if self.colormapToggle.isChecked():
-            self.cbar = mlabColorbarBase(self.cax, cmap=cmap['cmap'],
-                                        norm=norm, orientation='horizontal')
+            self.cbar = mlabColorbarBase(self.cax, cmap=colormap,
+                                         norm=norm, orientation='horizontal')
             self.cbar.set_label(self.units)
             self.cax.set_visible(True)
         else:
             self.cax.set_visible(False)
 
-#        print "Plotting %s field, Tilt %d in %s" % (
-#            self.Vfield.value, self.Vtilt.value+1, self.name)
-        self.canvas.draw()
+    def _mesh_artists(self):
+        '''Artists to redraw when only the plot mesh changed.'''
+        if not hasattr(self.plot, 'set_cmap') or self.plot.axes is not self.ax:
+            return None
+        return artists_above(self.ax, self.plot)
+
+    def _update_colormap(self):
+        '''Change colormap and limits of the plot in place, redrawing only
+        the mesh and colorbar. Returns False if the plot must be
+        redrawn.'''
+        mesh = self.plot
+        if (self.Vradar.value is None or
+                not hasattr(mesh, 'set_cmap') or mesh.axes is not self.ax or
+                self.Vfield.value not in self.Vradar.value.fields):
+            return False
+        cmap = self.Vcolormap.value
+        colormap, norm = colormap_norm(cmap, 'norm' not in cmap)
+        mesh.set_cmap(colormap)
+        mesh.set_norm(norm)
+        if self.lod is not None:
+            self.lod.sync()
+        self.cax.cla()
+        self._update_colorbar(colormap, norm)
+        self.redraw.mark("mesh", "colorbar")
+        return True
+
+    def _sweep_data(self, field, sweep):
+        '''Return data of field in sweep, masked and filtered as plotted
+        by Py-ART.'''
+        radar = self.Vradar.value
+        sweep_slice = radar.get_slice(sweep)
+        data = np.ma.asarray(radar.fields[field]['data'][sweep_slice])
+        if self.gatefilterToggle.isChecked() and \
+                self.Vgatefilter.value is not None:
+            excluded = self.Vgatefilter.value.gate_excluded[sweep_slice]
+            data = np.ma.masked_where(excluded, data)
+        if radar.antenna_transition is not None:
+            in_trans = radar.antenna_transition['data'][sweep_slice]
+            data = data[in_trans == 0]
+        return data
+
+    def _mesh_key(self, sweep):
+        '''Return key identifying the mesh geometry of sweep, sweeps with
+        the same rays and gates share it.'''
+        if sweep not in self._layouts:
+            radar = self.Vradar.value
+            if self.plot_type == "radarAirborne":
+                # geometry also depends on platform attitude
+                layout = "sweep%d" % sweep
+            else:
+                sweep_slice = radar.get_slice(sweep)
+                arrays = [radar.azimuth['data'][sweep_slice],
+                          radar.elevation['data'][sweep_slice],
+                          radar.range['data']]
+                if radar.antenna_transition is not None:
+                    arrays.append(
+                        radar.antenna_transition['data'][sweep_slice])
+                digest = hashlib.sha1()
+                for array in arrays:
+                    digest.update(np.ascontiguousarray(array).tobytes())
+                layout = digest.hexdigest()
+            self._layouts[sweep] = layout
+        return (self.plot_type, self.ignoreEdgesToggle.isChecked(),
+                self._layouts[sweep])
+
+    def _sweep_geometry(self, sweep, key):
+        '''Return gate edges x, y in km of a PPI sweep, cached by mesh
+        key.'''
+        if key not in self._geometry:
+            radar = self.Vradar.value
+            edges = not self.ignoreEdgesToggle.isChecked()
+            x, y, z = radar.get_gate_x_y_z(sweep, edges=edges,
+                                           filter_transitions=True)
+            self._geometry[key] = (x / 1000., y / 1000.)
+        return self._geometry[key]
+
+    def _sweep_polar(self, sweep, key):
+        '''Return azimuth of rays and ground range of gates in km of a PPI
+        sweep, cached by mesh key.'''
+        key = ('polar',) + key
+        if key not in self._geometry:
+            radar = self.Vradar.value
+            sweep_slice = radar.get_slice(sweep)
+            azimuth = radar.azimuth['data'][sweep_slice]
+            if radar.antenna_transition is not None:
+                in_trans = radar.antenna_transition['data'][sweep_slice]
+                azimuth = azimuth[in_trans == 0]
+            x, y, z = radar.get_gate_x_y_z(sweep, edges=False,
+                                           filter_transitions=True)
+            ground_range = np.hypot(x, y).mean(axis=0) / 1000.
+            self._geometry[key] = (azimuth, ground_range)
+        return self._geometry[key]
+
+    def _use_raster(self):
+        '''True if the sweep is drawn by :py:class:`PolarRaster`.'''
+        return (self.rasterToggle.isChecked() and
+                self.plot_type == "radarPpi" and
+                not self.useMapToggle.isChecked() and
+                hasattr(self.plot, 'set_array'))
+
+    def _set_raster(self):
+        '''Replace the plot mesh by an image of the sweep, resampled to
+        the screen pixels when drawn.'''
+        mesh = self.plot
+        try:
+            sweep = self.Vtilt.value
+            azimuth, ground_range = self._sweep_polar(sweep, self._meshKey)
+            raster = PolarRaster(
+                self.ax, azimuth, ground_range,
+                self._sweep_data(self.Vfield.value, sweep),
+                cmap=mesh.get_cmap(), norm=mesh.norm)
+        except:
+            import traceback
+            print(traceback.format_exc(), file=log.debug)
+            return
+        raster.set_zorder(mesh.get_zorder())
+        self.ax.add_image(raster)
+        mesh.remove()
+        self.raster = raster
+        self.plot = raster
+
+    def _update_mesh(self):
+        '''
+        Show a new field or tilt by changing the data of the plot mesh,
+        without plotting again with Py-ART.
+
+        The mesh is kept if the new sweep has the same gate geometry,
+        otherwise for PPIs a new mesh is made from cached geometry.
+        Returns False if the plot must be redrawn.
+        '''
+        mesh = self.plot
+        radar = self.Vradar.value
+        field = self.Vfield.value
+        sweep = self.Vtilt.value
+        if (radar is None or self._meshKey is None or
+                not hasattr(mesh, 'set_array') or mesh.axes is not self.ax or
+                field not in radar.fields or
+                not 0 <= sweep < radar.nsweeps):
+            return False
+        try:
+            if self.lod is not None:
+                self.lod.remove()
+                self.lod = None
+            key = self._mesh_key(sweep)
+            data = self._sweep_data(field, sweep)
+            cmap = self.Vcolormap.value
+            colormap, norm = colormap_norm(cmap, 'norm' not in cmap)
+            if self.raster is not None:
+                azimuth, ground_range = self._sweep_polar(sweep, key)
+                if key == self._meshKey:
+                    self.raster.set_sweep_data(data)
+                else:
+                    self.raster.set_polar(azimuth, ground_range, data)
+                self.raster.set_cmap(colormap)
+                self.raster.set_norm(norm)
+                self._meshKey = key
+            elif key == self._meshKey:
+                current = mesh.get_array()
+                if current is None or current.size != data.size:
+                    return False
+                if current.ndim == 1:
+                    # older matplotlib keeps the mesh array flat
+                    data = data.ravel()
+                mesh.set_array(data)
+                mesh.set_cmap(colormap)
+                mesh.set_norm(norm)
+            elif self.plot_type == "radarPpi":
+                x, y = self._sweep_geometry(sweep, key)
+                newmesh = self.ax.pcolormesh(x, y, data, cmap=colormap,
+                                             norm=norm)
+                newmesh.set_zorder(mesh.get_zorder())
+                mesh.remove()
+                self.plot = newmesh
+                self._meshKey = key
+            else:
+                return False
+        except:
+            import traceback
+            print(traceback.format_exc(), file=log.debug)
+            return False
+        if self.raster is None:
+            self._set_lod()
+        self.ax.set_title(self.title)
+        self.cax.cla()
+        self._update_colorbar(colormap, norm)
+        self.redraw.mark()
+        return True
+
+    def _set_lod(self, update=True):
+        '''Make level of detail of the plot mesh, with reducer
+        lodMethod.'''
+        if self.lod is not None:
+            self.lod.remove()
+            self.lod = None
+        if (self.lodMethod is None or not hasattr(self.plot, 'set_array') or
+                self.plot.axes is not self.ax):
+            return
+        try:
+            self.lod = LevelOfDetail(self.plot, self.lodMethod)
+            if update:
+                self.lod.update()
+        except:
+            import traceback
+            print(traceback.format_exc(), file=log.debug)
+            self.lod = None
 
     def _update_axes(self):
         '''Change the Plot Axes.'''
         limits = self.Vlimits.value
         self.ax.set_xlim(limits['xmin'], limits['xmax'])
         self.ax.set_ylim(limits['ymin'], limits['ymax'])
-        self.ax.figure.canvas.draw()
+        if self.lod is not None:
+            self.lod.update()
+        self.redraw.mark("axes")
 
     #########################
     # Check methods #
@@ -1117,7 +1491,7 @@ class RadarDisplay(Component):
         '''Save the current display via PyArt interface.'''
         imagename = self.VpyartDisplay.value.generate_filename(
             self.Vfield.value, self.Vtilt.value, ext=IMAGE_EXT)
-        self.canvas.print_figure(os.path.join(os.getcwd(), imagename), dpi=DPI)
+        self._print_figure(os.path.join(os.getcwd(), imagename))
         self.statusbar.showMessage(
             'Saved to %s' % os.path.join(os.getcwd(), imagename))
 
@@ -1129,9 +1503,19 @@ class RadarDisplay(Component):
         path = unicode(QtWidgets.QFileDialog.getSaveFileName(
             self, 'Save file', PBNAME, file_choices))
         if path:
-            self.canvas.print_figure(path, dpi=DPI)
+            self._print_figure(path)
             self.statusbar.showMessage('Saved to %s' % path)
 
+    def _print_figure(self, path):
+        '''Save figure to path, at full resolution.'''
+        if self.lod is not None:
+            self.lod.show(1)
+        try:
+            self.canvas.print_figure(path, dpi=DPI)
+        finally:
+            if self.lod is not None:
+                self.lod.update()
+
     def minimumSizeHint(self):
         return QtCore.QSize(20, 20)
 
@@ -1164,6 +1548,10 @@ class RadarDisplay(Component):
         ''' get current tilt '''
         return self.Vtilt.value
 
+    def getContainer(self):
+        ''' get current radar, the container of the read-out '''
+        return self.Vradar.value
+
 
 class _DisplayStart(QtWidgets.QDialog):
     '''
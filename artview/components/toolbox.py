@@ -3,17 +3,23 @@ tools.py
 
 Routines and class instances to create tools for the Display ToolBox.
 """
+from __future__ import print_function
 
 # Load the needed packages
 import numpy as np
+import threading
+import traceback
 import warnings
 import csv
 
 from . import limits
-from ..core import common, QtWidgets, QtCore
+from ..core import common, QtWidgets, QtCore, log
+from ._redraw import frame_interval
+from ._interior import interior_points, interior_polar, interior_rectilinear
 
 from matplotlib.lines import Line2D
 from matplotlib.path import Path
+from matplotlib.image import AxesImage
 
 # The following line is used to suppress NaN warnings thrown by Numpy
 # when using some tools
@@ -107,6 +113,7 @@ class ValueClick(QtWidgets.QMainWindow):
         self.statusbar = display.getStatusBar()
         self.fig = self.ax.get_figure()
         self.plot_type = display.plot_type
+        self.getSweepIndex = display.getSweepIndex
         self.Vradar.valueChanged.connect(self.NewRadar)
 
         self.msg = "Click to display value"
@@ -120,37 +127,16 @@ class ValueClick(QtWidgets.QMainWindow):
         '''Get value at the point selected by mouse click.'''
         xdata = event.xdata  # get event x location
         ydata = event.ydata  # get event y location
+        index = self.getSweepIndex()
         if ((xdata is None) or (ydata is None) or
-            (self.Vradar.value is None)):
+            (self.Vradar.value is None) or index is None):
             self.msg = "Please choose point inside plot area"
         else:
-            az = np.arctan2(xdata, ydata) * 180. / np.pi
             radar = self.Vradar.value  # keep equations clean
-            if az < 0:
-                az = az + 360.
-            rng = np.sqrt(xdata*xdata + ydata*ydata)
-
-            azindex = np.argmin(np.abs(
-                radar.azimuth['data'][radar.sweep_start_ray_index['data'][
-                    self.Vtilt.value]:radar.sweep_end_ray_index['data'][
-                    self.Vtilt.value] + 1] - az)) + \
-                radar.sweep_start_ray_index['data'][self.Vtilt.value]
-            if azindex == radar.sweep_end_ray_index['data'][self.Vtilt.value]:
-                if az < 10:
-                    az = az + 360.
-                if np.abs(
-                        radar.azimuth['data'][radar.sweep_start_ray_index[
-                        'data'][self.Vtilt.value]] + 360. - az) < \
-                        np.abs(radar.azimuth['data'][
-                        radar.sweep_end_ray_index['data'][
-                        self.Vtilt.value]] - az):
-                    azindex = \
-                        radar.sweep_start_ray_index['data'][self.Vtilt.value]
-                else:
-                    azindex = \
-                        radar.sweep_end_ray_index['data'][self.Vtilt.value]
-
-            rngindex = np.argmin(np.abs(radar.range['data'] - rng*1000.))
+            ray, gate, _ = index.nearest(xdata, ydata)
+            azindex = (radar.sweep_start_ray_index['data'][self.Vtilt.value] +
+                       ray[0])
+            rngindex = gate[0]
             if self.plot_type == 'radarPpi':
                 msg1 = 'x = %4.2f, y = %4.2f, ' % (xdata, ydata)
                 msg2 = 'Azimuth = %4.2f deg., Range = %4.3f km, ' % (
@@ -171,7 +157,7 @@ class ValueClick(QtWidgets.QMainWindow):
                     self.units)
                 self.msg = msg1 + msg2 + msg3
             elif self.plot_type == 'radarAirborne':
-                rotind = np.argmin(np.abs(radar.rotation['data'] - az))
+                rotind = azindex
                 msg1 = 'x = %4.2f, y = %4.2f, ' % (xdata, ydata)
                 msg2 = 'Angle of Rotation = %4.2f deg., Range = %4.3f km, ' % (
                     radar.rotation['data'][rotind],
@@ -192,6 +178,130 @@ class ValueClick(QtWidgets.QMainWindow):
     def NewRadar(self, variable, strong=False):
         '''Update the display list when radar variable is changed.'''
         print("In NewRadar")
+
+
+####################################
+#  Mouse Hover Value Class Method  #
+####################################
+
+
+class ValueHover(QtWidgets.QMainWindow):
+    '''
+    Class showing the values under the mouse cursor on display.
+    '''
+
+    # emitted by the loading thread, handled in the GUI thread
+    _fieldsLoaded = QtCore.pyqtSignal()
+
+    def __init__(self, display, name="ValueHover", parent=None):
+        '''
+        Initialize the class to display values under the mouse cursor.
+
+        Parameters
+        ----------
+        display : ARTview Display instance
+            Display to engage ValueHover, must have getPlotAxis(),
+            getStatusBar(), getContainer(), returning the radar or grid
+            shown, and getReadout(xdata, ydata), returning the text to show
+            or None.
+
+        [Optional]
+        name : str
+            Window name.
+        parent : PyQt instance
+            Parent instance to associate to ValueHover instance.
+            If None, then Qt owns, otherwise associated with parent PyQt
+            instance.
+
+        Notes
+        -----
+        Mouse motion events only keep the cursor position, the read-out
+        is made at most once per screen refresh and not while a mouse
+        button is pressed, e.g. panning.
+
+        Fields not in memory, released after the file was opened, are
+        loaded once per container in a background thread, and shown as not
+        loaded until then.
+        '''
+        super(ValueHover, self).__init__(parent=parent)
+
+        self.parent = parent
+        self.name = name
+        self.getReadout = display.getReadout
+        self.getContainer = display.getContainer
+        self.ax = display.getPlotAxis()
+        self.statusbar = display.getStatusBar()
+        self.fig = self.ax.get_figure()
+        self.xdata = None
+        self.ydata = None
+        self.motionID = None
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(frame_interval())
+        self.timer.timeout.connect(self.showReadout)
+        self.loadedContainer = None
+        self._fieldsLoaded.connect(self.showReadout,
+                                   QtCore.Qt.QueuedConnection)
+
+    def connect(self):
+        '''Connect the ValueHover instance.'''
+        self.motionID = self.fig.canvas.mpl_connect(
+            'motion_notify_event', self.onMotion)
+        self.loadFields()
+
+    def loadFields(self):
+        '''Load, in a background thread, the fields of the container
+        shown, if not done yet for it.'''
+        container = self.getContainer()
+        if container is None or container is self.loadedContainer:
+            return
+        self.loadedContainer = container
+        thread = threading.Thread(target=self._loadFields,
+                                  args=(container,))
+        thread.daemon = True
+        thread.start()
+
+    def _loadFields(self, container):
+        '''Load all fields of container, called in the worker thread.'''
+        from ..core.io import load_all_fields
+        try:
+            load_all_fields(container)
+        except:
+            print(traceback.format_exc(), file=log.error)
+        self._fieldsLoaded.emit()
+
+    def onMotion(self, event):
+        '''Keep the cursor position and schedule the read-out.'''
+        if event.inaxes is not self.ax or event.button is not None:
+            return
+        self.xdata = event.xdata
+        self.ydata = event.ydata
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def showReadout(self):
+        '''Show the values at the last cursor position.'''
+        if self.motionID is None:
+            return
+        # the display may show a new file
+        self.loadFields()
+        if self.xdata is None or self.ydata is None:
+            return
+        try:
+            msg = self.getReadout(self.xdata, self.ydata)
+        except:
+            print(traceback.format_exc(), file=log.debug)
+            return
+        if msg:
+            self.statusbar.showMessage(msg)
+
+    def disconnect(self):
+        '''Disconnect the ValueHover instance.'''
+        self.timer.stop()
+        if self.motionID is not None:
+            self.fig.canvas.mpl_disconnect(self.motionID)
+            self.motionID = None
+
 ##########################
 # Zoom/Pan Class Methods #
 ##########################
@@ -202,10 +312,16 @@ class ZoomPan(QtWidgets.QMainWindow):
     Class for Zoom and Pan of display.
     Activated through mouse drags and wheel movements.
 
+    While dragging or scrolling, the plot is not drawn again: an image of
+    the axes content, rendered once at a larger extent, is translated and
+    scaled over a cached background, at most once per screen refresh.
+    Vlimits is changed, and the display drawn at full quality, when the
+    drag is released or the scrolling stops.
+
     Modified an original answer found here:
 http://stackoverflow.com/questions/11551049/matplotlib-plot-zooming-with-scroll-wheel
     '''
-    def __init__(self, Vlimits, ax, base_scale=2.,
+    def __init__(self, Vlimits, ax, base_scale=2., margin=0.5,
                  name="ZoomPan", parent=None):
         '''
         Initialize the class to create the interface.
@@ -220,6 +336,9 @@ http://stackoverflow.com/questions/11551049/matplotlib-plot-zooming-with-scroll-
         [Optional]
         base_scale - float
             Scaling factor to use fo Zoom/Pan
+        margin - float
+            Extent of the cached image beyond the view on each side, as a
+            fraction of the view size.
         name - string
             Field Radiobutton window name.
         parent - PyQt instance
@@ -256,8 +375,22 @@ http://stackoverflow.com/questions/11551049/matplotlib-plot-zooming-with-scroll-
         # self.connect()
         self.ax = ax
         self.base_scale = base_scale
+        self.margin = margin
         self.fig = ax.get_figure()  # get the figure of interest
 
+        # preview state: image of the axes content and background
+        self.preview = None
+        self.pendingLimits = None
+        self.frameTimer = QtCore.QTimer(self)
+        self.frameTimer.setSingleShot(True)
+        self.frameTimer.setInterval(frame_interval())
+        self.frameTimer.timeout.connect(self._drawFrame)
+        # scrolling is committed once the wheel stops
+        self.commitTimer = QtCore.QTimer(self)
+        self.commitTimer.setSingleShot(True)
+        self.commitTimer.setInterval(300)
+        self.commitTimer.timeout.connect(self._commit)
+
     def connect(self):
         '''Connect the ZoomPan instance.'''
         self.scrollID = self.fig.canvas.mpl_connect(
@@ -271,14 +404,20 @@ http://stackoverflow.com/questions/11551049/matplotlib-plot-zooming-with-scroll-
 
     def onZoom(self, event):
         '''Recalculate limits when zoomed.'''
-        cur_xlim = self.ax.get_xlim()
-        cur_ylim = self.ax.get_ylim()
-
-        xdata = event.xdata  # get event x location
-        ydata = event.ydata  # get event y location
-
-        if (xdata is None) or (ydata is None):
+        if event.inaxes != self.ax:
             return
+        if self.pendingLimits is not None:
+            cur_xlim, cur_ylim = self.pendingLimits
+        else:
+            cur_xlim = self.ax.get_xlim()
+            cur_ylim = self.ax.get_ylim()
+
+        # event location, from pixels as the view may not be drawn yet
+        bbox = self.ax.bbox
+        xdata = cur_xlim[0] + ((event.x - bbox.x0) / bbox.width *
+                               (cur_xlim[1] - cur_xlim[0]))
+        ydata = cur_ylim[0] + ((event.y - bbox.y0) / bbox.height *
+                               (cur_ylim[1] - cur_ylim[0]))
 
         if event.button == 'down':
             # deal with zoom in
@@ -297,43 +436,137 @@ http://stackoverflow.com/questions/11551049/matplotlib-plot-zooming-with-scroll-
         relx = (cur_xlim[1] - xdata)/(cur_xlim[1] - cur_xlim[0])
         rely = (cur_ylim[1] - ydata)/(cur_ylim[1] - cur_ylim[0])
 
-        # Record the new limits and pass them to main window
-        self.Vlimits.value['xmin'] = xdata - new_width * (1-relx)
-        self.Vlimits.value['xmax'] = xdata + new_width * (relx)
-        self.Vlimits.value['ymin'] = ydata - new_height * (1-rely)
-        self.Vlimits.value['ymax'] = ydata + new_height * (rely)
-        self.Vlimits.update()
+        xlim = (xdata - new_width * (1-relx), xdata + new_width * (relx))
+        ylim = (ydata - new_height * (1-rely), ydata + new_height * (rely))
+        self._preview(xlim, ylim)
+        self.commitTimer.start()
 
     def onPress(self, event):
         '''Get the current event parameters.'''
         if event.inaxes != self.ax:
             return
+        if self.commitTimer.isActive():
+            self._commit()
         self.cur_xlim = self.ax.get_xlim()
         self.cur_ylim = self.ax.get_ylim()
-        self.press = self.x0, self.y0, event.xdata, event.ydata
+        self.press = self.x0, self.y0, event.x, event.y
         self.x0, self.y0, self.xpress, self.ypress = self.press
 
     def onRelease(self, event):
+        if self.press is None:
+            return
         self.press = None
-        self.ax.figure.canvas.draw()
+        self._commit()
 
     def onMotion(self, event):
-        '''Redraw the plot when panned.'''
+        '''Move the preview of the plot when panned.'''
         if self.press is None:
             return
-        if event.inaxes != self.ax:
+        # shift from pixels, independent of the view drawn so far
+        bbox = self.ax.bbox
+        dx = ((event.x - self.xpress) / bbox.width *
+              (self.cur_xlim[1] - self.cur_xlim[0]))
+        dy = ((event.y - self.ypress) / bbox.height *
+              (self.cur_ylim[1] - self.cur_ylim[0]))
+        self._preview((self.cur_xlim[0] - dx, self.cur_xlim[1] - dx),
+                      (self.cur_ylim[0] - dy, self.cur_ylim[1] - dy))
+
+    def _preview(self, xlim, ylim):
+        '''Schedule the preview of limits, for the next frame.'''
+        self.pendingLimits = (xlim, ylim)
+        if not self.frameTimer.isActive():
+            self.frameTimer.start()
+
+    def _startPreview(self):
+        '''Render the axes content at a larger extent and the figure
+        background without it.'''
+        canvas = self.fig.canvas
+        ax = self.ax
+        xlim = ax.get_xlim()
+        ylim = ax.get_ylim()
+        scale = 1. + 2. * self.margin
+        xc = (xlim[0] + xlim[1]) / 2.
+        yc = (ylim[0] + ylim[1]) / 2.
+        ax.set_xlim(xc - (xc - xlim[0]) * scale, xc + (xlim[1] - xc) * scale)
+        ax.set_ylim(yc - (yc - ylim[0]) * scale, yc + (ylim[1] - yc) * scale)
+        # titles are outside the axes, leave them in the background
+        skip = [ax.patch, ax.title, getattr(ax, '_left_title', None),
+                getattr(ax, '_right_title', None)]
+        hidden = [child for child in ax.get_children()
+                  if not any(child is other for other in skip) and
+                  child.get_visible()]
+        try:
+            canvas.draw()
+            extent = ax.get_xlim() + ax.get_ylim()
+            buf = np.asarray(canvas.buffer_rgba())
+            height = buf.shape[0]
+            bbox = ax.bbox
+            data = buf[int(round(height - bbox.y1)):
+                       int(round(height - bbox.y0)),
+                       int(round(bbox.x0)):int(round(bbox.x1))].copy()
+            ax.set_xlim(xlim)
+            ax.set_ylim(ylim)
+            for child in hidden:
+                child.set_visible(False)
+            canvas.draw()
+            background = canvas.copy_from_bbox(self.fig.bbox)
+        finally:
+            ax.set_xlim(xlim)
+            ax.set_ylim(ylim)
+            for child in hidden:
+                child.set_visible(True)
+
+        image = AxesImage(ax, origin='upper', interpolation='bilinear')
+        image.set_figure(self.fig)
+        image.set_data(data)
+        image.set_extent(extent)
+        image.set_clip_box(ax.bbox)
+        artists = [image, ax.xaxis, ax.yaxis] + list(ax.spines.values())
+        self.preview = (background, artists)
+
+    def _drawFrame(self):
+        '''Draw the pending limits preview.'''
+        if self.pendingLimits is None:
+            return
+        if self.preview is None:
+            try:
+                self._startPreview()
+            except:
+                # canvas can not blit, change limits at every frame
+                self.preview = False
+        xlim, ylim = self.pendingLimits
+        if self.preview is False:
+            self._setLimits(xlim, ylim)
+            return
+        canvas = self.fig.canvas
+        background, artists = self.preview
+        self.ax.set_xlim(xlim)
+        self.ax.set_ylim(ylim)
+        canvas.restore_region(background)
+        renderer = canvas.get_renderer()
+        for artist in artists:
+            artist.draw(renderer)
+        canvas.blit(self.fig.bbox)
+
+    def _commit(self):
+        '''Drop the preview and pass the limits to Vlimits, drawing
+        displays at full quality.'''
+        self.frameTimer.stop()
+        self.commitTimer.stop()
+        if self.pendingLimits is None:
+            self.preview = None
+            self.ax.figure.canvas.draw()
             return
-        dx = event.xdata - self.xpress
-        dy = event.ydata - self.ypress
-        self.cur_xlim -= dx
-        self.cur_ylim -= dy
+        xlim, ylim = self.pendingLimits
+        self.pendingLimits = None
+        self.preview = None
+        self._setLimits(xlim, ylim)
 
+    def _setLimits(self, xlim, ylim):
         # Record the new limits and pass them to main window
         limits = self.Vlimits.value
-        limits['xmin'], limits['xmax'] = \
-            self.cur_xlim[0], self.cur_xlim[1]
-        limits['ymin'], limits['ymax'] = \
-            self.cur_ylim[0], self.cur_ylim[1]
+        limits['xmin'], limits['xmax'] = xlim[0], xlim[1]
+        limits['ymin'], limits['ymax'] = ylim[0], ylim[1]
         self.Vlimits.change(limits)
 
     def disconnect(self):
@@ -342,6 +575,9 @@ http://stackoverflow.com/questions/11551049/matplotlib-plot-zooming-with-scroll-
         self.fig.canvas.mpl_disconnect(self.pressID)
         self.fig.canvas.mpl_disconnect(self.releaseID)
         self.fig.canvas.mpl_disconnect(self.motionID)
+        if self.pendingLimits is not None:
+            self._commit()
+        self.preview = None
 
 ##################################
 # Another Tool Method #
@@ -352,6 +588,38 @@ http://stackoverflow.com/questions/11551049/matplotlib-plot-zooming-with-scroll-
 #                     Auxiliary Functions              ###
 ##########################################################
 
+def field_values_message(fields, index):
+    '''
+    Return text with the value of all fields at index.
+
+    Parameters
+    ----------
+    fields : dict
+        Fields dictionary of a radar or grid.
+    index : tuple
+        Index of the point in the field data.
+
+    Notes
+    -----
+    Fields whose data is not loaded are shown as not loaded, so the
+    read-out does not read files, see :py:class:`ValueHover`.
+    '''
+    from ..core.io import field_is_loaded
+    msg = []
+    for name in sorted(fields.keys()):
+        field = fields[name]
+        if not field_is_loaded(field):
+            msg.append('%s = not loaded' % name)
+            continue
+        value = field['data'][index]
+        if value is np.ma.masked:
+            msg.append('%s = --' % name)
+        else:
+            msg.append(('%s = %4.2f %s' % (
+                name, value, field.get('units', ''))).rstrip())
+    return ',  '.join(msg)
+
+
 # XXX deprecated in favor of pyart:RadarDisplay._get_x_y_z()
 def interior_radar(path, radar, tilt):
     '''
@@ -378,23 +646,22 @@ def interior_radar(path, radar, tilt):
     r = radar.range['data'] / 1000.
     ngates = r.size
     nrays = az.size
-    xys = np.empty(shape=(nrays*ngates, 2))
     r, az = np.meshgrid(r, az)
     # XXX Disconsidering elevation and Projetion
     # XXX should use pyart.io.common.radar_coords_to_cart
     # XXX but this is not public (not in user manual or Radar)
     x = r*np.sin(az * np.pi / 180.)
     y = r*np.cos(az * np.pi / 180.)
-    xys[:, 0] = x.flatten()
-    xys[:, 1] = y.flatten()
-    # XXX in new versions (1.3) of mpl there is contains_pointS function
-    ind = np.nonzero([path.contains_point(xy) for xy in xys])[0]
+    ind = interior_polar(path, x, y)
 
-    rayIndex = radar.sweep_start_ray_index['data'][tilt] + ind / ngates
+    xys = np.empty(shape=(ind.size, 2))
+    xys[:, 0] = x.ravel()[ind]
+    xys[:, 1] = y.ravel()[ind]
+    rayIndex = radar.sweep_start_ray_index['data'][tilt] + ind // ngates
     gateIndex = ind % ngates
     index = np.concatenate((rayIndex[np.newaxis],
                             gateIndex[np.newaxis]), axis=0)
-    return (xys[ind], index.transpose().astype(np.int))
+    return (xys, index.transpose().astype(int))
 
 
 def interior_grid(path, grid, basemap, level, plot_type):
@@ -420,36 +687,37 @@ def interior_grid(path, grid, basemap, level, plot_type):
         coordinate for every bin inside path
     '''
     if plot_type == "gridZ":
-        x, y = np.meshgrid(grid.axes['x_disp']['data'],
-                           grid.axes['y_disp']['data'])
-        ny = len(grid.axes['y_disp']['data'])
-        if basemap is not None:
-            from mpl_toolkits.basemap import pyproj
-            proj = pyproj.Proj(proj='aeqd', datum='NAD83',
-                               lat_0=grid.axes['lat']['data'][0],
-                               lon_0=grid.axes['lon']['data'][0])
-            lat, lon = proj(x, y, inverse=True)
-            x, y = basemap(lat, lon)
+        xs = grid.axes['x_disp']['data']
+        ys = grid.axes['y_disp']['data']
     elif plot_type == "gridY":
-        x, y = np.meshgrid(grid.axes['x_disp']['data'] / 1000.,
-                           grid.axes['z_disp']['data'] / 1000.)
-        ny = len(grid.axes['z_disp']['data'])
+        xs = grid.axes['x_disp']['data'] / 1000.
+        ys = grid.axes['z_disp']['data'] / 1000.
     elif plot_type == "gridX":
-        x, y = np.meshgrid(grid.axes['y_disp']['data'] / 1000.,
-                           grid.axes['z_disp']['data'] / 1000.)
-        ny = len(grid.axes['z_disp']['data'])
-
-    xys = np.empty(shape=(x.size, 2))
-    xys[:, 0] = x.flatten()
-    xys[:, 1] = y.flatten()
-    # XXX in new versions (1.3) of mpl there is contains_pointS function
-    ind = np.nonzero([path.contains_point(xy) for xy in xys])[0]
-
-    x_index = ind / ny
-    y_index = ind % ny
+        xs = grid.axes['y_disp']['data'] / 1000.
+        ys = grid.axes['z_disp']['data'] / 1000.
+    nx = len(xs)
+    x, y = np.meshgrid(xs, ys)
+
+    if plot_type == "gridZ" and basemap is not None:
+        from mpl_toolkits.basemap import pyproj
+        proj = pyproj.Proj(proj='aeqd', datum='NAD83',
+                           lat_0=grid.axes['lat']['data'][0],
+                           lon_0=grid.axes['lon']['data'][0])
+        lat, lon = proj(x, y, inverse=True)
+        x, y = basemap(lat, lon)
+        ind = interior_points(path, x, y)
+    else:
+        ind = interior_rectilinear(path, xs, ys)
+
+    xys = np.empty(shape=(ind.size, 2))
+    xys[:, 0] = np.ravel(x)[ind]
+    xys[:, 1] = np.ravel(y)[ind]
+    # x, y are (len(ys), len(xs))
+    x_index = ind % nx
+    y_index = ind // nx
     index = np.concatenate((x_index[np.newaxis],
                             y_index[np.newaxis]), axis=0)
-    return (xys[ind], index.transpose().astype(np.int))
+    return (xys, index.transpose().astype(int))
 
 
 def nearest_point_grid(grid, basemap, zvalue, yvalue, xvalue):
@@ -498,4 +766,4 @@ def nearest_point_grid(grid, basemap, zvalue, yvalue, xvalue):
     index = np.concatenate((z_index[np.newaxis],
                             y_index[np.newaxis],
                             x_index[np.newaxis],), axis=0)
-    return index.transpose().astype(np.int)
+    return index.transpose().astype(int)
@@ -13,6 +13,17 @@ ARTview is based in the abstract Component class and shared Variables.
 
     ~core.Variable
     ~core.Component
+    ~core.deferUpdates
+    ~io.read_container
+    ~io.sniff_format
+    ~prefetch.Prefetcher
+    ~cache.ContainerCache
+    ~loader.AsyncLoader
+    ~writer.WriteQueue
+    ~index.FileIndex
+    ~watcher.DirectoryWatcher
+    ~lazy.LazyField
+    ~sweep_cache.MmapCache
     ~PyQt4.QtCore
     ~PyQt4.QtGui
 
@@ -20,5 +31,14 @@ ARTview is based in the abstract Component class and shared Variables.
 
 from . import common
 from .core import Variable, componentsList, Component, QtWidgets, QtCore, QtGui
-from .core import log
+from .core import log, deferUpdates
+from .io import read_container, sniff_format
+from .prefetch import Prefetcher
+from .cache import ContainerCache, container_cache, open_container
+from .loader import AsyncLoader, async_loader
+from .writer import WriteQueue, write_queue
+from .index import FileIndex, get_file_index
+from .watcher import DirectoryWatcher
+from .lazy import LazyField, release_fields
+from .sweep_cache import MmapCache, mmap_cache
 from .variable_choose import VariableChoose
@@ -0,0 +1,221 @@
+"""
+cache.py
+
+Cache of opened Radar and Grid containers, shared by all components.
+"""
+from __future__ import print_function
+# Load the needed packages
+import os
+import threading
+from collections import OrderedDict
+
+from .core import log
+from .io import container_nbytes
+from .sweep_cache import read_cached
+
+
+class ContainerCache(object):
+    '''
+    Least recently used cache of containers read from files.
+
+    Entries are keyed by path and validated against the file modification
+    time and size, so a file rewritten on disk is read again. The cache is
+    bounded by the bytes of loaded field data, not by number of entries.
+    Containers with the attribute ``changed`` set (edited by ManualEdit,
+    ManualUnfold, ...) are pinned: they are not evicted and only handed
+    to the component that opened them, the owner, other components get a
+    fresh read. Pinned entries are dropped by :py:meth:`unpin` when the
+    container is saved, :py:meth:`release` when the owner is closed, or
+    :py:meth:`remove`.
+    '''
+
+    def __init__(self, max_bytes=1024 * 2**20):
+        '''
+        Initialize the class.
+
+        Parameters
+        ----------
+        [Optional]
+        max_bytes : int
+            Maximum bytes of loaded field data kept by the cache.
+        '''
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # path: (key, container, owner)
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _key(filename):
+        '''Return (path, mtime, size) of filename or None.'''
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return None
+        return (os.path.abspath(filename), stat.st_mtime, stat.st_size)
+
+    @staticmethod
+    def _pinned(container):
+        return bool(getattr(container, 'changed', False))
+
+    def __contains__(self, filename):
+        path = os.path.abspath(filename)
+        with self._lock:
+            return (path in self._entries and
+                    self._entries[path][0] == self._key(filename))
+
+    def _foreign(self, path, owner):
+        '''Test if the entry of path is pinned by another owner.'''
+        key, container, entry_owner = self._entries[path]
+        return self._pinned(container) and entry_owner is not owner
+
+    def get(self, filename, owner=None):
+        '''
+        Return the cached container for filename or None.
+
+        Parameters
+        ----------
+        filename : string
+            Path of the file.
+        [Optional]
+        owner : object
+            Component asking, pinned containers of other owners are not
+            returned.
+        '''
+        path = os.path.abspath(filename)
+        key = self._key(filename)
+        with self._lock:
+            if (path in self._entries and self._entries[path][0] == key and
+                    not self._foreign(path, owner)):
+                self._entries[path] = self._entries.pop(path)
+                self.hits += 1
+                print("Cache hit %s" % filename, file=log.debug)
+                return self._entries[path][1]
+            self.misses += 1
+            return None
+
+    def put(self, filename, container, owner=None):
+        '''Add container read from filename to the cache, for owner.
+        Entries pinned by other owners are not replaced.'''
+        key = self._key(filename)
+        if key is None:
+            return
+        with self._lock:
+            if key[0] in self._entries and self._foreign(key[0], owner):
+                return
+            self._entries.pop(key[0], None)
+            self._entries[key[0]] = (key, container, owner)
+            self.shrink()
+
+    def remove(self, filename):
+        '''Remove filename from the cache, even if pinned.'''
+        with self._lock:
+            self._entries.pop(os.path.abspath(filename), None)
+
+    def unpin(self, container):
+        '''Remove the entries holding container, e.g. once its changes are
+        saved.'''
+        with self._lock:
+            for path, entry in list(self._entries.items()):
+                if entry[1] is container:
+                    del self._entries[path]
+
+    def release(self, owner):
+        '''Remove the entries pinned by owner and forget it in the others,
+        e.g. when owner is closed.'''
+        with self._lock:
+            for path, (key, container, entry_owner) in list(
+                    self._entries.items()):
+                if entry_owner is not owner:
+                    continue
+                if self._pinned(container):
+                    del self._entries[path]
+                else:
+                    self._entries[path] = (key, container, None)
+
+    def clear(self):
+        '''Remove all entries, even if pinned.'''
+        with self._lock:
+            self._entries.clear()
+
+    def nbytes(self):
+        '''Return the bytes of loaded field data held by the cache.'''
+        with self._lock:
+            return sum(container_nbytes(entry[1]) for entry in
+                       self._entries.values())
+
+    def shrink(self):
+        '''Evict least recently used, unpinned entries until the cache
+        fits in max_bytes. Fields loaded after the container was cached
+        are accounted for.'''
+        with self._lock:
+            sizes = OrderedDict(
+                (path, container_nbytes(entry[1])) for path, entry
+                in self._entries.items())
+            used = sum(sizes.values())
+            # never evict the most recent entry, it is probably on display
+            for path in list(sizes.keys())[:-1]:
+                if used <= self.max_bytes:
+                    break
+                if self._pinned(self._entries[path][1]):
+                    continue
+                del self._entries[path]
+                used -= sizes[path]
+                print("Cache evicted %s" % path, file=log.debug)
+            if used > self.max_bytes:
+                print("Container cache over budget: %.1f MB in use" %
+                      (used / 2.**20), file=log.debug)
+
+    def stats(self):
+        '''Return a string with the cache statistics.'''
+        with self._lock:
+            pinned = sum(1 for entry in self._entries.values()
+                         if self._pinned(entry[1]))
+            return ("Cache hits: %d, misses: %d, %d files held "
+                    "(%d pinned), %.1f MB" %
+                    (self.hits, self.misses, len(self._entries), pinned,
+                     self.nbytes() / 2.**20))
+
+
+#: Cache shared by all ARTview components
+container_cache = ContainerCache()
+
+
+def open_container(filename, modes=("radar", "grid"), prefetcher=None,
+                   progress=None, is_cancelled=None, owner=None):
+    '''
+    Return container for filename, from the shared cache if possible,
+    else from the prefetcher or the mmap cache.
+
+    Parameters
+    ----------
+    filename : string
+        Path of the file to open.
+    [Optional]
+    modes : list of strings
+        Containers to accept, see
+        :py:func:`~artview.core.io.read_container`.
+    prefetcher : :py:class:`~artview.core.prefetch.Prefetcher` or None
+        Prefetcher to ask before reading the file.
+    progress, is_cancelled : callable or None
+        See :py:func:`~artview.core.io.read_container`.
+    owner : object
+        Component opening the file, see :py:class:`ContainerCache`.
+
+    Returns
+    -------
+    container : :py:class:`pyart.core.Radar`, :py:class:`pyart.core.Grid`
+        or None
+        None if no reader recognized the file.
+    '''
+    container = container_cache.get(filename, owner)
+    if (container is not None and
+            type(container).__name__.lower() not in modes):
+        container = None
+    if container is None and prefetcher is not None:
+        container = prefetcher.get(filename)
+    if container is None:
+        container = read_cached(filename, modes, progress, is_cancelled)
+    if container is not None:
+        container_cache.put(filename, container, owner)
+    return container
@@ -225,6 +225,33 @@ def string_dialog_with_reset(stringIn, title, msg, reset=None):
 
     return stringOut, entry
 
+def SavePipelineStep(step):
+    '''
+    Ask for a batch pipeline file and append step to it.
+
+    Parameters::
+    ----------
+    step - dict
+        Pipeline step, see :py:mod:`artview.batch`.
+    '''
+    from ..batch import add_pipeline_step
+    filename = QtWidgets.QFileDialog.getSaveFileName(
+        None, 'Add to Batch Pipeline', os.getcwd(), 'JSON (*.json)',
+        options=QtWidgets.QFileDialog.DontConfirmOverwrite)
+    if isinstance(filename, tuple): # PyQt5
+        filename = filename[0]
+    filename = str(filename)
+    if filename == '':
+        return
+    try:
+        pipeline = add_pipeline_step(filename, step)
+    except:
+        import traceback
+        ShowLongText("Failed saving pipeline\n\n" + traceback.format_exc())
+        return
+    print("Added %s step to %s (%d steps)" %
+          (step['step'], filename, len(pipeline['steps'])), file=log.info)
+
 ##################
 # Option methods #
 ##################
@@ -13,6 +13,8 @@ try:
 except:
     from PyQt5 import QtWidgets, QtCore, QtGui
 import sys
+import contextlib
+from collections import OrderedDict
 
 # lets add some magic for the documentation
 QtCore.__doc__ = ("Qt backend to be used all over ARTview")
@@ -134,9 +136,13 @@ class Variable(QtCore.QObject):
         Notes
         -----
         The arguments of the emitted signal are (self, value, strong).
+        Inside :py:func:`deferUpdates` the signal is emitted on leaving it.
         '''
         self.value = value
-        self.valueChanged.emit(self, strong)
+        if update_queue.depth > 0:
+            update_queue.add(self, strong)
+        else:
+            self.valueChanged.emit(self, strong)
 
     def update(self, strong=True):
         '''
@@ -148,7 +154,95 @@ class Variable(QtCore.QObject):
         strong : bool, optional
             Define if this is a strong or weak change.
         '''
-        self.valueChanged.emit(self, strong)
+        if update_queue.depth > 0:
+            update_queue.add(self, strong)
+        else:
+            self.valueChanged.emit(self, strong)
+
+    def changeLater(self, value, strong=True):
+        '''
+        Change the Variable value now, but emit 'ValueChanged' signal when
+        control returns to the Qt event loop.
+
+        Changes made before that are merged: the signal is emitted once,
+        with the last value, and strong if any of the changes was.
+
+        Parameters
+        ----------
+        value :
+            New Value to be assigned to the variable.
+        [Optional]
+        strong : bool, optional
+            Define if this is a strong or weak change.
+        '''
+        self.value = value
+        update_queue.add(self, strong)
+        update_queue.flushLater()
+
+
+class UpdateQueue(QtCore.QObject):
+    '''
+    Hold back 'ValueChanged' signals of Variables and emit them later,
+    once per Variable. See :py:func:`deferUpdates` and
+    :py:func:`Variable.changeLater`.
+    '''
+
+    def __init__(self):
+        super(UpdateQueue, self).__init__()
+        self.depth = 0
+        self.pending = OrderedDict()
+        self.timer = None
+
+    def add(self, variable, strong):
+        '''Queue signal of variable, merging with one already queued.'''
+        self.pending[variable] = self.pending.get(variable, False) or strong
+
+    def flushLater(self):
+        '''Flush when control returns to the event loop.'''
+        if self.timer is None:
+            self.timer = QtCore.QTimer(self)
+            self.timer.setSingleShot(True)
+            self.timer.setInterval(0)
+            self.timer.timeout.connect(self.flush)
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def flush(self):
+        '''Emit queued signals, in the order variables were first changed.
+        Changes made by the slots are queued and emitted in turn.'''
+        self.depth += 1
+        try:
+            while self.pending:
+                variable, strong = self.pending.popitem(last=False)
+                variable.valueChanged.emit(variable, strong)
+        finally:
+            self.depth -= 1
+
+update_queue = UpdateQueue()
+
+
+@contextlib.contextmanager
+def deferUpdates():
+    '''
+    Context in which changes of Variables do not emit 'ValueChanged'
+    signals right away.
+
+    Values are changed at once, signals are emitted on leaving the
+    outermost context, once per Variable, with its final value and strong
+    if any of the changes was. Use it when several changes are made in a
+    row, so slots do not update displays for intermediate values::
+
+        with deferUpdates():
+            Vcolormap.change(cmap)
+            Vlimits.change(limits)
+    '''
+    update_queue.depth += 1
+    try:
+        yield
+    finally:
+        update_queue.depth -= 1
+        if update_queue.depth == 0:
+            update_queue.flush()
 
 
 class ComponentsList(QtCore.QObject):
@@ -0,0 +1,271 @@
+"""
+index.py
+
+Persistent index of radar and grid file metadata, to sort and filter large
+directories without opening every file.
+"""
+from __future__ import print_function
+# Load the needed packages
+import os
+import sqlite3
+import threading
+import traceback
+
+from .core import QtCore, log
+from .io import read_container
+
+_COLUMNS = ('path', 'mtime', 'size', 'kind', 'scan_time', 'scan_type',
+            'nsweeps', 'fields', 'site')
+
+
+def _cache_dir():
+    '''Return the user cache directory of ARTview.'''
+    base = os.environ.get('XDG_CACHE_HOME',
+                          os.path.join(os.path.expanduser('~'), '.cache'))
+    return os.path.join(base, 'artview')
+
+
+def container_metadata(container):
+    '''
+    Extract the indexed metadata of a Radar or Grid.
+
+    Returns
+    -------
+    metadata : dict
+        Keys 'kind', 'scan_time' (ISO string), 'scan_type', 'nsweeps',
+        'fields' (list) and 'site'.
+    '''
+    import pyart
+    if isinstance(container, pyart.core.Grid):
+        kind = 'grid'
+        scan_type = 'grid'
+        nsweeps = int(container.nz)
+        get_datetime = pyart.util.datetime_from_grid
+    else:
+        kind = 'radar'
+        scan_type = str(container.scan_type)
+        nsweeps = int(container.nsweeps)
+        get_datetime = pyart.util.datetime_from_radar
+    try:
+        scan_time = get_datetime(container).isoformat()
+    except:
+        scan_time = None
+    site = container.metadata.get(
+        'instrument_name', container.metadata.get('radar_name', ''))
+    if isinstance(site, bytes):
+        site = site.decode('utf-8', 'replace')
+    return {'kind': kind,
+            'scan_time': scan_time,
+            'scan_type': scan_type,
+            'nsweeps': nsweeps,
+            'fields': sorted(container.fields.keys()),
+            'site': str(site)}
+
+
+class FileIndex(QtCore.QObject):
+    '''
+    SQLite index of file metadata, stored in the user cache directory.
+
+    Entries are validated with the file fingerprint (modification time and
+    size). Directories are indexed incrementally by a background thread,
+    emitting 'DirectoryIndexed' when done. Only file metadata is read, with
+    the I/O lock held for one file at a time, so indexing does not hold
+    back files opened by the user.
+    '''
+
+    directoryIndexed = QtCore.pyqtSignal(str, name='DirectoryIndexed')
+
+    def __init__(self, path=None):
+        '''
+        Initialize the class.
+
+        Parameters
+        ----------
+        [Optional]
+        path : string
+            Database file. If None use index.sqlite in the user
+            cache directory.
+        '''
+        super(FileIndex, self).__init__()
+        if path is None:
+            path = os.path.join(_cache_dir(), 'index.sqlite')
+        directory = os.path.dirname(path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        self.path = path
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, "
+            "mtime REAL, size INTEGER, kind TEXT, scan_time TEXT, "
+            "scan_type TEXT, nsweeps INTEGER, fields TEXT, site TEXT)")
+        self._connection.commit()
+        self._jobs = []
+        self._thread = None
+
+    @staticmethod
+    def _fingerprint(filename):
+        stat = os.stat(filename)
+        return stat.st_mtime, stat.st_size
+
+    def lookup(self, filename):
+        '''Return the metadata dict of filename, None if not indexed or
+        out of date.'''
+        path = os.path.abspath(filename)
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT %s FROM files WHERE path=?" % ", ".join(_COLUMNS),
+                (path,)).fetchone()
+        if row is None:
+            return None
+        entry = dict(zip(_COLUMNS, row))
+        try:
+            if (entry['mtime'], entry['size']) != self._fingerprint(path):
+                return None
+        except OSError:
+            return None
+        entry['fields'] = entry['fields'].split(',') if entry['fields'] \
+            else []
+        return entry
+
+    def add(self, filename, container=None):
+        '''
+        Index filename, reading its metadata if container is not given.
+
+        Returns the metadata dict, None if the file can not be read.
+        Unreadable files are indexed with kind 'unknown', so they are not
+        read again.
+        '''
+        path = os.path.abspath(filename)
+        try:
+            mtime, size = self._fingerprint(path)
+        except OSError:
+            return None
+        if container is None:
+            container = read_container(path, delay_only=True)
+        if container is None:
+            entry = {'kind': 'unknown', 'scan_time': None, 'scan_type': None,
+                     'nsweeps': 0, 'fields': [], 'site': ''}
+        else:
+            entry = container_metadata(container)
+        entry.update({'path': path, 'mtime': mtime, 'size': size})
+        values = [entry[column] for column in _COLUMNS]
+        values[_COLUMNS.index('fields')] = ",".join(entry['fields'])
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO files VALUES (%s)" %
+                ", ".join("?" * len(_COLUMNS)), values)
+            self._connection.commit()
+        if container is None:
+            return None
+        return entry
+
+    def get(self, filename):
+        '''Return metadata of filename, indexing it if needed. None if the
+        file can not be read.'''
+        entry = self.lookup(filename)
+        if entry is None:
+            entry = self.add(filename)
+        if entry is None or entry['kind'] == 'unknown':
+            return None
+        return entry
+
+    def index(self, filelist):
+        '''Index, in a background thread, the files of filelist not
+        yet indexed. 'DirectoryIndexed' is emitted with the directory of
+        the first file when done, if any file was added.'''
+        if not filelist:
+            return
+        with self._lock:
+            self._jobs.append(list(filelist))
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run)
+            self._thread.daemon = True
+            self._thread.start()
+
+    def _run(self):
+        '''Worker loop, index the queued file lists.'''
+        while True:
+            with self._lock:
+                if not self._jobs:
+                    self._thread = None
+                    return
+                filelist = self._jobs.pop(0)
+            added = 0
+            for filename in filelist:
+                if self.lookup(filename) is not None:
+                    continue
+                try:
+                    if self.add(filename) is not None:
+                        added += 1
+                except:
+                    print(traceback.format_exc(), file=log.error)
+            if added:
+                print("Indexed %d files" % added, file=log.debug)
+                self.directoryIndexed.emit(os.path.dirname(filelist[0]))
+
+    def query(self, filelist, sort=None, field=None, scan_type=None):
+        '''
+        Sort and filter a file list using the indexed metadata.
+
+        Parameters
+        ----------
+        filelist : list of strings
+            Files to sort and filter.
+        [Optional]
+        sort : None, 'name', 'time', 'scan_type', 'site' or 'nsweeps'
+            Sorting key, files not indexed go last, sorted by name.
+        field : string or None
+            Keep only files containing this field.
+        scan_type : string or None
+            Keep only files of this scan type.
+
+        Returns
+        -------
+        filelist : list of strings
+        '''
+        entries = [(filename, self.lookup(filename)) for filename in filelist]
+        if field:
+            entries = [(filename, entry) for filename, entry in entries
+                       if entry is not None and field in entry['fields']]
+        if scan_type:
+            entries = [(filename, entry) for filename, entry in entries
+                       if entry is not None and
+                       entry['scan_type'] == scan_type]
+        column = {'time': 'scan_time'}.get(sort, sort)
+        if column in _COLUMNS:
+            def key(item):
+                filename, entry = item
+                if entry is None or entry[column] is None:
+                    return (1, "", filename)
+                return (0, entry[column], filename)
+            entries.sort(key=key)
+        else:
+            entries.sort(key=lambda item: item[0])
+        return [filename for filename, entry in entries]
+
+    def values(self, filelist, column):
+        '''Return sorted set of the indexed values of column in filelist,
+        for column 'fields' the union of field names.'''
+        values = set()
+        for filename in filelist:
+            entry = self.lookup(filename)
+            if entry is None:
+                continue
+            if column == 'fields':
+                values.update(entry['fields'])
+            elif entry[column] is not None:
+                values.add(entry[column])
+        return sorted(values)
+
+
+_file_index = None
+
+
+def get_file_index():
+    '''Return the FileIndex shared by all components, created on first
+    use.'''
+    global _file_index
+    if _file_index is None:
+        _file_index = FileIndex()
+    return _file_index
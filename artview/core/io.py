@@ -0,0 +1,219 @@
+"""
+io.py
+
+Routines shared by the components that open radar and grid files.
+"""
+from __future__ import print_function
+# Load the needed packages
+import os
+import re
+import threading
+import traceback
+
+from .core import log
+
+try:
+    import netCDF4
+    _NETCDF4_AVAILABLE = True
+except ImportError:
+    _NETCDF4_AVAILABLE = False
+
+# netCDF4/HDF5 builds are often not thread safe, serialize reads done by
+# background workers and by the GUI thread
+_io_lock = threading.RLock()
+
+# magic bytes of formats only Py-ART radar readers understand
+_RADAR_MAGIC = (b'AR2V', b'ARCHIVE2', b'BZh', b'\x1f\x8b', b'UF',
+                b'\x1b\x00', b'\x00\x00\x03\xf8')
+_NETCDF_MAGIC = (b'CDF\x01', b'CDF\x02', b'CDF\x05', b'\x89HDF\r\n\x1a\n')
+_RADAR_FILENAME = re.compile(
+    r'(^cfrad\.)|(^[A-Z]{4}\d{8}_\d{6})|(\.(uf|raw|RAW|sigmet|mdv)$)')
+_GRID_FILENAME = re.compile(r'grid', re.IGNORECASE)
+
+# last container type successfully read in each directory
+_directory_modes = {}
+
+
+def sniff_format(filename):
+    '''
+    Guess the container type of a file without parsing it.
+
+    Checks, in order, the magic bytes, the NetCDF global attributes and
+    variables, and the filename convention.
+
+    Returns
+    -------
+    mode : "radar", "grid" or None
+        None if the type could not be determined.
+    '''
+    try:
+        with open(filename, 'rb') as f:
+            header = f.read(65536)
+    except (IOError, OSError):
+        return None
+
+    if header.startswith(_NETCDF_MAGIC):
+        mode = _sniff_netcdf(filename, header)
+        if mode is not None:
+            return mode
+    elif header.startswith(_RADAR_MAGIC) or header[4:6] == b'UF':
+        return "radar"
+
+    basename = os.path.basename(filename)
+    if _RADAR_FILENAME.search(basename):
+        return "radar"
+    if _GRID_FILENAME.search(basename):
+        return "grid"
+    return None
+
+
+def _sniff_netcdf(filename, header):
+    '''Guess container type of a NetCDF file from its metadata.'''
+    if _NETCDF4_AVAILABLE:
+        try:
+            with _io_lock:
+                dataset = netCDF4.Dataset(filename)
+                try:
+                    conventions = str(getattr(dataset, 'Conventions', ''))
+                    variables = set(dataset.variables.keys())
+                finally:
+                    dataset.close()
+        except:
+            return None
+    else:
+        # the header of NetCDF classic files has all names in it
+        conventions = ''
+        if b'CF/Radial' in header:
+            conventions = 'CF/Radial'
+        variables = set(name for name in ('sweep_number', 'azimuth',
+                                          'origin_latitude', 'point_x')
+                        if name.encode('ascii') in header)
+
+    if 'Radial' in conventions or ('sweep_number' in variables and
+                                   'azimuth' in variables):
+        return "radar"
+    if 'origin_latitude' in variables or 'point_x' in variables:
+        return "grid"
+    return None
+
+
+def read_container(filename, modes=("radar", "grid"), progress=None,
+                   is_cancelled=None, delay_only=False):
+    '''
+    Read a file with Py-ART, trying radar and grid readers in turn.
+
+    Each reader is first called with ``delay_field_loading=True`` and, if
+    that fails, without it. Fields are wrapped so their data can be
+    released and loaded again when accessed, even after the eager read
+    (see :py:func:`~artview.core.lazy.make_lazy`). Readers matching
+    :py:func:`sniff_format`, or else the type last read in the same
+    directory, are tried first.
+    Tracebacks are only logged if all readers fail.
+
+    Parameters
+    ----------
+    filename : string
+        Path of the file to read.
+    [Optional]
+    modes : list of strings
+        Containers to try, "radar" and/or "grid", in this order.
+    progress : callable or None
+        Called with a message before each read attempt.
+    is_cancelled : callable or None
+        Called before each read attempt, if it returns True the remaining
+        attempts are skipped.
+    delay_only : bool
+        If True readers are only called with ``delay_field_loading=True``,
+        so only the metadata is read, e.g. to index the file.
+
+    Returns
+    -------
+    container : :py:class:`pyart.core.Radar`, :py:class:`pyart.core.Grid`
+        or None
+        The container read, with the attribute filename added.
+        None if no reader recognized the file.
+    '''
+    import pyart
+    modes = [mode.lower() for mode in modes]
+    readers = []
+    if "radar" in modes:
+        readers.append(("radar", pyart.io.read))
+    if "grid" in modes:
+        readers.append(("grid", pyart.io.read_grid))
+
+    directory = os.path.dirname(os.path.abspath(filename))
+    guess = sniff_format(filename)
+    if guess is None:
+        guess = _directory_modes.get(directory)
+    readers.sort(key=lambda reader: reader[0] != guess)
+
+    attempts = ({'delay_field_loading': True}, {})
+    if delay_only:
+        attempts = attempts[:1]
+    errors = []
+    for mode, reader in readers:
+        for kwargs in attempts:
+            if is_cancelled is not None and is_cancelled():
+                return None
+            if progress is not None:
+                progress("Reading %s as %s%s" % (
+                    os.path.basename(filename), mode,
+                    " (delayed fields)" if kwargs else ""))
+            try:
+                with _io_lock:
+                    container = reader(filename, **kwargs)
+            except:
+                errors.append(traceback.format_exc())
+                continue
+            from .lazy import make_lazy
+            make_lazy(container, reader, filename)
+            # Add the filename for Display
+            container.filename = filename
+            _directory_modes[directory] = mode
+            return container
+    for error in errors:
+        print(error, file=log.error)
+    return None
+
+
+def load_all_fields(container):
+    '''Force the loading of fields read with delay_field_loading.'''
+    with _io_lock:
+        for field in container.fields.values():
+            field['data']
+
+
+def load_fields(container, fields):
+    '''Force the loading of the fields named in fields, the ones the
+    container does not have are skipped.'''
+    with _io_lock:
+        for name in fields:
+            if name in container.fields:
+                container.fields[name]['data']
+
+
+def field_is_loaded(field):
+    '''Test if the data of a field dictionary is in memory.'''
+    lazyload = getattr(field, '_lazyload', {})
+    return 'data' not in lazyload
+
+
+def field_nbytes(field):
+    '''Return bytes used by a field data, 0 if not loaded.'''
+    import numpy as np
+    if not field_is_loaded(field):
+        return 0
+    data = field['data']
+    nbytes = np.asarray(data).nbytes
+    mask = np.ma.getmask(data)
+    if mask is not np.ma.nomask:
+        nbytes += mask.nbytes
+    return nbytes
+
+
+def container_nbytes(container):
+    '''
+    Return the number of bytes used by the loaded fields of a container.
+    Fields not yet loaded are not counted and not loaded.
+    '''
+    return sum(field_nbytes(field) for field in container.fields.values())
@@ -0,0 +1,215 @@
+"""
+lazy.py
+
+Field dictionaries loading their data on demand and able to release it,
+also for readers that do not support Py-ART's delay_field_loading.
+"""
+from __future__ import print_function
+# Load the needed packages
+try:
+    from collections.abc import MutableMapping
+except ImportError:
+    from collections import MutableMapping
+
+from .core import componentsList, log
+from .io import _io_lock, field_is_loaded, field_nbytes
+
+
+class LazyField(MutableMapping):
+    '''
+    Field dictionary whose keys may be loaded on demand.
+
+    Behaves as :py:class:`pyart.lazydict.LazyLoadDict`: keys registered
+    with :py:meth:`set_lazy` are evaluated on first access. Unlike it, the
+    loader is kept, so :py:meth:`release` can free the memory and the value
+    is loaded again when needed.
+    '''
+
+    def __init__(self, dic):
+        self._dic = dict(dic)
+        self._lazyload = {}
+        self._loaders = {}
+
+    def set_lazy(self, key, func):
+        '''Set key to be loaded by calling func.'''
+        self._dic.pop(key, None)
+        self._lazyload[key] = func
+        self._loaders[key] = func
+
+    def set_loader(self, key, func):
+        '''Keep current value of key, but allow releasing it, func
+        loading it again.'''
+        self._loaders[key] = func
+
+    def release(self, key='data'):
+        '''Free the value of key, if it can be loaded again.'''
+        if key in self._loaders and key in self._dic:
+            del self._dic[key]
+            self._lazyload[key] = self._loaders[key]
+
+    def __getitem__(self, key):
+        if key in self._lazyload:
+            func = self._lazyload[key]
+            value = func()
+            self._lazyload.pop(key, None)
+            self._dic[key] = value
+        return self._dic[key]
+
+    def __setitem__(self, key, value):
+        self._dic[key] = value
+        self._lazyload.pop(key, None)
+        # a value set by hand can not be reloaded from file
+        self._loaders.pop(key, None)
+
+    def __delitem__(self, key):
+        if key in self._lazyload:
+            del self._lazyload[key]
+        else:
+            del self._dic[key]
+        self._loaders.pop(key, None)
+
+    def __contains__(self, key):
+        return key in self._dic or key in self._lazyload
+
+    def __iter__(self):
+        for key in self._dic:
+            yield key
+        for key in self._lazyload:
+            if key not in self._dic:
+                yield key
+
+    def __len__(self):
+        return len(set(self._dic) | set(self._lazyload))
+
+    def __str__(self):
+        return "<LazyField %s, lazy: %s>" % (str(self._dic),
+                                             list(self._lazyload.keys()))
+
+    __repr__ = __str__
+
+    def copy(self):
+        '''Return a copy, lazy keys stay lazy.'''
+        dic = self.__class__(self._dic)
+        dic._lazyload = self._lazyload.copy()
+        dic._loaders = self._loaders.copy()
+        return dic
+
+
+class _FieldLoader(object):
+    '''Read a single field of a file.'''
+
+    def __init__(self, reader, filename, name):
+        self.reader = reader
+        self.filename = filename
+        self.name = name
+
+    def __call__(self):
+        print("Loading field %s from %s" % (self.name, self.filename),
+              file=log.debug)
+        with _io_lock:
+            try:
+                container = self.reader(self.filename,
+                                        include_fields=[self.name])
+            except TypeError:
+                # reader does not support include_fields
+                container = self.reader(self.filename)
+        return container.fields[self.name]['data']
+
+
+class _LockedLoader(object):
+    '''Call a Py-ART field loader holding the I/O lock.'''
+
+    def __init__(self, func):
+        self.func = func
+
+    def __call__(self):
+        with _io_lock:
+            return self.func()
+
+
+def make_lazy(container, reader, filename, release=False):
+    '''
+    Wrap the container fields in :py:class:`LazyField`, so their data can
+    be released with :py:func:`release_fields` and loaded again when
+    accessed.
+
+    Fields read with ``delay_field_loading`` keep their Py-ART loader,
+    called holding the I/O lock, other fields will be read again, field
+    by field, from file.
+
+    Parameters
+    ----------
+    container : Radar or Grid
+        Container read.
+    reader : callable
+        Reader used, it will be called with ``include_fields=[name]`` to
+        read a single field.
+    filename : string
+        File the container was read from.
+    [Optional]
+    release : bool
+        If True free the data now, otherwise keep it until released.
+    '''
+    for name in list(container.fields.keys()):
+        field = container.fields[name]
+        if isinstance(field, LazyField):
+            continue
+        lazyload = getattr(field, '_lazyload', None)
+        if lazyload is not None:
+            # Py-ART LazyLoadDict, keep its loaders without calling them
+            newfield = LazyField(getattr(field, '_dic', {}))
+            for key, func in lazyload.items():
+                newfield.set_lazy(key, _LockedLoader(func))
+            if 'data' not in lazyload:
+                newfield.set_loader(
+                    'data', _FieldLoader(reader, filename, name))
+        else:
+            newfield = LazyField(field)
+            loader = _FieldLoader(reader, filename, name)
+            if release:
+                newfield.set_lazy('data', loader)
+            else:
+                newfield.set_loader('data', loader)
+        container.fields[name] = newfield
+    return container
+
+
+def fields_in_use():
+    '''Return set of field names in the Vfield of open components.'''
+    fields = set()
+    for component in componentsList:
+        Vfield = getattr(component, 'Vfield', None)
+        if Vfield is not None and Vfield.value is not None:
+            fields.add(Vfield.value)
+    return fields
+
+
+def release_fields(container, keep=None):
+    '''
+    Free the data of container fields, except the ones in keep, that can
+    be loaded again from file. If keep is None, fields shown by
+    components are kept, see :py:func:`fields_in_use`. Nothing is
+    released from containers with the attribute changed set, since their
+    edits would be lost.
+
+    Returns
+    -------
+    nbytes : int
+        Bytes released.
+    '''
+    nbytes = 0
+    if getattr(container, 'changed', False):
+        return nbytes
+    if keep is None:
+        keep = fields_in_use()
+    for name, field in container.fields.items():
+        if name in keep or not isinstance(field, LazyField):
+            continue
+        if field_is_loaded(field):
+            nbytes += field_nbytes(field)
+            field.release('data')
+    if nbytes:
+        print("Released %.1f MB of field data" % (nbytes / 2.**20),
+              file=log.debug)
+    return nbytes
+
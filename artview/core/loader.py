@@ -0,0 +1,178 @@
+"""
+loader.py
+
+Service opening files out of the GUI thread.
+"""
+from __future__ import print_function
+# Load the needed packages
+import os
+import threading
+import traceback
+
+from .core import QtCore, componentsList, log
+from .cache import open_container
+from .lazy import release_fields
+
+
+class LoadRequest(object):
+    '''A file open requested to :py:class:`AsyncLoader`.'''
+
+    def __init__(self, filename, modes, callback, errback, prefetcher,
+                 owner):
+        self.filename = filename
+        self.modes = modes
+        self.callback = callback
+        self.errback = errback
+        self.prefetcher = prefetcher
+        self.owner = owner
+        self.cancelled = False
+        self.container = None
+        self.error = None
+
+    def cancel(self):
+        '''Cancel request, read attempts not started are skipped and the
+        result, if any, is discarded.'''
+        self.cancelled = True
+
+
+class AsyncLoader(QtCore.QObject):
+    '''
+    Open files in worker threads and deliver the containers to the GUI
+    thread through queued signals.
+
+    Progress messages are shown in the status bar of all components that
+    have one.
+    '''
+
+    started = QtCore.pyqtSignal(object, name='Started')
+    progress = QtCore.pyqtSignal(object, str, name='Progress')
+    finished = QtCore.pyqtSignal(object, name='Finished')
+
+    # internal signals used to cross from worker to GUI thread
+    _message = QtCore.pyqtSignal(object, str)
+    _done = QtCore.pyqtSignal(object)
+
+    def __init__(self):
+        super(AsyncLoader, self).__init__()
+        self.pending = []
+        self._message.connect(self._report, QtCore.Qt.QueuedConnection)
+        self._done.connect(self._deliver, QtCore.Qt.QueuedConnection)
+
+    def load(self, filename, modes=("radar", "grid"), callback=None,
+             errback=None, prefetcher=None, block=False, owner=None):
+        '''
+        Open a file.
+
+        Parameters
+        ----------
+        filename : string
+            Path of the file to open.
+        [Optional]
+        modes : list of strings
+            Containers to try, see
+            :py:func:`~artview.core.io.read_container`.
+        callback : callable
+            Called in the GUI thread with the container read.
+        errback : callable
+            Called in the GUI thread with the :py:class:`LoadRequest` if
+            the file could not be read.
+        prefetcher : :py:class:`~artview.core.prefetch.Prefetcher` or None
+            Prefetcher to ask before reading the file.
+        block : bool
+            If True read the file in the calling thread, callbacks are
+            called before returning.
+        owner : object
+            Component opening the file, edited containers in the cache are
+            only shared with their owner, see
+            :py:class:`~artview.core.cache.ContainerCache`.
+
+        Returns
+        -------
+        request : :py:class:`LoadRequest`
+        '''
+        request = LoadRequest(filename, modes, callback, errback, prefetcher,
+                              owner)
+        self.pending.append(request)
+        self.started.emit(request)
+        print("Opening file " + filename, file=log.info)
+        if block:
+            self._work(request, self._report)
+            self._deliver(request)
+        else:
+            thread = threading.Thread(
+                target=self._work, args=(request, self._message.emit, True))
+            thread.daemon = True
+            thread.start()
+        return request
+
+    def cancel(self, request=None):
+        '''Cancel request, or all pending requests if None.'''
+        if request is None:
+            for request in self.pending:
+                request.cancel()
+        else:
+            request.cancel()
+
+    def _work(self, request, report, wait=False):
+        '''Read the file, called in the worker thread. If wait is True
+        first wait for a prefetch of the file in flight.'''
+        report(request, "Opening %s" % os.path.basename(request.filename))
+        if wait and request.prefetcher is not None:
+            # not reading the file twice, the GUI thread does not wait
+            request.prefetcher.wait(request.filename)
+        try:
+            request.container = open_container(
+                request.filename, request.modes, request.prefetcher,
+                progress=lambda msg: report(request, msg),
+                is_cancelled=lambda: request.cancelled,
+                owner=request.owner)
+        except:
+            request.error = traceback.format_exc()
+            print(request.error, file=log.error)
+        if request.container is None and request.error is None:
+            request.error = "Py-ART didn't recognize this file!"
+        self._done.emit(request)
+
+    def _deliver(self, request):
+        '''Hand result to request callbacks, called in the GUI thread.'''
+        if request not in self.pending:
+            return
+        self.pending.remove(request)
+        if request.cancelled:
+            self._report(request, "Cancelled opening %s" %
+                         os.path.basename(request.filename), 3000)
+        elif request.container is not None:
+            self._report(request, "Opened %s" %
+                         os.path.basename(request.filename), 3000)
+            if request.callback is not None:
+                request.callback(request.container)
+            # components have loaded what they show, free the rest
+            release_fields(request.container)
+        else:
+            self._report(request, "Failed opening %s" %
+                         os.path.basename(request.filename), 3000)
+            if request.errback is not None:
+                request.errback(request)
+        self.finished.emit(request)
+
+    def _report(self, request, message, timeout=0):
+        '''Show message in components status bars.'''
+        self.progress.emit(request, message)
+        show_status(message, timeout)
+
+
+def show_status(message, timeout=0):
+    '''Show message in the status bar of all components that have one.'''
+    for component in componentsList:
+        statusbar = getattr(component, 'statusbar', None)
+        if statusbar is None:
+            continue
+        try:
+            statusbar.showMessage(message, timeout)
+        except RuntimeError:
+            # underlying C++ object deleted
+            pass
+
+
+#: Loader shared by all ARTview components
+async_loader = AsyncLoader()
@@ -3,6 +3,10 @@ points.py
 """
 
 import numpy as np
+try:
+    from collections.abc import MutableMapping
+except ImportError:
+    from collections import MutableMapping
 
 
 class Points:
@@ -138,6 +142,196 @@ class Points:
         return self.add_field(field_name, dic,
                               replace_existing=replace_existing)
 
+
+class GatheredFields(MutableMapping):
+    '''
+    Fields dictionary of :py:class:`IndexedPoints`: the fields of a Radar
+    or Grid, each gathered at the points on first access. Fields added to
+    the points are kept apart and shadow the container fields.
+    '''
+
+    def __init__(self, fields, index, first=None):
+        '''
+        Initialize the class.
+
+        Parameters
+        ----------
+        fields : dict
+            Fields dictionary of the container, not copied.
+        index : tuple of 1D int arrays
+            Index of the points in the field data.
+        [Optional]
+        first : string or None
+            Field listed first, e.g. the one displayed.
+        '''
+        self._fields = fields
+        self._index = index
+        self._first = first
+        self._gathered = {}
+        self._local = {}
+
+    def _container_keys(self):
+        keys = list(self._fields.keys())
+        if self._first in keys:
+            keys.remove(self._first)
+            keys.insert(0, self._first)
+        return keys
+
+    def subset(self, selection, index):
+        '''
+        Return the fields of points selected from these, sharing the
+        container fields and selecting the columns already gathered.
+
+        Parameters
+        ----------
+        selection : 1D int array
+            Indexes of the points to keep.
+        index : tuple of 1D int arrays
+            Index of the kept points in the field data.
+        '''
+        fields = GatheredFields(self._fields, index, self._first)
+        for key, dic in self._gathered.items():
+            dic = dict(dic)
+            dic['data'] = dic['data'][selection]
+            fields._gathered[key] = dic
+        for key, dic in self._local.items():
+            dic = dict(dic)
+            dic['data'] = dic['data'][selection]
+            fields._local[key] = dic
+        return fields
+
+    def __getitem__(self, key):
+        if key in self._local:
+            return self._local[key]
+        if key not in self._gathered:
+            if key not in self._container_keys():
+                raise KeyError(key)
+            field = self._fields[key]
+            dic = {}
+            for k in field:
+                if k != 'data':
+                    dic[k] = field[k]
+            dic['data'] = field['data'][self._index]
+            self._gathered[key] = dic
+        return self._gathered[key]
+
+    def __setitem__(self, key, value):
+        self._local[key] = value
+
+    def __delitem__(self, key):
+        if key in self._local:
+            del self._local[key]
+        else:
+            raise KeyError("Can not delete field of the container: %s" %
+                           key)
+
+    def __contains__(self, key):
+        return key in self._local or key in self._container_keys()
+
+    def __iter__(self):
+        for key in self._container_keys():
+            if key not in self._local:
+                yield key
+        for key in self._local:
+            yield key
+
+    def __len__(self):
+        return len(list(iter(self)))
+
+
+class IndexedPoints(Points):
+    '''
+    Points of a Radar or Grid given by their indexes in it.
+
+    Only the index arrays are kept. All fields of the container are
+    exposed in :py:attr:`fields`, the data of each one gathered at the
+    points when first accessed, see :py:class:`GatheredFields`. Subsets
+    made with :py:func:`subset` share the container and the columns
+    already gathered. Gathered data is not updated if the container is
+    edited, displays make new points on strong updates of their container.
+    '''
+
+    def __init__(self, container, index, axes, metadata, first=None):
+        '''
+        Initialize object.
+
+        Parameters
+        ----------
+        container : Radar or Grid
+            Object the points are part of.
+        index : tuple of 1D int arrays
+            Index of the points in the container fields, (ray, range) for
+            a Radar, (z, y, x) for a Grid.
+        axes : dict
+            Axes of the points, see :py:class:`Points`.
+        metadata : dict
+            Global attributes.
+        [Optional]
+        first : string or None
+            Field listed first in :py:attr:`fields`, e.g. the one
+            displayed.
+        '''
+        self.container = container
+        self.index = tuple(np.asarray(i) for i in index)
+        self.npoints = len(self.index[0])
+        self.axes = axes
+        self.metadata = metadata
+        self.first = first
+        self.fields = GatheredFields(container.fields, self.index, first)
+
+    def subset(self, selection):
+        '''
+        Return points selected from these.
+
+        Parameters
+        ----------
+        selection : 1D bool or int array
+            Mask of shape (npoints,) or indexes of the points to keep.
+
+        Returns
+        -------
+        points : :py:class:`IndexedPoints`
+            Points of the same container, columns already gathered are
+            selected from the gathered data instead of the container.
+        '''
+        selection = np.asarray(selection)
+        if selection.dtype == bool:
+            selection = np.nonzero(selection)[0]
+        index = tuple(i[selection] for i in self.index)
+        axes = {}
+        for key, axis in self.axes.items():
+            axis = dict(axis)
+            data = np.ma.asarray(axis['data'])
+            if data.shape == (self.npoints,):
+                axis['data'] = data[selection]
+            axes[key] = axis
+        points = IndexedPoints(self.container, index, axes,
+                               self.metadata, self.first)
+        points.fields = self.fields.subset(selection, points.index)
+        return points
+
+    def contains(self, points):
+        '''
+        Test which of points are also part of these.
+
+        Parameters
+        ----------
+        points : :py:class:`IndexedPoints`
+            Points of the same container.
+
+        Returns
+        -------
+        mask : 1D bool array
+            Mask of shape (points.npoints,).
+        '''
+        if (points.container is not self.container or self.npoints == 0 or
+                points.npoints == 0):
+            return np.zeros(points.npoints, dtype=bool)
+        shape = tuple(max(i.max(), j.max()) + 1
+                      for i, j in zip(self.index, points.index))
+        return np.isin(np.ravel_multi_index(points.index, shape),
+                       np.ravel_multi_index(self.index, shape))
+
 import csv
 
 
@@ -0,0 +1,223 @@
+"""
+prefetch.py
+
+Background reading of the files around the current position of a file list.
+"""
+from __future__ import print_function
+# Load the needed packages
+import threading
+import traceback
+
+from .core import log
+from .io import load_fields, container_nbytes
+from .sweep_cache import read_cached
+from .cache import container_cache
+
+
+class Prefetcher(object):
+    '''
+    Read files neighbouring the current one in a worker thread, so that
+    navigation components get containers already parsed.
+
+    Only the container skeleton and the fields asked by the caller, e.g.
+    the ones displayed, are loaded, other fields stay lazy. Prefetched
+    containers are kept until requested with :py:meth:`get`, dropped when
+    they fall outside the prefetch window or when keeping them would
+    exceed the memory budget.
+
+    Attributes
+    ----------
+    hits : int
+        Number of :py:meth:`get` calls that returned a prefetched container.
+    misses : int
+        Number of :py:meth:`get` calls that found nothing.
+    '''
+
+    def __init__(self, ahead=2, behind=1, max_bytes=512 * 2**20,
+                 modes=("radar", "grid")):
+        '''
+        Initialize the class.
+
+        Parameters
+        ----------
+        [Optional]
+        ahead : int
+            Number of files after the current one to prefetch.
+        behind : int
+            Number of files before the current one to prefetch.
+        max_bytes : int
+            Memory budget, in bytes of loaded field data, for the
+            prefetched containers.
+        modes : list of strings
+            Containers to try, see
+            :py:func:`~artview.core.io.read_container`.
+        '''
+        self.ahead = ahead
+        self.behind = behind
+        self.max_bytes = max_bytes
+        self.modes = modes
+        self.hits = 0
+        self.misses = 0
+
+        self._condition = threading.Condition()
+        self._queue = []  # filenames waiting to be read, by priority
+        self._priority = {}  # filename: position in the current window
+        self._fields = ()  # fields to load
+        self._store = {}  # filename: (container, nbytes)
+        self._loading = None
+        self._loading_generation = 0
+        self._generation = 0
+        self._thread = None
+
+    def prefetch(self, filelist, index, fields=None):
+        '''
+        Schedule the files around filelist[index] to be read.
+
+        Containers already prefetched that are out of the new window
+        are dropped.
+
+        Parameters
+        ----------
+        filelist : list of strings
+            Files being navigated.
+        index : int
+            Position of the current file in filelist.
+        [Optional]
+        fields : list of strings or None
+            Fields to load, e.g. the ones displayed, see
+            :py:func:`~artview.core.lazy.fields_in_use`. If None only
+            the container skeleton is read.
+        '''
+        if not filelist:
+            return
+        window = []
+        for i in range(1, max(self.ahead, self.behind) + 1):
+            if i <= self.ahead and index + i < len(filelist):
+                window.append(filelist[index + i])
+            if i <= self.behind and index - i >= 0:
+                window.append(filelist[index - i])
+
+        with self._condition:
+            self._priority = dict((filename, i) for i, filename in
+                                  enumerate(window))
+            self._fields = tuple(fields or ())
+            for filename in list(self._store.keys()):
+                if filename not in self._priority:
+                    del self._store[filename]
+            self._queue = [filename for filename in window
+                           if filename not in self._store and
+                           filename != self._loading and
+                           filename not in container_cache]
+            self._condition.notify_all()
+
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run)
+            self._thread.daemon = True
+            self._thread.start()
+
+    def get(self, filename):
+        '''
+        Return the prefetched container for filename or None.
+
+        Never blocks, if filename is still being read None is returned,
+        see :py:meth:`wait`. The container is handed over and removed from
+        the prefetcher.
+        '''
+        with self._condition:
+            if filename in self._store:
+                self.hits += 1
+                container, nbytes = self._store.pop(filename)
+                print("Prefetch hit %s" % filename, file=log.debug)
+                return container
+            else:
+                self.misses += 1
+                return None
+
+    def wait(self, filename):
+        '''Wait until filename is not being read. Do not call from the
+        GUI thread.'''
+        with self._condition:
+            while (self._loading == filename and
+                   self._loading_generation == self._generation):
+                self._condition.wait()
+
+    def cancel(self):
+        '''Cancel pending prefetches, the result of a running read is
+        discarded.'''
+        with self._condition:
+            self._queue = []
+            self._priority = {}
+            self._generation += 1
+            self._condition.notify_all()
+
+    def clear(self):
+        '''Cancel pending prefetches and drop prefetched containers.'''
+        with self._condition:
+            self.cancel()
+            self._store = {}
+
+    def nbytes(self):
+        '''Return bytes used by prefetched containers.'''
+        with self._condition:
+            return sum(nbytes for container, nbytes in self._store.values())
+
+    def stats(self):
+        '''Return a string with the prefetch statistics.'''
+        total = self.hits + self.misses
+        if total:
+            rate = 100. * self.hits / total
+        else:
+            rate = 0.
+        return ("Prefetch hits: %d, misses: %d (%.0f%% hit rate), "
+                "%d files held, %.1f MB" %
+                (self.hits, self.misses, rate, len(self._store),
+                 self.nbytes() / 2.**20))
+
+    def _run(self):
+        '''Worker loop, read files in the queue.'''
+        while True:
+            with self._condition:
+                while not self._queue:
+                    self._condition.wait()
+                filename = self._queue.pop(0)
+                fields = self._fields
+                self._loading = filename
+                self._loading_generation = self._generation
+
+            container = None
+            try:
+                container = read_cached(filename, self.modes)
+                if container is not None:
+                    load_fields(container, fields)
+            except:
+                print(traceback.format_exc(), file=log.error)
+                container = None
+
+            with self._condition:
+                if (container is not None and
+                        self._loading_generation == self._generation and
+                        filename in self._priority):
+                    self._insert(filename, container)
+                self._loading = None
+                self._condition.notify_all()
+
+    def _insert(self, filename, container):
+        '''Store container respecting the memory budget, evicting the
+        containers of lower priority if needed. Call with lock held.'''
+        nbytes = container_nbytes(container)
+        priority = self._priority[filename]
+        used = sum(n for c, n in self._store.values())
+        victims = sorted(self._store.keys(),
+                         key=lambda name: self._priority.get(name, 0),
+                         reverse=True)
+        for victim in victims:
+            if used + nbytes <= self.max_bytes:
+                break
+            if self._priority.get(victim, 0) < priority:
+                break
+            used -= self._store.pop(victim)[1]
+        if used + nbytes > self.max_bytes:
+            print("Prefetch of %s exceeds memory budget" % filename,
+                  file=log.debug)
+            return
+        self._store[filename] = (container, nbytes)
@@ -0,0 +1,230 @@
+"""
+sweep_cache.py
+
+Optional on disk cache of decoded containers, re-opened with memory mapped
+arrays instead of decoding the original file again.
+"""
+from __future__ import print_function
+# Load the needed packages
+import os
+import copy
+import shutil
+import pickle
+import hashlib
+import threading
+import traceback
+
+import numpy as np
+
+from .core import log
+from .io import _io_lock, read_container, field_is_loaded
+from .lazy import LazyField
+
+_SKELETON = 'container.pkl'
+
+
+class MmapCache(object):
+    '''
+    Directory of decoded containers.
+
+    Each entry holds the container without field data, pickled, and one
+    uncompressed .npy file per field data (and mask), opened with
+    ``numpy.load(mmap_mode='c')``: re-opening costs page faults instead of
+    decompression and edits stay private to the process. The total size
+    is capped, least recently used entries are removed first.
+    '''
+
+    def __init__(self, path=None, max_bytes=4 * 2**30, enabled=False):
+        '''
+        Initialize the class.
+
+        Parameters
+        ----------
+        [Optional]
+        path : string
+            Cache directory. If None use mmap in the ARTview user cache
+            directory.
+        max_bytes : int
+            Maximum size of the cache on disk.
+        enabled : bool
+            If False :py:meth:`load` and :py:meth:`store` do nothing.
+        '''
+        if path is None:
+            from .index import _cache_dir
+            path = os.path.join(_cache_dir(), 'mmap')
+        self.path = path
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._writing = set()
+        self._lock = threading.Lock()
+
+    def _entry(self, filename):
+        '''Return entry directory of filename, None if it does not exist.'''
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return None
+        key = "%s|%r|%d" % (os.path.abspath(filename), stat.st_mtime,
+                            stat.st_size)
+        return os.path.join(self.path,
+                            hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+    def load(self, filename):
+        '''Return cached container of filename or None.'''
+        if not self.enabled:
+            return None
+        entry = self._entry(filename)
+        if entry is None or not os.path.isfile(
+                os.path.join(entry, _SKELETON)):
+            return None
+        try:
+            with open(os.path.join(entry, _SKELETON), 'rb') as f:
+                container = pickle.load(f)
+        except:
+            print(traceback.format_exc(), file=log.error)
+            return None
+        for name, field in list(container.fields.items()):
+            stem = field.pop('_mmap_file')
+            field = LazyField(field)
+            field.set_lazy('data', _MmapLoader(entry, stem))
+            container.fields[name] = field
+        container.filename = filename
+        # mark use for the LRU policy
+        os.utime(entry, None)
+        print("Opened %s from mmap cache" % filename, file=log.debug)
+        return container
+
+    def store(self, filename, container, block=False):
+        '''
+        Write container read from filename to the cache, in a background
+        thread unless block is True.
+
+        Fields not loaded are loaded to be written and released after.
+        '''
+        if not self.enabled:
+            return
+        entry = self._entry(filename)
+        if entry is None or os.path.isdir(entry):
+            return
+        with self._lock:
+            if entry in self._writing:
+                return
+            self._writing.add(entry)
+        if block:
+            self._store(entry, container)
+        else:
+            thread = threading.Thread(target=self._store,
+                                      args=(entry, container))
+            thread.daemon = True
+            thread.start()
+
+    def _store(self, entry, container):
+        tmp = entry + '.tmp%d' % os.getpid()
+        try:
+            os.makedirs(tmp)
+            skeleton = copy.copy(container)
+            skeleton.fields = {}
+            for i, name in enumerate(list(container.fields.keys())):
+                field = container.fields[name]
+                # field names may not be valid file names
+                stem = 'field%d' % i
+                skeleton.fields[name] = dict(
+                    (key, field[key]) for key in field if key != 'data')
+                skeleton.fields[name]['_mmap_file'] = stem
+                loaded = field_is_loaded(field)
+                with _io_lock:
+                    data = field['data']
+                np.save(os.path.join(tmp, stem + '.npy'),
+                        np.ma.getdata(data))
+                if np.ma.getmask(data) is not np.ma.nomask:
+                    np.save(os.path.join(tmp, stem + '.mask.npy'),
+                            np.ma.getmaskarray(data))
+                del data
+                if not loaded and isinstance(field, LazyField):
+                    field.release('data')
+            with open(os.path.join(tmp, _SKELETON), 'wb') as f:
+                pickle.dump(skeleton, f, pickle.HIGHEST_PROTOCOL)
+            os.rename(tmp, entry)
+            print("Stored %s in mmap cache" % container.filename,
+                  file=log.debug)
+        except:
+            print(traceback.format_exc(), file=log.error)
+            shutil.rmtree(tmp, ignore_errors=True)
+        finally:
+            with self._lock:
+                self._writing.discard(entry)
+        self.prune()
+
+    def entries(self):
+        '''Return list of (mtime, nbytes, path) of cache entries.'''
+        entries = []
+        if not os.path.isdir(self.path):
+            return entries
+        for name in os.listdir(self.path):
+            path = os.path.join(self.path, name)
+            if not os.path.isdir(path) or '.tmp' in name:
+                continue
+            nbytes = sum(os.path.getsize(os.path.join(path, f))
+                         for f in os.listdir(path))
+            entries.append((os.path.getmtime(path), nbytes, path))
+        return entries
+
+    def nbytes(self):
+        '''Return size of the cache on disk.'''
+        return sum(entry[1] for entry in self.entries())
+
+    def prune(self, max_bytes=None):
+        '''Remove least recently used entries until the cache fits in
+        max_bytes (default self.max_bytes).'''
+        if max_bytes is None:
+            max_bytes = self.max_bytes
+        entries = sorted(self.entries())
+        used = sum(entry[1] for entry in entries)
+        for mtime, nbytes, path in entries:
+            if used <= max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            used -= nbytes
+
+    def clear(self):
+        '''Remove all entries of the cache.'''
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+class _MmapLoader(object):
+    '''Open a cached field data as memory mapped array.'''
+
+    def __init__(self, entry, stem):
+        self.entry = entry
+        self.stem = stem
+
+    def __call__(self):
+        data = np.load(os.path.join(self.entry, self.stem + '.npy'),
+                       mmap_mode='c')
+        maskfile = os.path.join(self.entry, self.stem + '.mask.npy')
+        if os.path.isfile(maskfile):
+            mask = np.load(maskfile, mmap_mode='c')
+        else:
+            mask = np.ma.nomask
+        return np.ma.MaskedArray(data, mask=mask, copy=False)
+
+
+#: Cache shared by all ARTview components, disabled by default
+mmap_cache = MmapCache()
+
+
+def read_cached(filename, modes=("radar", "grid"), progress=None,
+                is_cancelled=None):
+    '''
+    Read filename from the mmap cache if enabled and present, otherwise
+    with :py:func:`~artview.core.io.read_container`, storing the result
+    in the mmap cache.
+    '''
+    container = mmap_cache.load(filename)
+    if (container is not None and type(container).__name__.lower() in
+            [mode.lower() for mode in modes]):
+        return container
+    container = read_container(filename, modes, progress, is_cancelled)
+    if container is not None:
+        mmap_cache.store(filename, container)
+    return container
@@ -0,0 +1,144 @@
+"""
+watcher.py
+
+Watch a directory for new files, for real time data feeds.
+"""
+from __future__ import print_function
+# Load the needed packages
+import os
+
+from .core import QtCore, log
+
+
+class DirectoryWatcher(QtCore.QObject):
+    '''
+    Report files added to or removed from a directory.
+
+    Changes are detected by a QFileSystemWatcher (inotify and friends) and,
+    for file systems where it does not work (e.g. network mounts), by
+    polling the directory modification time. A new file is only reported
+    once its size is unchanged between two checks, so volumes still being
+    written are not opened.
+    '''
+
+    filesAdded = QtCore.pyqtSignal(object, name='FilesAdded')
+    filesRemoved = QtCore.pyqtSignal(object, name='FilesRemoved')
+
+    def __init__(self, interval=5000, parent=None):
+        '''
+        Initialize the class.
+
+        Parameters
+        ----------
+        [Optional]
+        interval : int
+            Polling interval in milliseconds.
+        parent : QObject
+            Qt parent.
+        '''
+        super(DirectoryWatcher, self).__init__(parent)
+        self.directory = None
+        self._names = set()
+        self._pending = {}  # name: size at last check
+        self._mtime = None
+        self._watcher = QtCore.QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self.check)
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self._poll)
+
+    def setDirectory(self, directory, filelist=None):
+        '''
+        Start watching directory.
+
+        Parameters
+        ----------
+        directory : string
+            Directory to watch.
+        [Optional]
+        filelist : list of strings
+            Files already known, if None the directory is listed.
+        '''
+        self.stop()
+        self.directory = directory
+        if filelist is None:
+            self._names = set(self._listdir())
+        else:
+            self._names = set(os.path.basename(path) for path in filelist)
+        self._pending = {}
+        self._mtime = self._dir_mtime()
+        self._watcher.addPath(directory)
+        self._timer.start()
+
+    def stop(self):
+        '''Stop watching.'''
+        self._timer.stop()
+        if self._watcher.directories():
+            self._watcher.removePaths(self._watcher.directories())
+        self.directory = None
+
+    def isActive(self):
+        return self.directory is not None
+
+    def _listdir(self):
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        return [name for name in names
+                if os.path.isfile(os.path.join(self.directory, name))]
+
+    def _dir_mtime(self):
+        try:
+            return os.stat(self.directory).st_mtime
+        except OSError:
+            return None
+
+    def _poll(self):
+        '''Check directory if it was modified or files are pending.'''
+        if self.directory is None:
+            return
+        mtime = self._dir_mtime()
+        if mtime != self._mtime or self._pending:
+            self._mtime = mtime
+            self.check()
+
+    def check(self, *args):
+        '''Compare directory content with known files, emit signals.'''
+        if self.directory is None:
+            return
+        try:
+            current = set(os.listdir(self.directory))
+        except OSError:
+            return
+        removed = self._names - current
+        added = []
+        for name in current - self._names:
+            path = os.path.join(self.directory, name)
+            if not os.path.isfile(path):
+                continue
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                continue
+            if self._pending.get(name) == size:
+                # size is stable, writing is over
+                del self._pending[name]
+                added.append(name)
+            else:
+                self._pending[name] = size
+        for name in list(self._pending.keys()):
+            if name not in current:
+                del self._pending[name]
+
+        if removed:
+            self._names -= removed
+            self.filesRemoved.emit(
+                sorted(os.path.join(self.directory, name)
+                       for name in removed))
+        if added:
+            self._names.update(added)
+            print("New files in %s: %s" % (self.directory, ", ".join(added)),
+                  file=log.info)
+            self.filesAdded.emit(
+                sorted(os.path.join(self.directory, name) for name in added))
@@ -0,0 +1,298 @@
+"""
+writer.py
+
+Service saving radars and grids out of the GUI thread.
+"""
+from __future__ import print_function
+# Load the needed packages
+import copy
+import os
+import threading
+import time
+import traceback
+
+import numpy as np
+
+from .cache import container_cache
+from .core import QtCore, log
+from .io import _io_lock
+from .lazy import fields_in_use
+from .loader import show_status
+
+
+def snapshot_container(container, copy_fields=None):
+    '''
+    Return a cheap copy of container to be written while it is still
+    displayed and edited.
+
+    The container and its field dictionaries are copied, but field data
+    arrays are shared, except for the fields in copy_fields, whose data is
+    copied. Fields not loaded yet stay lazy and are read by the writer.
+    The writer copies the data of grid fields, which Py-ART reshapes while
+    writing.
+
+    Parameters
+    ----------
+    container : Radar or Grid
+        Container to copy.
+    [Optional]
+    copy_fields : list of strings
+        Fields whose data may be modified while writing. If None the
+        fields shown by components, that is the ones editing tools
+        modify, see :py:func:`~artview.core.lazy.fields_in_use`.
+
+    Returns
+    -------
+    snapshot : Radar or Grid
+    '''
+    if copy_fields is None:
+        copy_fields = fields_in_use()
+    snapshot = copy.copy(container)
+    snapshot.fields = {}
+    for name, field in container.fields.items():
+        newfield = field.copy()
+        if name in copy_fields and 'data' in newfield:
+            newfield['data'] = newfield['data'].copy()
+        snapshot.fields[name] = newfield
+    return snapshot
+
+
+class WriteRequest(object):
+    '''A file save requested to :py:class:`WriteQueue`.'''
+
+    def __init__(self, filename, container, kind, mask, options, callback,
+                 errback, source=None):
+        self.filename = filename
+        self.container = container
+        self.source = source
+        self.kind = kind
+        self.mask = mask
+        self.options = options
+        self.callback = callback
+        self.errback = errback
+        self.error = None
+        self.nbytes = 0
+        self.elapsed = 0.
+
+
+class WriteQueue(QtCore.QObject):
+    '''
+    Save containers in a worker thread, one at a time and in the order
+    requested.
+
+    Containers are snapshotted when queued, see
+    :py:func:`snapshot_container`, so they can be edited or closed while
+    being written. Fields are written with NetCDF4 compression and
+    chunking set by :py:attr:`options`. Files are written to a temporary
+    name and renamed when complete. Once saved, a container edited in
+    memory is no longer pinned in the container cache.
+
+    Progress messages are shown in the status bar of all components that
+    have one.
+    '''
+
+    started = QtCore.pyqtSignal(object, name='Started')
+    finished = QtCore.pyqtSignal(object, name='Finished')
+
+    # internal signals used to cross from worker to GUI thread
+    _message = QtCore.pyqtSignal(str)
+    _done = QtCore.pyqtSignal(object)
+
+    #: options types, for :py:func:`~artview.core.common.get_options`
+    options_type = [
+        ("deflate_level", int, "Compression level (0-9)"),
+        ("shuffle", bool, "Shuffle filter"),
+        ("chunk_rays", int, "Rays per chunk (0: one sweep)"),
+        ]
+
+    def __init__(self):
+        super(WriteQueue, self).__init__()
+        self.options = {
+            "deflate_level": 4,
+            "shuffle": True,
+            "chunk_rays": 0,
+            }
+        self.pending = []
+        self._lock = threading.Lock()
+        self._thread = None
+        self._message.connect(show_status, QtCore.Qt.QueuedConnection)
+        self._done.connect(self._deliver, QtCore.Qt.QueuedConnection)
+
+    def save(self, filename, container, kind="radar", mask=None,
+             callback=None, errback=None, copy_fields=None):
+        '''
+        Queue container to be saved.
+
+        Parameters
+        ----------
+        filename : string
+            Path of the file to write.
+        container : Radar or Grid
+            Container to save, it is snapshotted before returning.
+        [Optional]
+        kind : 'radar' or 'grid'
+            Use :py:func:`pyart.io.write_cfradial` or
+            :py:func:`pyart.io.write_grid`.
+        mask : boolean array or None
+            Gates to mask in all fields, in addition to their own masks,
+            e.g. the excluded gates of a GateFilter. The container is not
+            modified.
+        callback : callable
+            Called in the GUI thread with the :py:class:`WriteRequest`
+            when the file is written.
+        errback : callable
+            Called in the GUI thread with the :py:class:`WriteRequest` if
+            the file could not be written.
+        copy_fields : list of strings
+            See :py:func:`snapshot_container`.
+
+        Returns
+        -------
+        request : :py:class:`WriteRequest`
+        '''
+        snapshot = snapshot_container(container, copy_fields)
+        if mask is not None:
+            mask = np.array(mask, dtype=bool)
+        request = WriteRequest(filename, snapshot, kind, mask,
+                               self.options.copy(), callback, errback,
+                               container)
+        with self._lock:
+            self.pending.append(request)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run)
+                self._thread.daemon = True
+                self._thread.start()
+        self.started.emit(request)
+        show_status("Queued %s for saving" % os.path.basename(filename),
+                    3000)
+        return request
+
+    def wait(self):
+        '''Block until all queued files are written.'''
+        thread = self._thread
+        if thread is not None:
+            thread.join()
+
+    def _run(self):
+        '''Worker loop, write queued requests.'''
+        while True:
+            with self._lock:
+                queued = [request for request in self.pending
+                          if request.container is not None]
+                if not queued:
+                    self._thread = None
+                    return
+                request = queued[0]
+            nqueued = len(queued) - 1
+            message = "Saving %s" % os.path.basename(request.filename)
+            if nqueued:
+                message += " (%d more queued)" % nqueued
+            self._message.emit(message)
+            t0 = time.time()
+            try:
+                self._write(request)
+            except:
+                request.error = traceback.format_exc()
+                print(request.error, file=log.error)
+            request.elapsed = time.time() - t0
+            # free the snapshot, the request stays pending until delivered
+            request.container = None
+            self._done.emit(request)
+
+    def _write(self, request):
+        '''Write request container, called in the worker thread.'''
+        import pyart
+        container = request.container
+        tmpname = request.filename + ".part"
+        with _io_lock:
+            # lazy fields are read here, under the lock
+            for field in container.fields.values():
+                data = field['data']
+                if request.kind == "grid":
+                    # write_grid reshapes the data in place, do not touch
+                    # the arrays shared with the displayed grid
+                    data = data.copy()
+                if request.mask is not None:
+                    data = np.ma.array(data, mask=request.mask, copy=False)
+                field['data'] = data
+                field.update(
+                    compression_keys(container, field, request.kind,
+                                     request.options))
+            if request.kind == "grid":
+                pyart.io.write_grid(tmpname, container)
+            else:
+                pyart.io.write_cfradial(tmpname, container)
+        os.rename(tmpname, request.filename)
+        request.nbytes = os.path.getsize(request.filename)
+
+    def _deliver(self, request):
+        '''Hand result to request callbacks, called in the GUI thread.'''
+        if request not in self.pending:
+            return
+        self.pending.remove(request)
+        name = os.path.basename(request.filename)
+        if request.error is None:
+            print("Saved %s (%.1f MB in %.1f s)" %
+                  (request.filename, request.nbytes / 2.**20,
+                   request.elapsed), file=log.info)
+            show_status("Saved %s" % name, 3000)
+            # the changes are saved, stop pinning the container
+            container_cache.unpin(request.source)
+            if request.callback is not None:
+                request.callback(request)
+        else:
+            show_status("Failed saving %s" % name, 3000)
+            if request.errback is not None:
+                request.errback(request)
+        request.source = None
+        self.finished.emit(request)
+
+
+def compression_keys(container, field, kind, options):
+    '''
+    Return the Py-ART special keys setting NetCDF4 compression and
+    chunking of field.
+
+    Parameters
+    ----------
+    container : Radar or Grid
+        Container field belongs to.
+    field : dict
+        Field to write, its data is loaded.
+    kind : 'radar' or 'grid'
+        Writer used, see :py:meth:`WriteQueue.save`.
+    options : dict
+        Options as in :py:attr:`WriteQueue.options`.
+
+    Returns
+    -------
+    keys : dict
+        Keys to add to field.
+    '''
+    keys = {}
+    level = int(options.get("deflate_level", 0))
+    if level <= 0:
+        keys['_Zlib'] = False
+        return keys
+    keys['_Zlib'] = True
+    keys['_DeflateLevel'] = min(level, 9)
+    keys['_Shuffle'] = bool(options.get("shuffle", True))
+    shape = np.shape(field['data'])
+    if kind == "grid":
+        if len(shape) == 3:
+            # one vertical level per chunk, write_grid adds the time
+            # dimension
+            keys['_ChunkSizes'] = (1, 1, shape[1], shape[2])
+    elif len(shape) == 2:
+        rays = int(options.get("chunk_rays", 0))
+        if rays <= 0:
+            # one sweep per chunk
+            starts = container.sweep_start_ray_index['data']
+            ends = container.sweep_end_ray_index['data']
+            rays = int(np.max(ends - starts)) + 1 if len(starts) else shape[0]
+        keys['_ChunkSizes'] = (max(1, min(rays, shape[0])), shape[1])
+    return keys
+
+
+#: Write queue shared by all ARTview components
+write_queue = WriteQueue()
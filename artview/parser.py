@@ -40,6 +40,23 @@ def parse(argv):
     -----
     Returns directory and field for initialization.
     '''
+    args = parse_args(argv)
+    return args.script, args.directory, args.file, args.field
+
+
+def parse_args(argv):
+    '''
+    Parse the input command line.
+
+    Parameters
+    ----------
+    argv - string
+        Input command line string.
+
+    Notes
+    -----
+    Returns argparse Namespace with all options.
+    '''
     parser = argparse.ArgumentParser(
         description="Start ARTview - the ARM Radar Toolkit Viewer.")
 
@@ -60,7 +77,40 @@ def parse(argv):
         help=('Select from artview.scripts a script to execute. '
               'Possibilities include: standard, layout, grid, radar '))
 
+    parser.add_argument(
+        '--cache', action='store_true',
+        help=('Keep decoded files in a memory mapped cache in the user '
+              'cache directory, for faster re-opening'))
+    parser.add_argument(
+        '--cache-size', type=float, default=4.,
+        help='Maximum size of the cache in GB (default 4)')
+    parser.add_argument(
+        '--clear-cache', action='store_true',
+        help='Remove all files of the cache and exit')
+
+    parser.add_argument(
+        '--batch', type=str, default=None, metavar='PIPELINE',
+        help=('Run without GUI the pipeline saved in the PIPELINE json file '
+              'over the files of --directory, or of --input'))
+    parser.add_argument(
+        '--input', type=str, default=None,
+        help='Glob pattern of the files to process in batch mode')
+    parser.add_argument(
+        '--output', type=str, default=None,
+        help=('Output directory of batch mode '
+              '(default: batch_output in the input directory)'))
+    parser.add_argument(
+        '--processes', type=int, default=None,
+        help='Number of batch worker processes (default: number of CPUs)')
+    parser.add_argument(
+        '--quicklook', type=str, default=None, metavar='FIELD',
+        help='Save a PNG of FIELD for each file processed in batch mode')
+    parser.add_argument(
+        '--restart', action='store_true',
+        help=('Process all files in batch mode, instead of resuming from '
+              'the journal of a previous run'))
+
     # Parse the args
     args = parser.parse_args(argv[1::])
 
-    return args.script, args.directory, args.file, args.field
+    return args
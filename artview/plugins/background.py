@@ -3,6 +3,7 @@
 """
 backgroud.py
 """
+from __future__ import print_function
 
 # Load the needed packages
 
@@ -15,7 +16,292 @@ import sys
 import os
 
 from ..core import Component, Variable, common, QtWidgets, QtCore, componentsList
+from ..core import log
 
+#: spacing in meters of the finest topography tiles
+TILE_SPACING = 500.
+#: size in cells of the topography tiles
+TILE_SIZE = 256
+#: elevation in meters of the top of the colormap
+TOPO_VMAX = 4000.
+#: vertical exaggeration of the relief shading
+VERT_EXAG = 5.
+
+
+def read_dem_window(dataset, lon_min, lon_max, lat_min, lat_max,
+                    names=("ROSE", "ETOPO05_X", "ETOPO05_Y")):
+    '''
+    Read from a NetCDF elevation model only the window covering a lat/lon
+    box, plus one cell on each side.
+
+    Parameters
+    ----------
+    dataset : netCDF4 Dataset
+        Elevation model, longitude and latitude are 1D variables.
+    lon_min, lon_max, lat_min, lat_max : float
+        Box in degrees, lon_max may exceed 180 for boxes crossing the
+        dateline.
+    [Optional]
+    names : tuple of strings
+        Names of the elevation, longitude and latitude variables.
+
+    Returns
+    -------
+    elevation : 2D array
+        Elevation (lat, lon), negative values are set to 0.
+    lons, lats : 1D arrays
+        Increasing coordinates of elevation, longitudes continue from
+        lon_min, with no jump at the dateline.
+    '''
+    var, xname, yname = names
+    lons = np.asarray(dataset.variables[xname][:], dtype=float)
+    lats = np.asarray(dataset.variables[yname][:], dtype=float)
+
+    dlat = abs(lats[1] - lats[0])
+    jj = np.nonzero((lats >= lat_min - dlat) & (lats <= lat_max + dlat))[0]
+    j0, j1 = jj.min(), jj.max() + 1
+
+    # longitudes taken modulo 360 from the box start
+    dlon = abs(lons[1] - lons[0])
+    start = lon_min - dlon
+    rel = (lons - start) % 360.
+    ii = np.nonzero(rel <= lon_max - lon_min + 2 * dlon)[0]
+    if len(ii) == len(lons):
+        pieces = [np.argsort(rel)]
+        columns = [dataset.variables[var][j0:j1, :][:, pieces[0]]]
+    else:
+        # contiguous indexes, split where the window wraps
+        pieces = np.split(ii, np.nonzero(np.diff(ii) != 1)[0] + 1)
+        pieces.sort(key=lambda piece: rel[piece[0]])
+        columns = [dataset.variables[var][j0:j1, piece[0]:piece[-1] + 1]
+                   for piece in pieces]
+    elevation = np.maximum(0, np.ma.filled(np.ma.concatenate(columns, axis=1),
+                                           0))
+    lons = start + rel[np.concatenate(pieces)]
+    lats = lats[j0:j1]
+    if lats[0] > lats[-1]:
+        lats = lats[::-1]
+        elevation = elevation[::-1]
+    return elevation, lons, lats
+
+
+def shade_relief(elevation, spacing, cmap, vmax=TOPO_VMAX, azdeg=90,
+                 altdeg=20, vert_exag=VERT_EXAG):
+    '''
+    Return RGB image, as uint8, of elevation colored by cmap and lit from
+    azdeg, altdeg.
+
+    Unlike LightSource.shade, colors and intensity are not scaled to the
+    range of the array, so adjacent tiles match. Flat terrain has neutral
+    intensity.
+    '''
+    az = np.radians(90 - azdeg)
+    alt = np.radians(altdeg)
+    direction = np.array([np.cos(az) * np.cos(alt),
+                          np.sin(az) * np.cos(alt), np.sin(alt)])
+    # rows go north, columns east
+    dzdy, dzdx = np.gradient(elevation * vert_exag, spacing, spacing)
+    norm = np.sqrt(dzdx ** 2 + dzdy ** 2 + 1)
+    light = (-dzdx * direction[0] - dzdy * direction[1] +
+             direction[2]) / norm
+    intensity = np.interp(light, [-1., np.sin(alt), 1.], [0., 0.5, 1.])
+    rgb = cmap(np.clip(elevation / float(vmax), 0, 1))[..., :3]
+    rgb = LightSource(azdeg=azdeg, altdeg=altdeg).blend_hsv(
+        rgb, intensity[..., np.newaxis])
+    return (np.clip(rgb, 0, 1) * 255).astype(np.uint8)
+
+
+class TopographyTiles(object):
+    '''
+    Shaded topography tiles of map projections, at zoom levels of
+    TILE_SPACING times powers of two, shared by all displays.
+
+    Tiles are squares of TILE_SIZE cells aligned to the projection
+    coordinates, kept by (file, projection, level, column, row). The least
+    recently used are dropped.
+    '''
+
+    def __init__(self, size=256):
+        '''
+        Initialize the class.
+
+        Parameters
+        ----------
+        [Optional]
+        size : int
+            Number of tiles kept, about 200 kB each.
+        '''
+        from collections import OrderedDict
+        self.size = size
+        self.tiles = OrderedDict()
+
+    @staticmethod
+    def level(extent, pixels):
+        '''Return zoom level with about one cell per pixel for extent
+        (x0, x1, y0, y1) in meters drawn over pixels.'''
+        width = max(abs(extent[1] - extent[0]), abs(extent[3] - extent[2]))
+        ratio = width / (max(pixels, 1) * TILE_SPACING)
+        return max(0, int(np.ceil(np.log2(max(ratio, 1e-12)))))
+
+    def image(self, dataset, filename, m, extent, level, cmap):
+        '''
+        Return RGB image of topography covering extent.
+
+        Parameters
+        ----------
+        dataset : netCDF4 Dataset
+            Elevation model, see :py:func:`read_dem_window`.
+        filename : string
+            Name of dataset, part of the tile keys.
+        m : Basemap
+            Projection.
+        extent : tuple
+            (x0, x1, y0, y1) in projection coordinates.
+        level : int
+            Zoom level, tiles have TILE_SPACING * 2 ** level spacing.
+        cmap : matplotlib Colormap
+
+        Returns
+        -------
+        rgb : 3D array
+            Mosaic of the tiles, rows going north.
+        extent : tuple
+            (x0, x1, y0, y1) of rgb.
+        '''
+        spacing = TILE_SPACING * 2 ** level
+        span = TILE_SIZE * spacing
+        x0, x1 = sorted(extent[:2])
+        y0, y1 = sorted(extent[2:])
+        cols = range(int(np.floor(x0 / span)), int(np.floor(x1 / span)) + 1)
+        rows = range(int(np.floor(y0 / span)), int(np.floor(y1 / span)) + 1)
+        proj = (filename, m.proj4string, m.llcrnrlon, m.llcrnrlat, cmap.name)
+        keys = [[proj + (level, i, j) for i in cols] for j in rows]
+        missing = [key for row in keys for key in row
+                   if key not in self.tiles]
+        if missing:
+            self._make_tiles(dataset, m, missing, spacing, cmap)
+        mosaic = np.concatenate(
+            [np.concatenate([self._get(key) for key in row], axis=1)
+             for row in keys], axis=0)
+        return mosaic, (cols[0] * span, (cols[-1] + 1) * span,
+                        rows[0] * span, (rows[-1] + 1) * span)
+
+    def _get(self, key):
+        tile = self.tiles.pop(key)
+        self.tiles[key] = tile
+        return tile
+
+    def _make_tiles(self, dataset, m, keys, spacing, cmap):
+        '''Make tiles keys, reading the elevation window once.'''
+        from mpl_toolkits.basemap import interp
+        span = TILE_SIZE * spacing
+        # cell centers, with one more cell on each side for the shading
+        offsets = (np.arange(-1, TILE_SIZE + 1) + 0.5) * spacing
+        grids = {}
+        for key in keys:
+            i, j = key[-2:]
+            x, y = np.meshgrid(i * span + offsets, j * span + offsets)
+            grids[key] = m(x, y, inverse=True)
+
+        lons = np.concatenate([grid[0].ravel() for grid in grids.values()])
+        lats = np.concatenate([grid[1].ravel() for grid in grids.values()])
+        # points out of the projection domain are returned as 1e30
+        valid = (np.abs(lons) <= 720) & (np.abs(lats) <= 90)
+        lons = lons[valid]
+        lats = lats[valid]
+        if lons.size == 0:
+            for key in keys:
+                self._put(key, np.zeros((TILE_SIZE, TILE_SIZE, 3), np.uint8))
+            return
+        lons = lons % 360.
+        if lons.max() - lons.min() > 180:
+            # box crossing longitude 0, take it from -180
+            lons = (lons + 180.) % 360. - 180.
+        elevation, dem_lons, dem_lats = read_dem_window(
+            dataset, lons.min(), lons.max(), lats.min(), lats.max())
+
+        start = dem_lons[0]
+        for key, (lon, lat) in grids.items():
+            lon = start + (lon - start) % 360.
+            tile = interp(elevation, dem_lons, dem_lats, lon, lat,
+                          checkbounds=False, masked=False, order=1)
+            rgb = shade_relief(tile, spacing, cmap)
+            self._put(key, rgb[1:-1, 1:-1])
+
+    def _put(self, key, tile):
+        self.tiles[key] = tile
+        while len(self.tiles) > self.size:
+            self.tiles.popitem(last=False)
+
+#: Tiles shared by all TopographyBackground instances
+topography_tiles = TopographyTiles()
+
+
+class ImageCache(object):
+    '''
+    Decoded image files, kept by (file, modification time, reduction) so
+    a file is read again only when it changes. The least recently used
+    are dropped.
+    '''
+
+    def __init__(self, size=4):
+        '''
+        Initialize the class.
+
+        Parameters
+        ----------
+        [Optional]
+        size : int
+            Number of images kept, full and reduced versions count apart.
+        '''
+        from collections import OrderedDict
+        self.size = size
+        self.images = OrderedDict()
+
+    def image(self, filename, max_size=None):
+        '''
+        Return decoded image of filename.
+
+        Parameters
+        ----------
+        filename : string
+            Image file, any format read by matplotlib.
+        [Optional]
+        max_size : int or None
+            If given, the image is reduced, keeping every n-th pixel, until
+            no side is larger than max_size pixels.
+        '''
+        key = (filename, os.path.getmtime(filename))
+        full = self._get(key)
+        if full is None:
+            import matplotlib.image as mpimg
+            full = mpimg.imread(filename)
+            self._put(key, full)
+        if not max_size:
+            return full
+        step = int(np.ceil(max(full.shape[:2]) / float(max_size)))
+        if step <= 1:
+            return full
+        reduced = self._get(key + (step,))
+        if reduced is None:
+            reduced = np.ascontiguousarray(full[::step, ::step])
+            self._put(key + (step,), reduced)
+        return reduced
+
+    def _get(self, key):
+        if key not in self.images:
+            return None
+        image = self.images.pop(key)
+        self.images[key] = image
+        return image
+
+    def _put(self, key, image):
+        self.images[key] = image
+        while len(self.images) > self.size:
+            self.images.popitem(last=False)
+
+#: Images shared by all ImageBackground instances
+image_cache = ImageCache()
 
 
 class TopographyBackground(Component):
@@ -91,8 +377,7 @@ class TopographyBackground(Component):
             self.lineEdit.setText(filename)
 
     def apply(self):
-        from mpl_toolkits.basemap import shiftgrid, cm
-        common.ShowQuestion
+        from mpl_toolkits.basemap import cm
         display = self.VpyartDisplay.value
         if (isinstance(display, pyart.graph.RadarMapDisplay) or
             isinstance(display, pyart.graph.GridMapDisplay)):
@@ -121,31 +406,34 @@ class TopographyBackground(Component):
             self.etopodata = Dataset(filename)
             self.current_open = filename
 
-        topoin = np.maximum(0, self.etopodata.variables['ROSE'][:])
-        lons = self.etopodata.variables['ETOPO05_X'][:]
-        lats = self.etopodata.variables['ETOPO05_Y'][:]
-        # shift data so lons go from -180 to 180 instead of 20 to 380.
-        topoin, lons = shiftgrid(180., topoin, lons, start=False)
-
-        # plot topography/bathymetry as an image.
-
-        # create the figure and axes instances.
-        # setup of basemap ('lcc' = lambert conformal conic).
-        # use major and minor sphere radii from WGS84 ellipsoid.
         m = self.VpyartDisplay.value.basemap
-        # transform to nx x ny regularly spaced 5km native projection grid
-        nx = int((m.xmax - m.xmin)/500.) + 1
-        ny = int((m.ymax - m.ymin)/500.) + 1
-        topodat = m.transform_scalar(topoin, lons, lats, nx, ny)
-        # plot image over map with imshow.
-
-        # draw coastlines and political boundaries.
+        ax = getattr(m, 'ax', None)
+        if ax is None:
+            common.ShowWarning("The display has no basemap axes")
+            return
+        # only the tiles of the current view, at about screen resolution
+        xlim = ax.get_xlim()
+        ylim = ax.get_ylim()
+        extent = xlim + ylim
+        level = topography_tiles.level(extent, ax.bbox.width)
+        try:
+            rgb, extent = topography_tiles.image(
+                self.etopodata, filename, m, extent, level, cm.GMT_relief)
+        except:
+            import traceback
+            error = traceback.format_exc()
+            print(error, file=log.error)
+            common.ShowLongText("Could not make topography:\n\n" + error)
+            return
 
-        ls = LightSource(azdeg=90, altdeg=20)
-        # convert data to rgb array including shading from light source.
-        # (must specify color map)
-        rgb = ls.shade(topodat, cm.GMT_relief)
-        im = m.imshow(rgb)
+        # replace image of a previous apply
+        if (getattr(self, 'image', None) is not None and
+                self.image.axes is ax):
+            self.image.remove()
+        self.image = ax.imshow(rgb, origin='lower', extent=extent,
+                               aspect=ax.get_aspect(), zorder=0)
+        ax.set_xlim(xlim)
+        ax.set_ylim(ylim)
 
         self.VpyartDisplay.update(strong=False)
 
@@ -217,11 +505,16 @@ class ImageBackground(Component):
         self.Vradar = Variable(None)
         self.Vgrid = Variable(None)
 
-        self.sharedVariables = {"VpyartDisplay": None,
-                                "VplotAxes": None,
+        self.sharedVariables = {"VpyartDisplay": self.NewDisplay,
+                                "VplotAxes": self.NewPlotAxes,
                                 "Vradar": self.NewRadar,
                                 "Vgrid": self.NewGrid, }
 
+        # applied image, kept in the plot axes between plots
+        self.layer = None
+        self.image = None
+        self.extents = {}
+
         # Connect the components
         self.connectAllVariables()
 
@@ -272,6 +565,25 @@ class ImageBackground(Component):
             self.dx_lineEdit.setText("%.3f" % ((x[-1] - x[0])/1000))
             self.dy_lineEdit.setText("%.3f" % ((y[-1] - y[0])/1000))
 
+    def NewDisplay(self, variable, strong):
+        '''
+        Slot for 'ValueChanged' signal of
+        :py:class:`VpyartDisplay <artview.core.core.Variable>`.
+
+        Add the image back to the plot axes, if it was not yet, e.g. the
+        map projection did not exist when the axes were cleared.
+        '''
+        self._attach()
+
+    def NewPlotAxes(self, variable, strong):
+        '''
+        Slot for 'ValueChanged' signal of
+        :py:class:`VplotAxes <artview.core.core.Variable>`.
+
+        Add the image back to the plot axes after they are cleared.
+        '''
+        self._attach()
+
     def apply(self):
         display = self.VpyartDisplay.value
         if display is None:
@@ -297,42 +609,105 @@ class ImageBackground(Component):
                 "Need a axes instance, be sure to "
                 "link this components (%s), to the plot axes a display" %
                 self.name)
-        import matplotlib.image as mpimg
-
-        img = mpimg.imread(str(self.lineEdit.text()))
-
-        x0 = float(str(self.x0_lineEdit.text()))
-        y0 = float(str(self.y0_lineEdit.text()))
-        dx = float(str(self.dx_lineEdit.text()))
-        dy = float(str(self.dy_lineEdit.text()))
-        aspect = ax.get_aspect()
-        if isinstance(display, pyart.graph.RadarMapDisplay):
-            m = self.VpyartDisplay.value.basemap
-            x0, y0 = m(x0, y0)
-            dx *= 1000
-            dy *= 1000
-            im = ax.imshow(img, extent=(x0-dx/2, x0+dx/2, y0-dy/2, y0+dy/2),
-                           aspect=aspect)
+            return
+
+        try:
+            filename = str(self.lineEdit.text())
+            image_cache.image(filename)
+            self.layer = (filename,
+                          float(str(self.x0_lineEdit.text())),
+                          float(str(self.y0_lineEdit.text())),
+                          float(str(self.dx_lineEdit.text())),
+                          float(str(self.dy_lineEdit.text())))
+        except:
+            import traceback
+            error = traceback.format_exc()
+            print(error, file=log.error)
+            common.ShowLongText("Could not read image:\n\n" + error)
+            return
+
+        self._detach()
+        self._attach()
+        self.VpyartDisplay.update(strong=False)
+
+    def _extent(self, display):
+        '''Return extent (x0, x1, y0, y1) of the image in the coordinates
+        of display, or None if they are not known yet.'''
+        filename, x0, y0, dx, dy = self.layer
+        if (isinstance(display, pyart.graph.RadarMapDisplay) or
+                isinstance(display, pyart.graph.GridMapDisplay)):
+            m = getattr(display, 'basemap', None)
+            if m is None:
+                return None
+            key = ("map", m.proj4string, m.llcrnrlon, m.llcrnrlat,
+                   m.urcrnrlon, m.urcrnrlat)
         elif isinstance(display, pyart.graph.RadarDisplay):
             radar = self.Vradar.value
+            if radar is None:
+                return None
             lat_radar = float(radar.latitude['data'][0])
             lon_radar = float(radar.longitude['data'][0])
-            x0, y0 = pyart.core.geographic_to_cartesian(
-                x0, y0, {'proj': 'pyart_aeqd',
-                         'lon_0': lon_radar, 'lat_0': lat_radar})
-            x0 = x0[0]
-            y0 = y0[0]
-            im = ax.imshow(img, extent=(x0-dx/2, x0+dx/2, y0-dy/2, y0+dy/2),
-                           aspect=aspect)
-        elif isinstance(display, pyart.graph.GridMapDisplay):
-            m = self.VpyartDisplay.value.basemap
-            x0, y0 = m(x0, y0)
-            dx *= 1000
-            dy *= 1000
-            im = ax.imshow(img, extent=(x0-dx/2, x0+dx/2, y0-dy/2, y0+dy/2),
-                           aspect=aspect)
+            key = ("radar", lon_radar, lat_radar)
+        else:
+            return None
+        key = key + (x0, y0, dx, dy)
+
+        if key not in self.extents:
+            if key[0] == "map":
+                x0, y0 = m(x0, y0)
+                # map coordinates are in meters
+                dx *= 1000
+                dy *= 1000
+            else:
+                x0, y0 = pyart.core.geographic_to_cartesian(
+                    x0, y0, {'proj': 'pyart_aeqd',
+                             'lon_0': lon_radar, 'lat_0': lat_radar})
+                # RadarDisplay plots in km
+                x0 = float(np.ravel(x0)[0]) / 1000.
+                y0 = float(np.ravel(y0)[0]) / 1000.
+            self.extents[key] = (x0 - dx / 2., x0 + dx / 2.,
+                                 y0 - dy / 2., y0 + dy / 2.)
+        return self.extents[key]
+
+    def _attach(self):
+        '''Add the applied image to the plot axes, if not there.'''
+        from matplotlib.image import AxesImage
+        ax = self.VplotAxes.value
+        display = self.VpyartDisplay.value
+        if self.layer is None or ax is None or display is None:
+            return
+        if (self.image is not None and self.image.axes is ax and
+                any(artist is self.image for artist in ax.get_children())):
+            return
+        try:
+            extent = self._extent(display)
+            if extent is None:
+                return
+            # about the resolution of the canvas
+            max_size = 2 * int(max(ax.bbox.width, ax.bbox.height))
+            img = image_cache.image(self.layer[0], max_size)
+        except:
+            import traceback
+            print(traceback.format_exc(), file=log.debug)
+            return
 
-        self.VpyartDisplay.update(strong=False)
+        if self.image is None or self.image.axes is not ax:
+            # built directly, so the axes limits are not autoscaled to it
+            self.image = AxesImage(ax, extent=extent, zorder=0)
+        else:
+            self.image._extent = extent
+        self.image.set_data(img)
+        ax.add_image(self.image)
+
+    def _detach(self):
+        '''Remove the image from the plot axes.'''
+        if self.image is not None:
+            if self.image.axes is not None:
+                try:
+                    self.image.remove()
+                except:
+                    pass
+            self.image = None
 
 
 def topography_mode():
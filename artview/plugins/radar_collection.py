@@ -17,7 +17,8 @@ sys.path.insert(0, path)
 
 import artview
 
-from ..core import Component, Variable, common, QtWidgets, QtCore
+from ..core import (Component, Variable, common, QtWidgets, QtCore,
+                    async_loader)
 
 # get list of read functions
 import inspect
@@ -147,32 +148,19 @@ class RadarCollectionView(Component):
         # try several open
         print("open: %s" % path)
         self.filename = str(path)
-        try:
-            radar = pyart.io.read(self.filename, delay_field_loading=True)
-            # Add the filename for Display
-            radar.filename = self.filename
-            self.VradarCollection.value.append(radar)
-            self.VradarCollection.update()
-            return
-        except:
-            try:
-                radar = pyart.io.read(self.filename)
-                # Add the filename for Display
-                radar.filename = self.filename
-                self.VradarCollection.value.append(radar)
-                self.VradarCollection.update()
-                return
-            except:
-                import traceback
-                print(traceback.format_exc())
-                radar_warning = True
-
-        if grid_warning or radar_warning:
-            msg = "Py-ART didn't recognize this file!"
-            common.ShowWarning(msg)
-
+        async_loader.load(self.filename, ("radar",), callback=self._openDone,
+                          errback=self._openFailed)
         return
 
+    def _openDone(self, radar):
+        '''Receive radar read by open.'''
+        self.VradarCollection.value.append(radar)
+        self.VradarCollection.update()
+
+    def _openFailed(self, request):
+        '''Warn about a file open could not read.'''
+        common.ShowWarning(request.error)
+
     def directoryContextMenu(self, pos):
         '''Contruct right-click menu.'''
         menu = QtWidgets.QMenu(self)
@@ -0,0 +1,74 @@
+"""
+Test that batch runs record the files processed and resume from their
+journal.
+"""
+import os
+
+from artview import batch
+
+
+class Stream(list):
+    '''Progress stream keeping the text written.'''
+
+    def write(self, text):
+        self.append(text)
+
+    def getvalue(self):
+        return ''.join(self)
+
+
+def _files(tmpdir, count):
+    names = []
+    for i in range(count):
+        path = tmpdir.join('in', 'file%d.nc' % i)
+        path.write('not a radar', ensure=True)
+        names.append(str(path))
+    return names
+
+
+def test_read_journal(tmpdir):
+    journal = tmpdir.join(batch.JOURNAL)
+    assert batch._read_journal(str(journal)) == set()
+    journal.write("ok\ta.nc\nfailed\tb.nc\nok\tb.nc\nok\tc.nc\n"
+                  "failed\tc.nc\n")
+    # the last status of each file counts
+    assert batch._read_journal(str(journal)) == set(['a.nc', 'b.nc'])
+
+
+def test_run_batch_resume(tmpdir):
+    names = _files(tmpdir, 3)
+    outdir = str(tmpdir.join('out'))
+    os.makedirs(outdir)
+    journal = os.path.join(outdir, batch.JOURNAL)
+    with open(journal, 'w') as f:
+        f.write("ok\t%s\n" % names[0])
+    stream = Stream()
+    # the files can not be read, so all but the one done fail
+    failed = batch.run_batch({"steps": []}, str(tmpdir.join('in')),
+                             outdir, processes=1, stream=stream)
+    assert sorted(failed) == names[1:]
+    assert "Processing 2 files (1 already done)" in stream.getvalue()
+    assert batch._read_journal(journal) == set(names[:1])
+    # failed files are retried when run again
+    failed = batch.run_batch({"steps": []}, names, outdir, processes=1,
+                             stream=Stream())
+    assert sorted(failed) == names[1:]
+    # unless restarted, all files are processed
+    stream = Stream()
+    failed = batch.run_batch({"steps": []}, names, outdir, processes=1,
+                             restart=True, stream=stream)
+    assert sorted(failed) == names
+    assert "Processing 3 files (0 already done)" in stream.getvalue()
+
+
+def test_run_batch_all_done(tmpdir):
+    names = _files(tmpdir, 2)
+    outdir = str(tmpdir.join('out'))
+    os.makedirs(outdir)
+    with open(os.path.join(outdir, batch.JOURNAL), 'w') as f:
+        for name in names:
+            f.write("ok\t%s\n" % name)
+    stream = Stream()
+    assert batch.run_batch({"steps": []}, names, outdir,
+                           stream=stream) == []
+    assert "Processing 0 files (2 already done)" in stream.getvalue()
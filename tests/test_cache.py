@@ -0,0 +1,95 @@
+"""
+Test the cache of opened containers shared by the components.
+"""
+import numpy as np
+
+from artview.core.cache import ContainerCache
+
+
+class Container(object):
+
+    def __init__(self, nbytes):
+        self.fields = {'DBZ': {'data': np.zeros(nbytes, dtype=np.int8)}}
+
+
+def _files(tmpdir, count):
+    names = []
+    for i in range(count):
+        name = str(tmpdir.join('file%d.nc' % i))
+        with open(name, 'w') as stream:
+            stream.write('data')
+        names.append(name)
+    return names
+
+
+def test_get_put(tmpdir):
+    name, = _files(tmpdir, 1)
+    cache = ContainerCache()
+    assert cache.get(name) is None
+    container = Container(10)
+    cache.put(name, container)
+    assert name in cache
+    assert cache.get(name) is container
+    assert (cache.hits, cache.misses) == (1, 1)
+    # a file rewritten on disk is read again
+    with open(name, 'w') as stream:
+        stream.write('new data')
+    assert cache.get(name) is None
+
+
+def test_eviction(tmpdir):
+    names = _files(tmpdir, 4)
+    cache = ContainerCache(max_bytes=250)
+    containers = [Container(100) for name in names]
+    for name, container in zip(names[:2], containers):
+        cache.put(name, container)
+    # use the first file, so the second is the least recently used
+    cache.get(names[0])
+    cache.put(names[2], containers[2])
+    assert names[1] not in cache
+    assert names[0] in cache and names[2] in cache
+    assert cache.nbytes() == 200
+    # the most recent entry is kept even over budget
+    cache.put(names[3], Container(1000))
+    assert names[3] in cache and names[0] not in cache
+
+
+def test_pinned(tmpdir):
+    names = _files(tmpdir, 3)
+    cache = ContainerCache(max_bytes=150)
+    owner, other = object(), object()
+    edited = Container(100)
+    edited.changed = True
+    cache.put(names[0], edited, owner)
+    cache.put(names[1], Container(100))
+    cache.put(names[2], Container(100))
+    # pinned entries are not evicted
+    assert names[0] in cache and names[1] not in cache
+    # and only handed to their owner
+    assert cache.get(names[0], owner) is edited
+    assert cache.get(names[0], other) is None
+    assert cache.get(names[0]) is None
+    # other owners do not replace them
+    fresh = Container(10)
+    cache.put(names[0], fresh, other)
+    assert cache.get(names[0], owner) is edited
+    # saved changes unpin the container
+    cache.unpin(edited)
+    assert names[0] not in cache
+
+
+def test_release_owner(tmpdir):
+    names = _files(tmpdir, 2)
+    cache = ContainerCache()
+    owner = object()
+    edited = Container(10)
+    edited.changed = True
+    read = Container(10)
+    cache.put(names[0], edited, owner)
+    cache.put(names[1], read, owner)
+    cache.release(owner)
+    assert names[0] not in cache
+    # unpinned entries are kept for everyone
+    assert cache.get(names[1], object()) is read
+    cache.clear()
+    assert cache.nbytes() == 0
@@ -0,0 +1,75 @@
+"""
+Test the spatial indexes of radar sweeps and grid sections against
+brute force searches.
+"""
+import numpy as np
+from matplotlib.path import Path
+
+from artview.components._index import PolarIndex, GridIndex
+
+
+def _sweep(nrays=360, ngates=100, gate=0.5):
+    azimuth = np.radians(np.arange(nrays) + 0.5)
+    rng = (np.arange(ngates) + 0.5) * gate
+    x = np.sin(azimuth)[:, np.newaxis] * rng
+    y = np.cos(azimuth)[:, np.newaxis] * rng
+    return x, y
+
+
+def test_polar_nearest():
+    x, y = _sweep()
+    index = PolarIndex(x, y)
+    rng = np.random.RandomState(0)
+    px = rng.uniform(-50, 50, 200)
+    py = rng.uniform(-50, 50, 200)
+    ray, gate, distance = index.nearest(px, py)
+    dist = np.hypot(x.ravel() - px[:, np.newaxis],
+                    y.ravel() - py[:, np.newaxis])
+    np.testing.assert_allclose(distance, dist.min(axis=1))
+    np.testing.assert_allclose(np.hypot(x[ray, gate] - px,
+                                        y[ray, gate] - py), distance)
+
+
+def test_polar_nearest_scalar():
+    x, y = _sweep()
+    ray, gate, distance = PolarIndex(x, y).nearest(0.1, 10.2)
+    assert (ray[0], gate[0]) == (0, 20)
+
+
+def test_polar_radius():
+    x, y = _sweep()
+    index = PolarIndex(x, y)
+    for px, py, r in [(10., 20., 3.), (0.2, -0.1, 5.), (-30., 5., 0.8)]:
+        expected = np.nonzero(np.hypot(x - px, y - py).ravel() <= r)[0]
+        np.testing.assert_array_equal(np.sort(index.radius(px, py, r)),
+                                      expected)
+
+
+def test_polar_region():
+    x, y = _sweep()
+    index = PolarIndex(x, y)
+    paths = [Path([(10, 20), (40, 30), (20, 45), (10, 20)], closed=True),
+             Path([(-5, -5), (5, -5), (5, 5), (-5, 5), (-5, -5)],
+                  closed=True)]
+    xy = np.column_stack((x.ravel(), y.ravel()))
+    expected = (paths[0].contains_points(xy) |
+                paths[1].contains_points(xy))
+    np.testing.assert_array_equal(index.region(paths), expected)
+    # masks of the paths are kept and reused
+    assert index.mask(paths[0]) is index.mask(paths[0])
+    np.testing.assert_array_equal(index.region(paths[:1]),
+                                  paths[0].contains_points(xy))
+    assert not index.region([]).any()
+
+
+def test_grid_nearest_and_radius():
+    xs = np.linspace(-10, 10, 41)
+    ys = np.linspace(0, 5, 11)
+    index = GridIndex(xs, ys)
+    column, row = index.nearest([-3.1, 20.], [1.26, -1.])
+    np.testing.assert_array_equal(column, [14, 40])
+    np.testing.assert_array_equal(row, [3, 0])
+    x, y = np.meshgrid(xs, ys)
+    expected = np.nonzero(np.hypot(x - 1., y - 2.).ravel() <= 1.2)[0]
+    np.testing.assert_array_equal(np.sort(index.radius(1., 2., 1.2)),
+                                  expected)
@@ -0,0 +1,81 @@
+"""
+Test the selection of the points of radar sweeps and grid sections inside
+paths, against testing every point with Path.contains_points.
+"""
+import numpy as np
+from matplotlib.path import Path
+
+from artview.components._interior import (interior_points, interior_polar,
+                                          interior_rectilinear)
+
+
+def _brute_force(path, x, y):
+    xy = np.column_stack((np.ravel(x), np.ravel(y)))
+    return np.nonzero(path.contains_points(xy))[0]
+
+
+def _sweep(nrays=360, ngates=200, gate=0.5):
+    azimuth = np.radians(np.arange(nrays) + 0.5)
+    rng = (np.arange(ngates) + 0.5) * gate
+    x = np.sin(azimuth)[:, np.newaxis] * rng
+    y = np.cos(azimuth)[:, np.newaxis] * rng
+    return x, y
+
+
+PATHS = [
+    # triangle away from the radar
+    Path([(10, 20), (40, 30), (20, 60), (10, 20)], closed=True),
+    # polygon around the radar
+    Path([(-30, -30), (30, -35), (35, 30), (-25, 40), (-30, -30)],
+         closed=True),
+    # concave polygon crossing north
+    Path([(-20, 30), (0, 80), (20, 30), (0, 50), (-20, 30)], closed=True),
+    # outside the sweep
+    Path([(200, 200), (210, 200), (210, 210), (200, 200)], closed=True),
+]
+
+
+def test_interior_points():
+    x, y = _sweep(90, 50)
+    for path in PATHS:
+        np.testing.assert_array_equal(interior_points(path, x, y),
+                                      _brute_force(path, x, y))
+
+
+def test_interior_polar():
+    x, y = _sweep()
+    for path in PATHS:
+        np.testing.assert_array_equal(interior_polar(path, x, y),
+                                      _brute_force(path, x, y))
+
+
+def test_interior_rectilinear():
+    # points off the path edges, where the result is undefined
+    xs = np.linspace(-50, 50, 101) + 0.137
+    ys = np.linspace(-20, 80, 73) + 0.071
+    x, y = np.meshgrid(xs, ys)
+    for path in PATHS:
+        np.testing.assert_array_equal(interior_rectilinear(path, xs, ys),
+                                      _brute_force(path, x, y))
+
+
+def test_interior_grid_index():
+    from artview.components.toolbox import interior_grid
+
+    class Grid(object):
+        pass
+
+    grid = Grid()
+    # x and y of different sizes, so rows and columns can not be mixed
+    xs = np.linspace(-10000, 10000, 21)
+    zs = np.linspace(0, 5000, 6)
+    grid.axes = {'x_disp': {'data': xs}, 'y_disp': {'data': xs[:15]},
+                 'z_disp': {'data': zs}}
+    path = Path([(-2.5, 0.5), (3.5, 0.5), (3.5, 2.5), (-2.5, 2.5),
+                 (-2.5, 0.5)], closed=True)
+    xys, index = interior_grid(path, grid, None, 0, "gridY")
+    assert len(index) == 6 * 2
+    # index is (x, z) of the points in the section
+    np.testing.assert_allclose(xs[index[:, 0]] / 1000., xys[:, 0])
+    np.testing.assert_allclose(zs[index[:, 1]] / 1000., xys[:, 1])
+    assert set(index[:, 1]) == set([1, 2])
@@ -0,0 +1,51 @@
+"""
+Test guessing the container type of files from their first bytes and
+names.
+"""
+from artview.core import io
+
+
+def _write(tmpdir, name, data):
+    path = tmpdir.join(name)
+    path.write_binary(data)
+    return str(path)
+
+
+def test_sniff_magic(tmpdir):
+    for name, data in [('a.bin', b'AR2V0006.' + b'\x00' * 20),
+                       ('b.bin', b'BZh91AY&SY'),
+                       ('c.bin', b'\x1f\x8b\x08\x00'),
+                       ('d.bin', b'\x00\x00\x00\x00UF' + b'\x00' * 10)]:
+        assert io.sniff_format(_write(tmpdir, name, data)) == "radar"
+
+
+def test_sniff_filename(tmpdir):
+    assert io.sniff_format(_write(tmpdir, 'cfrad.20110520_100000.nc',
+                                  b'unknown')) == "radar"
+    assert io.sniff_format(_write(tmpdir, 'KLOT20110520_100000_V06',
+                                  b'unknown')) == "radar"
+    assert io.sniff_format(_write(tmpdir, 'scan.sigmet',
+                                  b'unknown')) == "radar"
+    assert io.sniff_format(_write(tmpdir, 'my_Grid_file.nc',
+                                  b'unknown')) == "grid"
+    assert io.sniff_format(_write(tmpdir, 'data.nc', b'unknown')) is None
+
+
+def test_sniff_missing(tmpdir):
+    assert io.sniff_format(str(tmpdir.join('missing.nc'))) is None
+
+
+def test_sniff_netcdf_header(tmpdir, monkeypatch):
+    # names of NetCDF classic files are in the header
+    monkeypatch.setattr(io, '_NETCDF4_AVAILABLE', False)
+    for data, mode in [(b'Conventions\x00CF/Radial', "radar"),
+                       (b'sweep_number\x00\x00azimuth', "radar"),
+                       (b'point_x\x00point_y', "grid"),
+                       (b'origin_latitude', "grid")]:
+        name = _write(tmpdir, 'data.nc', b'CDF\x01' + data)
+        assert io.sniff_format(name) == mode
+    # unknown metadata falls back to the filename
+    name = _write(tmpdir, 'grid.nc', b'CDF\x01' + b'time')
+    assert io.sniff_format(name) == "grid"
+    name = _write(tmpdir, 'data.nc', b'CDF\x01' + b'time')
+    assert io.sniff_format(name) is None
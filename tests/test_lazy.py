@@ -0,0 +1,105 @@
+"""
+Test fields releasing their data and loading it again from file.
+"""
+import numpy as np
+
+from artview.core.lazy import (LazyField, make_lazy, release_fields,
+                               field_is_loaded)
+
+
+class Container(object):
+    pass
+
+
+class Reader(object):
+    '''Reader of a fake file, counting the fields read.'''
+
+    def __init__(self):
+        self.reads = []
+
+    def __call__(self, filename, include_fields=None):
+        container = Container()
+        names = include_fields or ['DBZ', 'VEL']
+        self.reads.extend(names)
+        container.fields = dict(
+            (name, {'data': np.arange(6.) + len(name), 'units': name})
+            for name in names)
+        return container
+
+
+def test_lazy_field():
+    calls = []
+    field = LazyField({'units': 'dBZ'})
+    field.set_lazy('data', lambda: calls.append(1) or np.arange(3.))
+    assert not field_is_loaded(field)
+    assert sorted(field) == ['data', 'units']
+    np.testing.assert_array_equal(field['data'], [0, 1, 2])
+    field['data']
+    assert field_is_loaded(field) and len(calls) == 1
+    # released data is loaded again when accessed
+    field.release()
+    assert not field_is_loaded(field) and 'data' in field
+    field['data']
+    assert len(calls) == 2
+    # copies keep the loader
+    copy = field.copy()
+    copy.release()
+    assert field_is_loaded(field) and not field_is_loaded(copy)
+    # data set by hand can not be released
+    field['data'] = np.zeros(3)
+    field.release()
+    assert field_is_loaded(field)
+
+
+def test_release_and_reload():
+    reader = Reader()
+    container = reader('file')
+    dbz = container.fields['DBZ']['data']
+    make_lazy(container, reader, 'file')
+    assert reader.reads == ['DBZ', 'VEL']
+    assert container.fields['DBZ']['data'] is dbz
+    assert release_fields(container, keep=['VEL']) == dbz.nbytes
+    assert not field_is_loaded(container.fields['DBZ'])
+    assert field_is_loaded(container.fields['VEL'])
+    # only the released field is read again
+    np.testing.assert_array_equal(container.fields['DBZ']['data'], dbz)
+    assert reader.reads == ['DBZ', 'VEL', 'DBZ']
+    assert container.fields['DBZ']['units'] == 'DBZ'
+
+
+def test_make_lazy_release():
+    reader = Reader()
+    container = reader('file')
+    make_lazy(container, reader, 'file', release=True)
+    assert not field_is_loaded(container.fields['VEL'])
+    container.fields['VEL']['data']
+    assert reader.reads == ['DBZ', 'VEL', 'VEL']
+
+
+def test_changed_not_released():
+    reader = Reader()
+    container = reader('file')
+    make_lazy(container, reader, 'file')
+    container.changed = True
+    assert release_fields(container, keep=[]) == 0
+    assert field_is_loaded(container.fields['DBZ'])
+
+
+def test_pyart_lazy_dict():
+    class LazyLoadDict(dict):
+        pass
+
+    calls = []
+    field = LazyLoadDict()
+    field._dic = {'units': 'm/s'}
+    field._lazyload = {'data': lambda: calls.append(1) or np.ones(2)}
+    container = Container()
+    container.fields = {'VEL': field}
+    make_lazy(container, Reader(), 'file')
+    field = container.fields['VEL']
+    assert isinstance(field, LazyField) and not calls
+    np.testing.assert_array_equal(field['data'], [1, 1])
+    assert field['units'] == 'm/s'
+    field.release()
+    field['data']
+    assert len(calls) == 2
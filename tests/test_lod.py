@@ -0,0 +1,72 @@
+"""
+Test the reduction of plot meshes by blocks of cells.
+"""
+import numpy as np
+
+from artview.components._lod import reduce_blocks, reduce_edges
+
+
+def _data():
+    data = np.ma.arange(30.).reshape(5, 6)
+    data[0, 0] = np.ma.masked
+    data[1, 1] = np.ma.masked
+    data[4, :2] = np.ma.masked
+    return data
+
+
+def _blocks(data, factor):
+    ny, nx = data.shape
+    for by in range(0, ny, factor):
+        for bx in range(0, nx, factor):
+            yield by // factor, bx // factor, data[by:by + factor,
+                                                   bx:bx + factor]
+
+
+def test_reduce_max_mean():
+    data = _data()
+    for method in ("max", "mean"):
+        reduced = reduce_blocks(data, 2, method)
+        assert reduced.shape == (3, 3)
+        for iy, ix, block in _blocks(data, 2):
+            expected = getattr(block, method)()
+            if expected is np.ma.masked:
+                assert reduced[iy, ix] is np.ma.masked
+            else:
+                assert reduced[iy, ix] == expected
+
+
+def test_reduce_nearest():
+    data = _data()
+    reduced = reduce_blocks(data, 2, "nearest")
+    # the center cell of a block, values are never combined
+    assert reduced[1, 1] == data[3, 3]
+    # if masked, the first unmasked cell
+    assert reduced[0, 0] == data[0, 1]
+    # the center of the last block is padding
+    assert reduced[2, 2] == data[4, 4]
+    # all cells masked
+    assert reduced[2, 0] is np.ma.masked
+    assert np.all(np.isin(reduced.compressed(), data.compressed()))
+
+
+def test_reduce_factor_one_and_unknown():
+    data = _data()
+    np.testing.assert_array_equal(reduce_blocks(data, 1, "mean"), data)
+    np.testing.assert_array_equal(
+        np.ma.getmaskarray(reduce_blocks(data, 1, "nearest")),
+        np.ma.getmaskarray(data))
+    try:
+        reduce_blocks(data, 2, "median")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("unknown method accepted")
+
+
+def test_reduce_edges():
+    yy, xx = np.mgrid[0:6, 0:7]
+    coords = np.dstack((xx, yy))
+    edges = reduce_edges(coords, 2)
+    assert edges.shape == (4, 4, 2)
+    np.testing.assert_array_equal(edges[0, :, 0], [0, 2, 4, 6])
+    np.testing.assert_array_equal(edges[:, 0, 1], [0, 2, 4, 5])
@@ -0,0 +1,79 @@
+"""
+Test the points of a container given by their indexes, their fields
+gathered on first access.
+"""
+import numpy as np
+
+from artview.core.points import IndexedPoints
+
+
+class Container(object):
+    pass
+
+
+class Field(dict):
+    '''Field counting the reads of its data.'''
+
+    reads = 0
+
+    def __getitem__(self, key):
+        if key == 'data':
+            Field.reads += 1
+        return dict.__getitem__(self, key)
+
+
+def _points():
+    radar = Container()
+    data = np.ma.arange(20.).reshape(4, 5)
+    radar.fields = {'DBZ': Field(data=data, units='dBZ'),
+                    'VEL': Field(data=-data, units='m/s')}
+    index = (np.array([0, 1, 3, 2]), np.array([4, 2, 0, 1]))
+    axes = {'ray_index': {'data': index[0]},
+            'range_index': {'data': index[1]},
+            'lat': {'data': np.array([10.])}}
+    return IndexedPoints(radar, index, axes, {}, 'VEL')
+
+
+def test_fields_gathered():
+    points = _points()
+    assert list(points.fields.keys()) == ['VEL', 'DBZ']
+    Field.reads = 0
+    np.testing.assert_array_equal(points.fields['DBZ']['data'],
+                                  [4, 7, 15, 11])
+    assert points.fields['DBZ']['units'] == 'dBZ'
+    points.fields['DBZ']
+    assert Field.reads == 1
+
+
+def test_subset():
+    points = _points()
+    points.fields['DBZ']
+    points.add_field_like('DBZ', 'NEW', np.arange(4.))
+    Field.reads = 0
+    sub = points.subset(np.array([True, False, True, False]))
+    assert sub.npoints == 2
+    assert sub.container is points.container
+    np.testing.assert_array_equal(sub.index[0], [0, 3])
+    np.testing.assert_array_equal(sub.axes['range_index']['data'], [4, 0])
+    np.testing.assert_array_equal(sub.axes['lat']['data'], [10.])
+    # gathered and added columns are selected, not read again
+    np.testing.assert_array_equal(sub.fields['DBZ']['data'], [4, 15])
+    np.testing.assert_array_equal(sub.fields['NEW']['data'], [0, 2])
+    assert Field.reads == 0
+    np.testing.assert_array_equal(sub.fields['VEL']['data'], [-4, -15])
+    assert Field.reads == 1
+    np.testing.assert_array_equal(sub.subset([1]).fields['NEW']['data'],
+                                  [2])
+
+
+def test_contains():
+    points = _points()
+    other = IndexedPoints(points.container,
+                          (np.array([3, 0, 1]), np.array([0, 0, 2])),
+                          {}, {})
+    np.testing.assert_array_equal(other.contains(points),
+                                  [False, True, True, False])
+    np.testing.assert_array_equal(points.contains(other),
+                                  [True, False, True])
+    foreign = _points()
+    assert not foreign.contains(points).any()
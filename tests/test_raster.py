@@ -0,0 +1,54 @@
+"""
+Test the lookup of the gates under the pixels of a polar sweep image.
+"""
+import numpy as np
+
+from artview.components._raster import polar_index
+
+
+def _brute_force(azimuth, ground_range, xlim, ylim, width, height):
+    x = xlim[0] + (xlim[1] - xlim[0]) * (np.arange(width) + 0.5) / width
+    y = ylim[0] + (ylim[1] - ylim[0]) * (np.arange(height) + 0.5) / height
+    x, y = np.meshgrid(x, y)
+    angle = np.degrees(np.arctan2(x, y))
+    diff = np.abs((angle[..., np.newaxis] - azimuth + 180.) % 360. - 180.)
+    ray = np.argmin(diff, axis=-1)
+    spacing = np.median(np.diff(np.sort(azimuth)))
+    valid = diff.min(axis=-1) <= spacing
+    gate_size = ground_range[1] - ground_range[0]
+    gate = np.floor((np.hypot(x, y) - ground_range[0]) / gate_size +
+                    0.5).astype(int)
+    valid &= (gate >= 0) & (gate < len(ground_range))
+    index = ray * len(ground_range) + gate
+    index[~valid] = -1
+    return index
+
+
+def test_polar_index():
+    # rays not starting at north, as in a sweep, pixel centers off the
+    # gate and ray edges, where the result is undefined
+    azimuth = (np.arange(360) + 90.5) % 360.
+    ground_range = (np.arange(80) + 0.5) * 0.5
+    for xlim, ylim, width, height in [((-50.13, 49.87), (-50, 50), 100, 97),
+                                      ((3.3, 12.9), (-7.1, 2.2), 40, 30),
+                                      ((-1.3, 0.7), (-0.9, 1.1), 8, 8)]:
+        np.testing.assert_array_equal(
+            polar_index(azimuth, ground_range, xlim, ylim, width, height),
+            _brute_force(azimuth, ground_range, xlim, ylim, width, height))
+
+
+def test_polar_index_sector():
+    # pixels out of a sector scan are outside the sweep
+    azimuth = np.arange(30) + 0.5
+    ground_range = np.arange(10) + 0.5
+    index = polar_index(azimuth, ground_range, (-10, 10), (-10, 10), 20,
+                        20)
+    assert index.shape == (20, 20)
+    # row 0 is at the bottom, south of the radar
+    assert (index[:10] == -1).all()
+    assert (index[:, :10] == -1).all()
+    # x 0.5, y 9.5 is at azimuth 3.0, ray 3, and range 9.5, gate 9
+    assert index[19, 10] == 3 * 10 + 9
+    np.testing.assert_array_equal(
+        index, _brute_force(azimuth, ground_range, (-10, 10), (-10, 10),
+                            20, 20))